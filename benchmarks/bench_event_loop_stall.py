@@ -0,0 +1,82 @@
+"""
+Event-loop stall caused by file I/O in request handlers.
+
+Simulates concurrent handlers that each save a document and add a status
+update, once with the blocking `FileSystem` called straight from the event
+loop and once with `AsyncFileSystem`. A ticker coroutine sleeps 1 ms in a
+loop and records how late it wakes up; that lateness is how long every
+other request on the worker was stalled.
+
+    python benchmarks/bench_event_loop_stall.py --requests 2000 --concurrency 100 --fsync always
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+
+from agenticai.resources.async_file_system import AsyncFileSystem
+from agenticai.resources.file_system import FileSystem
+
+
+async def ticker(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append((time.perf_counter() - start - 0.001) * 1000)
+
+
+async def handler(fs, i: int, use_async: bool) -> None:
+    trip_id = f"TRIP{i % 10}"
+    document = {"flight_number": f"AA{i}", "status": "DELAYED", "delay_minutes": 45, "notes": "x" * 2000}
+    status = {"status": "MONITORING", "flight_number": f"AA{i}"}
+    if use_async:
+        await fs.save_document(trip_id, "flight", document, f"flight_{i}.json")
+        await fs.add_status_update(trip_id, status)
+    else:
+        fs.save_document(trip_id, "flight", document, f"flight_{i}.json")
+        fs.add_status_update(trip_id, status)
+    await asyncio.sleep(0)
+
+
+async def run(use_async: bool, requests: int, concurrency: int, fsync: str) -> None:
+    with tempfile.TemporaryDirectory() as base:
+        sync_fs = FileSystem(base_dir=base, fsync_policy=fsync)
+        fs = AsyncFileSystem(sync_fs) if use_async else sync_fs
+
+        lags: list[float] = []
+        stop = asyncio.Event()
+        tick = asyncio.create_task(ticker(lags, stop))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(i: int) -> None:
+            async with semaphore:
+                await handler(fs, i, use_async)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(limited(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await tick
+        if use_async:
+            batches = fs.stats()["avg_batch_size"]
+            await fs.aclose()
+
+    lags.sort()
+    label = "AsyncFileSystem" if use_async else "FileSystem (blocking)"
+    extra = f"  avg status batch {batches:.1f}" if use_async else ""
+    print(
+        f"{label:<22} {requests / elapsed:>8,.0f} req/s  loop lag p50 {statistics.median(lags):6.2f} ms  "
+        f"p99 {lags[int(len(lags) * 0.99) - 1]:7.2f} ms  max {lags[-1]:7.2f} ms  ({len(lags)} ticks){extra}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--fsync", default="interval", choices=FileSystem.FSYNC_POLICIES)
+    args = parser.parse_args()
+    for use_async in (False, True):
+        asyncio.run(run(use_async, args.requests, args.concurrency, args.fsync))
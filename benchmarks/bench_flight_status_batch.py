@@ -0,0 +1,82 @@
+"""
+Departure-board status: N single requests versus one batch request.
+
+Runs the API in-process through httpx's ASGI transport (no network) and
+times N `POST /api/flight/status` calls, sent with bounded concurrency,
+against a single `POST /api/flight/status:batch` streamed as NDJSON.
+The agents' delay-analysis cache is cleared before each run.
+
+    python benchmarks/bench_flight_status_batch.py --flights 100,500,2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from agenticai.api import app
+
+
+def board(n: int) -> list[dict]:
+    airports = ["JFK", "LAX", "ORD", "DFW", "ATL"]
+    return [
+        {
+            "flight_number": f"AA{100 + i}",
+            "origin": airports[i % 5],
+            "destination": airports[(i + 2) % 5],
+            "scheduled_departure": "2024-03-24T10:00:00Z",
+        }
+        for i in range(n)
+    ]
+
+
+async def run(client: httpx.AsyncClient, n: int, concurrency: int) -> None:
+    flights = board(n)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def single(flight: dict) -> dict:
+        async with semaphore:
+            response = await client.post("/api/flight/status", json=flight)
+            return response.json()
+
+    # Both paths share the delay-analysis cache; start each from a cold one
+    await client.delete("/api/agents/flight_delay_scanner/cache")
+    start = time.perf_counter()
+    singles = await asyncio.gather(*(single(flight) for flight in flights))
+    single_s = time.perf_counter() - start
+
+    await client.delete("/api/agents/flight_delay_scanner/cache")
+    start = time.perf_counter()
+    first_line_s = None
+    batch = []
+    async with client.stream("POST", "/api/flight/status:batch", json=flights) as response:
+        async for line in response.aiter_lines():
+            if first_line_s is None:
+                first_line_s = time.perf_counter() - start
+            batch.append(json.loads(line))
+    batch_s = time.perf_counter() - start
+
+    assert batch == singles
+    print(
+        f"{n:>6} {single_s * 1000:>12.1f} {batch_s * 1000:>11.1f} {first_line_s * 1000:>15.1f} "
+        f"{single_s / batch_s:>8.1f}x"
+    )
+
+
+async def main(sizes: list[int], concurrency: int) -> None:
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            print(f"{'flights':>6} {'singles ms':>12} {'batch ms':>11} {'batch 1st line':>15} {'speedup':>9}")
+            for n in sizes:
+                await run(client, n, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flights", default="100,500,2000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main([int(n) for n in args.flights.split(",")], args.concurrency))
@@ -0,0 +1,106 @@
+"""
+LLM admission control: rejected calls and wait times under a burst.
+
+Fires a burst of LLM calls from the notifier (priority 1), the delay
+scanner (priority 5) and the travel organizer (priority 9) at a fake
+provider that rejects calls beyond its concurrency limit and its
+tokens-per-minute budget, the way a rate-limited API answers 429. Runs
+ungoverned, then through a `Governor` configured just under the
+provider's limits, and reports rejections, peak queue depth and wait
+percentiles per agent.
+
+    python benchmarks/bench_governor.py --calls 600 --provider-concurrency 16 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from agenticai.core.governor import Governor, TokenBucket
+
+AGENTS = {"StakeholderNotifier": 1, "FlightDelayScanner": 5, "TravelOrganizer": 9}
+
+
+class FakeProvider:
+    """Completes calls after a fixed delay and rejects those over its limits."""
+
+    def __init__(self, concurrency: int, tpm: int, latency: float):
+        self.concurrency = concurrency
+        self.budget = TokenBucket(tpm)
+        self.latency = latency
+        self.active = 0
+        self.rejected = 0
+        self.completed = 0
+
+    async def __call__(self, tokens: int) -> bool:
+        if self.active >= self.concurrency or self.budget.delay(tokens) > 0:
+            self.rejected += 1
+            await asyncio.sleep(self.latency / 10)
+            return False
+        self.budget.take(tokens)
+        self.active += 1
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.active -= 1
+        self.completed += 1
+        return True
+
+
+async def run(governed: bool, burst: list[tuple[str, int]], args) -> None:
+    provider = FakeProvider(args.provider_concurrency, args.provider_tpm, args.latency_ms / 1000)
+    governor = Governor(max_in_flight=args.provider_concurrency)
+    for agent, priority in AGENTS.items():
+        governor.configure(agent, max_tpm=int(args.provider_tpm * 0.9 / len(AGENTS)), priority=priority)
+
+    latencies: dict[str, list[float]] = {agent: [] for agent in AGENTS}
+    failed = 0
+    peak_queue = 0
+
+    async def one(agent: str, tokens: int) -> None:
+        nonlocal failed, peak_queue
+        start = time.perf_counter()
+        if governed:
+            peak_queue = max(peak_queue, governor.queue_depth())
+            async with governor.slot(agent, tokens=tokens):
+                ok = await provider(tokens)
+        else:
+            ok = await provider(tokens)
+        latencies[agent].append((time.perf_counter() - start) * 1000)
+        failed += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(agent, tokens) for agent, tokens in burst))
+    elapsed = time.perf_counter() - start
+
+    mode = "governed" if governed else "ungoverned"
+    print(
+        f"{mode:<11} completed {provider.completed:5d}  rejected {failed:5d}  peak queue {peak_queue:5d}  total {elapsed:6.2f} s"
+    )
+    for agent, values in latencies.items():
+        values.sort()
+        print(
+            f"    {agent:<20} p50 {values[len(values) // 2]:8.1f} ms  "
+            f"p95 {values[int(len(values) * 0.95)]:8.1f} ms  max {values[-1]:8.1f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=600)
+    parser.add_argument("--provider-concurrency", type=int, default=16)
+    parser.add_argument("--provider-tpm", type=int, default=2_000_000)
+    parser.add_argument("--tokens", type=int, default=800, help="mean tokens per call")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    burst = [(rng.choice(list(AGENTS)), int(rng.expovariate(1 / args.tokens)) + 1) for _ in range(args.calls)]
+    for governed in (False, True):
+        asyncio.run(run(governed, burst, args))
+
+
+if __name__ == "__main__":
+    main()
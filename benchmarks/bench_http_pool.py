@@ -0,0 +1,78 @@
+"""
+Benchmark WeatherAPI throughput with a session per call vs. the shared HTTP pool.
+
+Starts a local aiohttp stub server and issues weather lookups against it.
+
+    python benchmarks/bench_http_pool.py --requests 5000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+from agenticai.resources.apis import WeatherAPI
+from agenticai.resources.http import HTTPClientPool
+
+
+async def _weather(request: web.Request) -> web.Response:
+    return web.json_response({"name": request.query.get("q"), "main": {"temp": 21.5}, "weather": [{"main": "Clear"}]})
+
+
+async def start_stub_server() -> tuple[web.AppRunner, str]:
+    """Start the stub weather server on a free localhost port."""
+    app = web.Application()
+    app.router.add_get("/weather", _weather)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def session_per_call(base_url: str, city: str) -> dict:
+    """The previous behaviour: a fresh ClientSession for every lookup."""
+    params = {"q": city, "appid": "bench", "units": "metric"}
+    async with aiohttp.ClientSession() as session, session.get(f"{base_url}/weather", params=params) as response:
+        return await response.json()
+
+
+async def run(label: str, call, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await call(f"city{i % 20}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    rps = total / elapsed
+    print(f"{label:<20} {total:>7} requests in {elapsed:6.2f}s  {rps:9.0f} req/s")
+    return rps
+
+
+async def main(total: int, concurrency: int) -> None:
+    runner, base_url = await start_stub_server()
+    try:
+        before = await run("session per call", lambda city: session_per_call(base_url, city), total, concurrency)
+
+        pool = HTTPClientPool(limit_per_host=concurrency)
+        api = WeatherAPI(api_key="bench", pool=pool, base_url=base_url)
+        after = await run("shared pool", api.get_weather, total, concurrency)
+        await pool.close()
+
+        print(f"speedup: {after / before:.2f}x")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
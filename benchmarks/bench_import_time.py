@@ -0,0 +1,94 @@
+"""
+Cold import time of the package's entry points, checked against a budget.
+
+Imports each module in a fresh interpreter under `python -X importtime`,
+repeats a few times and takes the median cumulative time of the module
+itself, so the interpreter's own startup is not counted. Prints the
+biggest contributors to the slowest module, and exits with status 1 if
+any module is over its budget, so the script can run in CI to catch an
+eager import of FastAPI, NumPy or aiohttp sneaking back in.
+
+Budgets are in milliseconds and generous for a slow machine; tighten
+them with --budget MODULE=MS for a known CI host.
+
+    python benchmarks/bench_import_time.py --repeat 5 --budget agenticai=20 --budget agenticai.api=900
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# The bare package must not load the web stack or NumPy; the others are whole entry points.
+DEFAULT_BUDGETS_MS = {
+    "agenticai": 30,
+    "agenticai.config.settings": 600,
+    "agenticai.agents": 800,
+    "agenticai.registry": 900,
+    "agenticai.api": 1500,
+}
+HEAVY_MODULES = ("fastapi", "uvicorn", "numpy", "aiohttp")
+
+_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(module: str) -> tuple[list[tuple[int, int, int, str]], list[str]]:
+    """(self us, cumulative us, depth, name) per imported module, and the heavy modules loaded."""
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            rows.append((int(match[1]), int(match[2]), len(match[3]) // 2, match[4]))
+    heavy = [name for name in result.stdout.strip().split(",") if name]
+    return rows, heavy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULE=MS", help="override a budget")
+    parser.add_argument("--top", type=int, default=10, help="contributors to list for the slowest module")
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for item in args.budget:
+        module, _, ms = item.partition("=")
+        budgets[module] = float(ms)
+
+    over = []
+    slowest = (0.0, "", [])
+    for module, budget in budgets.items():
+        samples = []
+        for _ in range(args.repeat):
+            rows, heavy = import_profile(module)
+            samples.append(next(cumulative for _, cumulative, _, name in reversed(rows) if name == module) / 1000)
+        ms = statistics.median(samples)
+        status = "ok" if ms <= budget else "OVER"
+        if ms > budget:
+            over.append(module)
+        print(f"{module:<28} {ms:8.1f} ms  budget {budget:6.0f} ms  {status:<4}  loads: {', '.join(heavy) or '-'}")
+        if ms > slowest[0]:
+            slowest = (ms, module, rows)
+
+    _, module, rows = slowest
+    print(f"\nLargest self times while importing {module}:")
+    for self_us, _, _, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    if over:
+        print(f"\nOver budget: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Chat intent routing: accuracy and per-message latency.
+
+Routes a labelled corpus of chat messages with the old substring if-chain,
+the keyword `IntentRouter` built from the agents' INTENT_KEYWORDS, and the
+router with the TF-IDF fallback classifier. The classifier is trained on
+one set of phrasings and evaluated on held-out phrasings. A second run
+registers many synthetic intents to show how the single compiled pattern
+scales compared with checking each intent's keywords in turn.
+
+    python benchmarks/bench_intent_router.py --messages 20000 --intents 200
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from agenticai.agents import AlternativeRouteSuggesterAgent, FlightDelayScannerAgent, WeatherCheckerAgent
+from agenticai.core.router import IntentRouter, TfidfClassifier
+
+AIRPORTS = ["JFK", "LAX", "ORD", "SFO", "DEN", "ATL", "SEA", "BOS", "MIA", "DFW"]
+
+TRAIN_TEMPLATES = {
+    "weather_checker": [
+        "what's the weather like in {airport}",
+        "is there a storm near {airport}",
+        "will it snow at {airport} tomorrow",
+        "how cold is it in {airport}",
+        "is it going to be icy in {airport}",
+        "any lightning around {airport} right now",
+        "is it sunny at {airport}",
+    ],
+    "flight_delay_scanner": [
+        "is {flight} delayed",
+        "what's the status of {flight}",
+        "is {flight} on time",
+        "will {flight} leave late",
+        "has {flight} been pushed back",
+        "how late is {flight} running",
+        "when will {flight} actually depart",
+    ],
+    "alternative_route_suggester": [
+        "find me an alternative to {flight}",
+        "are there other flights to {airport}",
+        "can I rebook {flight}",
+        "is there another way to get to {airport}",
+        "what other options do I have to reach {airport}",
+        "can I switch to a different airline to {airport}",
+        "get me on an earlier connection to {airport}",
+    ],
+    "travel_organizer": [
+        "book a hotel near {airport}",
+        "I need a rental car at {airport}",
+        "what should I pack for my trip",
+        "help me plan my itinerary in {airport}",
+        "recommend a restaurant near {airport}",
+        "can you organise ground transport from {airport}",
+        "which lounge can I use at {airport}",
+    ],
+}
+
+TEST_TEMPLATES = {
+    "weather_checker": [
+        "weather forecast for {airport}",
+        "is there fog at {airport} this morning",
+        "how windy is it at {airport}",
+        "will the cold at {airport} be icy",
+        "is it sunny or cloudy at {airport}",
+        "any lightning near {airport} tonight",
+    ],
+    "flight_delay_scanner": [
+        "any delay on {flight}",
+        "flight status for {flight} please",
+        "is {flight} running late",
+        "has {flight} been pushed back again",
+        "when does {flight} actually depart",
+        "how late will {flight} leave",
+    ],
+    "alternative_route_suggester": [
+        "show me alternative flights to {airport}",
+        "I want to rebook onto a later flight",
+        "is there another flight to {airport}",
+        "what other options do I have besides {flight}",
+        "could I switch to a different airline",
+        "is there an earlier connection to {airport}",
+    ],
+    "travel_organizer": [
+        "find a hotel close to {airport}",
+        "I need a taxi from {airport}",
+        "what should I pack for the conference",
+        "plan my itinerary for the week",
+        "recommend somewhere to eat near {airport}",
+        "which lounge is best at {airport}",
+    ],
+}
+
+
+def legacy_route(query: str) -> str:
+    """The substring if-chain the chat endpoint used before the router."""
+    if "weather" in query:
+        return "weather_checker"
+    if "delay" in query or "status" in query:
+        return "flight_delay_scanner"
+    if "alternative" in query or "other flight" in query:
+        return "alternative_route_suggester"
+    return "travel_organizer"
+
+
+def corpus(templates: dict[str, list[str]], n: int, rng: random.Random) -> list[tuple[str, str]]:
+    examples = []
+    labels = list(templates)
+    for _ in range(n):
+        label = rng.choice(labels)
+        template = rng.choice(templates[label])
+        flight = f"{rng.choice(['AA', 'UA', 'DL', 'BA'])}{rng.randint(100, 9999)}"
+        examples.append((template.format(airport=rng.choice(AIRPORTS), flight=flight), label))
+    return examples
+
+
+def agent_router(classifier=None) -> IntentRouter:
+    router = IntentRouter(default="travel_organizer", classifier=classifier)
+    router.register("weather_checker", WeatherCheckerAgent.INTENT_KEYWORDS)
+    router.register("flight_delay_scanner", FlightDelayScannerAgent.INTENT_KEYWORDS)
+    router.register("alternative_route_suggester", AlternativeRouteSuggesterAgent.INTENT_KEYWORDS)
+    return router
+
+
+def measure(name: str, route, examples: list[tuple[str, str]]) -> None:
+    latencies = []
+    correct = 0
+    for text, label in examples:
+        query = text.lower()
+        start = time.perf_counter()
+        intent = route(query)
+        latencies.append((time.perf_counter() - start) * 1e6)
+        correct += intent == label
+    latencies.sort()
+    print(
+        f"{name:<24} accuracy {correct / len(examples):6.1%}   "
+        f"p50 {statistics.median(latencies):6.2f} µs   p99 {latencies[int(len(latencies) * 0.99)]:6.2f} µs"
+    )
+
+
+def scaling(intents: int, keywords_per_intent: int, messages: int, rng: random.Random) -> None:
+    words = [f"kw{i}x" for i in range(intents * keywords_per_intent)]
+    table = {f"intent{i}": words[i * keywords_per_intent : (i + 1) * keywords_per_intent] for i in range(intents)}
+    router = IntentRouter(default="none")
+    for name, keywords in table.items():
+        router.register(name, keywords)
+
+    def naive(query: str) -> str:
+        # Score every intent, as the router does, one substring check per keyword
+        scores = {name: sum(keyword in query for keyword in keywords) for name, keywords in table.items()}
+        best = max(scores, key=scores.get)
+        return best if scores[best] else "none"
+
+    pool = words + ["please", "flight", "help"] * 50
+    texts = [" ".join(rng.choice(pool) for _ in range(12)) for _ in range(messages)]
+    router.route("warm up")  # compile the pattern outside the timed loop
+    for name, route in (("keyword loop", naive), ("compiled router", lambda q: router.route(q).intent)):
+        start = time.perf_counter()
+        for text in texts:
+            route(text)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<24} {intents} intents x {keywords_per_intent} keywords: {elapsed / messages * 1e6:8.2f} µs/msg")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000, help="labelled messages to route")
+    parser.add_argument("--train", type=int, default=2000, help="classifier training examples")
+    parser.add_argument("--intents", type=int, default=200, help="synthetic intents for the scaling run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    train = corpus(TRAIN_TEMPLATES, args.train, rng)
+    test = corpus(TEST_TEMPLATES, args.messages, rng)
+    classifier = TfidfClassifier().fit([t for t, _ in train], [label for _, label in train])
+
+    keyword_router = agent_router()
+    hybrid_router = agent_router(classifier)
+    measure("legacy if-chain", legacy_route, test)
+    measure("keyword router", lambda q: keyword_router.route(q).intent, test)
+    measure("keyword + classifier", lambda q: hybrid_router.route(q).intent, test)
+    measure("classifier only", lambda q: max((s := classifier.scores(q)), key=s.get), test)
+
+    print()
+    scaling(args.intents, 10, max(args.messages // 10, 100), rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Caller-side cost of Monitoring.log_agent_execution, with and without the log pipeline.
+
+Logs a realistic agent result per call to a file at INFO and measures
+the time spent in the calling thread, which is the time the event loop
+is blocked. Four setups are compared: the previous implementation
+(`json.dumps` of the whole result on every call, then a synchronous
+handler), the lazy implementation with a synchronous handler, the lazy
+implementation behind `LogPipeline`, and the pipeline sampling one in
+ten agent records. `--sink-delay-ms` makes each write block for a while,
+as a slow stdout pipe or log shipper does. Pipeline runs also report
+dropped records.
+
+    python benchmarks/bench_logging.py --calls 50000 --queue-size 10000 --sink-delay-ms 0.05
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+
+from agenticai.core.log_pipeline import LOG_FORMAT, LogPipeline
+from agenticai.core.monitoring import Monitoring
+
+logger = logging.getLogger("agenticai.core.monitoring")
+
+
+def previous_log_agent_execution(agent_name: str, task: str, result):
+    """The logging done per call before the pipeline: eager serialization, f-strings."""
+    result_str = json.dumps(result)
+    meta = {"agent": agent_name, "task": task, "timestamp": time.time()}
+    logger.info(f"Agent execution: {agent_name} - {task}")
+    logger.debug(f"Result: {result_str[:200]}...")
+    logger.debug(f"Metadata: {meta}")
+
+
+class SlowFileHandler(logging.FileHandler):
+    def __init__(self, path: str, delay: float):
+        super().__init__(path)
+        self.delay = delay
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        if self.delay:
+            time.sleep(self.delay)
+
+
+def make_result(size: int) -> dict:
+    return {
+        "flight_number": "AA123",
+        "analysis": "Delay likely due to weather at the origin. " * 4,
+        "alternatives": [{"flight": f"AA{n}", "departure": "2024-03-24T12:00:00Z", "seats": n} for n in range(size)],
+    }
+
+
+def run(label: str, log_call, args, path: str, pipeline: LogPipeline = None) -> None:
+    calls = args.calls
+    root = logging.getLogger()
+    handler = SlowFileHandler(path, args.sink_delay_ms / 1000)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(handler)
+    if pipeline is not None:
+        pipeline.install()
+    try:
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            log_call()
+        per_call = (time.perf_counter_ns() - start) / calls
+    finally:
+        if pipeline is not None:
+            pipeline.uninstall()
+        root.removeHandler(handler)
+        handler.close()
+    extra = ""
+    if pipeline is not None:
+        stats = pipeline.stats()
+        extra = f"  dropped {stats['dropped']:6d}  sampled out {stats['sampled_out']:6d}"
+    print(f"{label:<34} {per_call / 1000:7.2f} us/call{extra}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50_000)
+    parser.add_argument("--result-size", type=int, default=50, help="alternatives in the logged result")
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    parser.add_argument("--sink-delay-ms", type=float, default=0.0, help="time each log write blocks")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.INFO)
+    monitoring = Monitoring()
+    result = make_result(args.result_size)
+
+    def current() -> None:
+        monitoring.log_agent_execution("FlightDelayScanner", "analyze_delay", result)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "agents.log")
+        run("previous (eager json, sync)", lambda: previous_log_agent_execution("X", "t", result), args, path)
+        run("lazy, sync handler", current, args, path)
+        run("lazy, pipeline", current, args, path, LogPipeline(queue_size=args.queue_size))
+        run(
+            "lazy, pipeline, 10% sampled",
+            current,
+            args,
+            path,
+            LogPipeline(queue_size=args.queue_size, sample_rates={"FlightDelayScanner": 0.1}),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark Memory keyword and metadata retrieval against the previous linear scans.
+
+Fills a store with synthetic chat interactions and times `retrieve` and
+`retrieve_by_agent` for the indexed Memory and for a linear-scan baseline
+that reproduces the old implementation.
+
+    python benchmarks/bench_memory.py --sizes 10000,100000,1000000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from agenticai.resources.memory import Memory
+
+AGENTS = ["ChatSystem", "WeatherChecker", "FlightDelayScanner", "ReservationAdjuster", "StakeholderNotifier"]
+AIRPORTS = ["JFK", "LAX", "ORD", "DFW", "ATL", "SFO", "SEA", "BOS", "MIA", "DEN"]
+WORDS = ["weather", "delay", "status", "alternative", "hotel", "car", "rental", "gate", "crew", "storm", "late"]
+
+
+def linear_retrieve(documents: dict, metadatas: dict, query: str, n_results: int) -> list:
+    """Baseline: substring scan over every stored document."""
+    matching = [doc_id for doc_id, text in documents.items() if query.lower() in text.lower()]
+    if not matching:
+        matching = sorted(metadatas, key=lambda k: float(metadatas[k].get("timestamp", "0")), reverse=True)
+    return [json.loads(documents[doc_id]) for doc_id in matching[:n_results]]
+
+
+def linear_by_agent(documents: dict, metadatas: dict, agent: str, n_results: int) -> list:
+    """Baseline: filter every metadata dict, then sort all matches by timestamp."""
+    matching = [doc_id for doc_id, meta in metadatas.items() if meta.get("agent") == agent]
+    matching = sorted(matching, key=lambda k: float(metadatas[k].get("timestamp", "0")), reverse=True)
+    return [json.loads(documents[doc_id]) for doc_id in matching[:n_results]]
+
+
+def fill(memory: Memory, size: int, rng: random.Random) -> None:
+    for i in range(size):
+        flight = f"{rng.choice(['AA', 'DL', 'UA'])}{rng.randint(100, 9999)}"
+        query = " ".join(rng.sample(WORDS, 3)) + f" {flight}"
+        memory.store(
+            agent_name=rng.choice(AGENTS),
+            task="process_query",
+            result={"query": query, "context": {"flight_number": flight, "origin": rng.choice(AIRPORTS)}},
+            metadata={"memory_key": f"{flight}_2024032{i % 10}"},
+        )
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(size: int, repeat: int) -> None:
+    rng = random.Random(size)
+    memory = Memory()
+
+    start = time.perf_counter()
+    fill(memory, size, rng)
+    build = time.perf_counter() - start
+
+    flight = json.loads(next(reversed(memory.documents.values())))["context"]["flight_number"]
+    docs, metas = memory.documents, memory.metadatas
+    cases = [
+        ("retrieve flight", lambda: memory.retrieve(flight), lambda: linear_retrieve(docs, metas, flight, 5)),
+        ("retrieve miss", lambda: memory.retrieve("zzz"), lambda: linear_retrieve(docs, metas, "zzz", 5)),
+        (
+            "retrieve_by_agent",
+            lambda: memory.retrieve_by_agent("WeatherChecker"),
+            lambda: linear_by_agent(docs, metas, "WeatherChecker", 10),
+        ),
+    ]
+
+    print(f"\n{size:,} documents (store: {build:.1f}s, {size / build:,.0f} docs/s)")
+    for label, indexed, linear in cases:
+        baseline_ms = timed(linear, max(1, repeat // 10))
+        indexed_ms = timed(indexed, repeat)
+        print(
+            f"  {label:<18} linear {baseline_ms:9.3f} ms   indexed {indexed_ms:8.3f} ms   {baseline_ms / indexed_ms:8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    for size in (int(s) for s in args.sizes.split(",")):
+        run(size, args.repeat)
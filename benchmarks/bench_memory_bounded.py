@@ -0,0 +1,53 @@
+"""
+Steady-load check for the bounded Memory store.
+
+Stores chat interactions far past the configured capacity and prints the
+entry count, tracked resident bytes, eviction counters and process RSS at
+intervals; with the limits in place these level off instead of growing.
+
+    python benchmarks/bench_memory_bounded.py --messages 500000 --max-entries 50000
+"""
+
+import argparse
+import resource
+import time
+
+from agenticai.resources.memory import Memory
+
+
+def rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(messages: int, max_entries: int, max_mb: int, report_every: int) -> None:
+    memory = Memory(max_entries=max_entries, max_bytes=max_mb * 1024 * 1024, ttl=0)
+    start = time.perf_counter()
+    print(f"{'stored':>9} {'entries':>8} {'resident MB':>11} {'evictions':>9} {'compactions':>11} {'peak RSS MB':>11}")
+    for i in range(1, messages + 1):
+        memory.store(
+            agent_name="ChatSystem",
+            task="process_query",
+            result={"query": f"is flight AA{i % 5000} delayed", "context": {"flight_number": f"AA{i % 5000}"}},
+            metadata={"memory_key": f"AA{i % 5000}_20240324"},
+        )
+        if i % 1000 == 0:
+            # Stand-in for the background task, which runs on a timer in the API
+            memory.maybe_compact()
+        if i % report_every == 0:
+            stats = memory.stats()
+            print(
+                f"{i:>9} {stats['entries']:>8} {stats['resident_bytes'] / 1e6:>11.1f} "
+                f"{stats['evictions']:>9} {stats['compactions']:>11} {rss_mb():>11.1f}"
+            )
+    print(f"{messages / (time.perf_counter() - start):,.0f} stores/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500_000)
+    parser.add_argument("--max-entries", type=int, default=50_000)
+    parser.add_argument("--max-mb", type=int, default=256)
+    parser.add_argument("--report-every", type=int, default=50_000)
+    args = parser.parse_args()
+    main(args.messages, args.max_entries, args.max_mb, args.report_every)
@@ -0,0 +1,90 @@
+"""
+Metrics recording overhead per call, and the cost of a /metrics scrape.
+
+Times the hot-path operations of `MetricsRegistry` and `Monitoring` in a
+tight loop and subtracts the cost of the empty loop: incrementing a
+counter with and without a label lookup, observing a latency histogram,
+`record_timing`, and the per-request `record_request` done by the HTTP
+middleware. Then renders a registry with many label combinations to show
+what a Prometheus scrape costs.
+
+    python benchmarks/bench_metrics.py --calls 1000000 --series 2000
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from agenticai.core.metrics import MetricsRegistry
+from agenticai.core.monitoring import Monitoring
+
+
+def per_call_ns(label: str, op, calls: int, baseline: float = 0.0) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        op()
+    ns = (time.perf_counter_ns() - start) / calls - baseline
+    if label:
+        print(f"{label:<44} {ns:8.1f} ns/call")
+    return ns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--series", type=int, default=2000, help="label combinations for the scrape run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    metrics = MetricsRegistry()
+    counter = metrics.counter("calls_total", "Calls.")
+    labelled = metrics.counter("agent_calls_total", "Calls.", ("agent", "task"))
+    histogram = metrics.histogram("latency_seconds", "Latency.", ("agent", "task"))
+    bound = histogram.labels("FlightDelayScanner", "analyze_delay")
+    monitoring = Monitoring()
+    value = 0.0123
+
+    baseline = per_call_ns("", lambda: None, args.calls)
+    print(f"{'empty call (subtracted)':<44} {baseline:8.1f} ns/call")
+    per_call_ns("counter.inc()", counter.inc, args.calls, baseline)
+    per_call_ns(
+        "counter.labels(agent, task).inc()",
+        lambda: labelled.labels("FlightDelayScanner", "analyze_delay").inc(),
+        args.calls,
+        baseline,
+    )
+    per_call_ns("bound histogram child .observe()", lambda: bound.observe(value), args.calls, baseline)
+    per_call_ns(
+        "histogram.labels(agent, task).observe()",
+        lambda: histogram.labels("FlightDelayScanner", "analyze_delay").observe(value),
+        args.calls,
+        baseline,
+    )
+    per_call_ns(
+        "Monitoring.record_timing()", lambda: monitoring.record_timing("chat_stream_ttfb", value), args.calls, baseline
+    )
+    per_call_ns(
+        "Monitoring.record_request() (per HTTP request)",
+        lambda: monitoring.record_request("POST", "/api/flight/status", 200, value),
+        args.calls,
+        baseline,
+    )
+
+    rng = random.Random(args.seed)
+    scrape = MetricsRegistry()
+    requests = scrape.counter("http_requests_total", "Requests.", ("method", "route", "status"))
+    latency = scrape.histogram("http_request_duration_seconds", "Latency.", ("method", "route"))
+    for i in range(args.series):
+        route = f"/api/route{i}"
+        requests.labels("GET", route, 200).inc()
+        latency.labels("GET", route).observe(rng.expovariate(20))
+    start = time.perf_counter()
+    text = scrape.render()
+    elapsed = time.perf_counter() - start
+    print(f"\nrender {args.series} histogram series: {elapsed * 1000:.1f} ms, {len(text) / 1024:.0f} KiB of text")
+
+
+if __name__ == "__main__":
+    main()
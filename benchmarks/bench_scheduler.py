@@ -0,0 +1,86 @@
+"""
+Many monitored flights on one event loop.
+
+Registers simulated monitors with departures spread over the next two days
+and runs the scheduler against a fake batched upstream with fixed latency.
+The scheduler clock runs `--time-scale` times faster than real time, so the
+adaptive poll intervals play out in seconds. Prints throughput, upstream
+lookups saved by per-flight batching, schedule lag (in simulated seconds)
+and peak in-flight lookups.
+
+    python benchmarks/bench_scheduler.py --monitors 50000 --flights 20000 --duration 20
+"""
+
+import argparse
+import asyncio
+import random
+import resource
+import time
+from datetime import datetime, timezone
+
+from agenticai.core.scheduler import MonitorScheduler
+
+
+async def main(monitors: int, flights: int, duration: float, scale: float, upstream_ms: float, workers: int) -> None:
+    origin = time.time()
+
+    def clock() -> float:
+        return origin + (time.time() - origin) * scale
+
+    peak_in_flight = 0
+
+    async def check(batch: list[dict]) -> list[dict]:
+        nonlocal peak_in_flight
+        peak_in_flight = max(peak_in_flight, scheduler.in_flight)
+        await asyncio.sleep(upstream_ms / 1000)  # one batched upstream call
+        return [{"status": "ON_TIME", "flight": f["flight_number"]} for f in batch]
+
+    updates = 0
+
+    async def on_update(monitor, status) -> None:
+        nonlocal updates
+        updates += 1
+
+    scheduler = MonitorScheduler(check=check, on_update=on_update, workers=workers, tick=0.05, clock=clock)
+
+    rng = random.Random(0)
+    departures = [origin + rng.uniform(1800, 48 * 3600) for _ in range(flights)]
+    start = time.perf_counter()
+    for i in range(monitors):
+        n = rng.randrange(flights)
+        departure = datetime.fromtimestamp(departures[n], timezone.utc).isoformat()
+        scheduler.add(f"TRIP{i}", {"flight_number": f"FL{n}", "scheduled_departure": departure})
+    print(f"registered {monitors:,} monitors on {flights:,} flights in {time.perf_counter() - start:.2f}s")
+
+    scheduler.start()
+    print(f"{'t':>5} {'checks/s':>9} {'lookups/s':>9} {'avg lag':>8} {'max lag':>8} {'queued':>6} {'RSS MB':>7}")
+    last_checks = last_lookups = 0
+    for second in range(1, int(duration) + 1):
+        await asyncio.sleep(1)
+        stats = scheduler.stats()
+        print(
+            f"{second:>5} {stats['checks'] - last_checks:>9,} {stats['lookups'] - last_lookups:>9,} "
+            f"{stats['avg_lag_seconds']:>7.1f}s {stats['max_lag_seconds']:>7.1f}s {stats['queued_batches']:>6} "
+            f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:>7.1f}"
+        )
+        last_checks, last_lookups = stats["checks"], stats["lookups"]
+    await scheduler.stop()
+
+    stats = scheduler.stats()
+    print(
+        f"\n{stats['checks']:,} checks, {stats['lookups']:,} upstream lookups "
+        f"({1 - stats['lookups'] / max(stats['checks'], 1):.0%} saved by batching), {updates:,} updates, "
+        f"peak in-flight {peak_in_flight}, {stats['monitors']:,} monitors still active"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--monitors", type=int, default=50_000)
+    parser.add_argument("--flights", type=int, default=20_000)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--time-scale", type=float, default=600)
+    parser.add_argument("--upstream-ms", type=float, default=50)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.monitors, args.flights, args.duration, args.time_scale, args.upstream_ms, args.workers))
@@ -0,0 +1,174 @@
+"""
+Semantic prompt cache: LLM calls, cost and latency saved.
+
+Drives the reservation adjuster, stakeholder notifier and travel organizer
+against a local fake LLM with a fixed latency and per-token price. Trips
+are drawn with a Zipf distribution (hot trips are re-processed as their
+monitors fire) and each prompt is sent in one of several variants:
+unchanged, reflowed whitespace, or with task lines reworded. Runs without
+a cache, with exact matching on the normalized prompt only, and with the
+semantic cache. Every completion is checked against the trip it was
+requested for, so a cache hit for the wrong trip is counted as an error.
+
+    python benchmarks/bench_semantic_cache.py --requests 2000 --trips 300 --latency-ms 40
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import statistics
+import time
+
+from agenticai.agents import ReservationAdjusterAgent, StakeholderNotifierAgent, TravelOrganizerAgent
+from agenticai.resources.semantic_cache import SemanticCache
+
+_TRIP_RE = re.compile(r"TRIP-\d+")
+
+REWORDINGS = [
+    ("Analyze if reservations need adjustment", "Check whether reservations need adjusting"),
+    ("Draft communication to each provider", "Write a message to each provider"),
+    ("Craft appropriate messages", "Write suitable messages"),
+    ("Prioritize notifications", "Rank notifications"),
+    ("Design a logical folder structure", "Propose a logical folder layout"),
+    ("Provide a detailed plan", "Give a detailed plan"),
+]
+
+
+class FakeLLM:
+    """Completes prompts after a fixed delay, billing input and output tokens."""
+
+    def __init__(self, latency: float, price_per_1k_tokens: float, output_tokens: int = 400):
+        self.latency = latency
+        self.price = price_per_1k_tokens
+        self.output_tokens = output_tokens
+        self.calls = 0
+        self.tokens = 0
+
+    async def __call__(self, prompt: str) -> str:
+        self.calls += 1
+        self.tokens += int(len(prompt.split()) * 1.3) + self.output_tokens
+        await asyncio.sleep(self.latency)
+        return f"plan for {_TRIP_RE.search(prompt).group(0)}"
+
+    @property
+    def cost(self) -> float:
+        return self.tokens / 1000 * self.price
+
+
+async def capture_prompts(trips: int) -> list[list[tuple[object, str]]]:
+    """Render each agent's real task prompt for every trip."""
+    prompts: list[str] = []
+
+    async def record(prompt: str) -> str:
+        prompts.append(prompt)
+        return ""
+
+    agents = [ReservationAdjusterAgent(), StakeholderNotifierAgent(), TravelOrganizerAgent()]
+    for agent in agents:
+        agent.llm = record
+        agent.memo.enabled = False
+
+    rendered = []
+    for trip in range(trips):
+        trip_id = f"TRIP-{trip:05d}"
+        flight = {
+            "flight_number": f"AA{100 + trip}",
+            "original_arrival": "2024-03-24T14:30:00Z",
+            "delay_reason": "Weather",
+        }
+        await agents[0].adjust_reservations(
+            {"hotel_check_in": "2024-03-24T16:00:00Z", "car_rental_pickup": "Hertz JFK", "other_reservations": trip_id},
+            flight,
+            "2024-03-24T17:15:00Z",
+        )
+        await agents[1].notify_stakeholders(
+            {"title": f"Board meeting {trip_id}", "original_time": "2024-03-24T18:00:00Z", "location": "Midtown"},
+            [{"name": "Ana Ruiz", "role": "Host", "preferred_contact": "Email"}],
+            "2024-03-24T17:15:00Z",
+            "Weather",
+        )
+        await agents[2].organize_travel_documents(
+            {"traveler_name": "Jane Doe", "trip_id": trip_id, "travel_dates": "2024-03-24", "destination": "LAX"},
+            [{"name": "Boarding pass", "type": "pdf"}],
+        )
+        rendered.append([(agent, prompts[-3 + i]) for i, agent in enumerate(agents)])
+    return rendered
+
+
+def variant(prompt: str, rng: random.Random) -> str:
+    choice = rng.random()
+    if choice < 0.4:
+        return prompt
+    if choice < 0.7:
+        return "\n".join(line.strip() for line in prompt.splitlines())
+    for old, new in REWORDINGS:
+        if old in prompt and rng.random() < 0.5:
+            prompt = prompt.replace(old, new)
+    return prompt
+
+
+async def run(mode: str, rendered, requests: list[tuple[int, int, str]], args) -> None:
+    llm = FakeLLM(args.latency_ms / 1000, args.price)
+    cache = None
+    if mode != "none":
+        cache = SemanticCache(threshold=1.01 if mode == "exact" else args.threshold, maxsize=args.maxsize)
+    for agent, _ in rendered[0]:
+        agent.llm = llm
+        agent.prompt_cache = cache
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    wrong = 0
+
+    async def one(trip: int, prompt: str, agent) -> None:
+        nonlocal wrong
+        async with semaphore:
+            start = time.perf_counter()
+            completion = await agent.complete(prompt)
+            latencies.append((time.perf_counter() - start) * 1000)
+            wrong += completion != f"plan for TRIP-{trip:05d}"
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(trip, prompt, rendered[trip][i][0]) for trip, i, prompt in requests))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    stats = cache.stats() if cache else {"exact_hits": 0, "semantic_hits": 0}
+    print(
+        f"{mode:<9} llm calls {llm.calls:6d}  cost ${llm.cost:8.2f}  "
+        f"p50 {statistics.median(latencies):7.2f} ms  p99 {latencies[int(len(latencies) * 0.99)]:7.2f} ms  "
+        f"total {elapsed:6.2f} s  exact hits {stats['exact_hits']:5d}  semantic hits {stats['semantic_hits']:5d}  "
+        f"wrong {wrong}"
+    )
+
+
+async def main_async(args) -> None:
+    rng = random.Random(args.seed)
+    rendered = await capture_prompts(args.trips)
+    weights = [1 / (rank + 1) ** args.zipf for rank in range(args.trips)]
+    requests = []
+    for trip in rng.choices(range(args.trips), weights, k=args.requests):
+        i = rng.randrange(3)
+        requests.append((trip, i, variant(rendered[trip][i][1], rng)))
+
+    for mode in ("none", "exact", "semantic"):
+        await run(mode, rendered, requests, args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--trips", type=int, default=300)
+    parser.add_argument("--zipf", type=float, default=1.1, help="skew of trip popularity")
+    parser.add_argument("--latency-ms", type=float, default=40, help="fake LLM latency per call")
+    parser.add_argument("--price", type=float, default=0.01, help="fake LLM price per 1k tokens")
+    parser.add_argument("--threshold", type=float, default=0.9, help="semantic cache similarity threshold")
+    parser.add_argument("--maxsize", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+API throughput across worker counts with the pre-forking launcher.
+
+For each worker count, starts `python -m agenticai.run_api` on a free
+port, waits until it answers, then drives it for a fixed time from
+several load-generator processes, each keeping `--connections`
+keep-alive connections busy. Reports requests per second and latency
+percentiles per worker count. The load generators take CPU too, so on
+small machines the numbers flatten early; run on a host with more cores
+than the largest worker count for a clean scaling curve.
+
+    python benchmarks/bench_server_workers.py --workers 1,2,4 --duration 10 --clients 2 --connections 32
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+import aiohttp
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not come up")
+
+
+async def drive(url: str, connections: int, duration: float) -> list[float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + duration
+    connector = aiohttp.TCPConnector(limit=connections)
+    async with aiohttp.ClientSession(connector=connector) as session:
+
+        async def connection() -> None:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                async with session.get(url) as response:
+                    await response.read()
+                    if response.status == 200:
+                        latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(connection() for _ in range(connections)))
+    return latencies
+
+
+def client(url: str, connections: int, duration: float, results) -> None:
+    results.put(asyncio.run(drive(url, connections, duration)))
+
+
+def run(workers: int, args) -> None:
+    port = free_port()
+    env = {**os.environ, "ENVIRONMENT": "production", "LOGGING_LEVEL": "WARNING", "LOG_ASYNC": "true"}
+    command = [sys.executable, "-m", "agenticai.run_api", "--port", str(port), "--workers", str(workers)]
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}{args.path}"
+    try:
+        wait_until_up(url)
+        results = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(target=client, args=(url, args.connections, args.duration, results))
+            for _ in range(args.clients)
+        ]
+        for process in clients:
+            process.start()
+        latencies = sorted(sample for _ in clients for sample in results.get())
+        for process in clients:
+            process.join()
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    rate = len(latencies) / args.duration
+    print(
+        f"{workers:>3} workers  {rate:9.0f} req/s  p50 {statistics.median(latencies) * 1000:6.1f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:6.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per worker count")
+    parser.add_argument("--clients", type=int, default=2, help="load-generator processes")
+    parser.add_argument("--connections", type=int, default=32, help="concurrent connections per client")
+    parser.add_argument("--path", default="/", help="endpoint to request")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.clients} clients x {args.connections} connections, GET {args.path}")
+    for workers in (int(n) for n in args.workers.split(",")):
+        run(workers, args)
+
+
+if __name__ == "__main__":
+    main()
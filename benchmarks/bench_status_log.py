@@ -0,0 +1,68 @@
+"""
+Cost of adding a status update as the trip history grows.
+
+Compares the old read-modify-write of a single JSON document with the
+append-only JSON Lines log at several history lengths, in a temporary
+directory.
+
+    python benchmarks/bench_status_log.py --histories 100,1000,10000 --fsync never
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from agenticai.resources.file_system import FileSystem
+
+
+def legacy_add(path: str, status: dict) -> None:
+    """The previous implementation: load the whole log, append, rewrite it."""
+    if os.path.exists(path):
+        with open(path) as f:
+            log = json.load(f)
+    else:
+        log = {"updates": []}
+    log["updates"].append(status)
+    with open(path, "w") as f:
+        json.dump(log, f, indent=2)
+
+
+def run(history: int, samples: int, fsync: str) -> None:
+    with tempfile.TemporaryDirectory() as base:
+        fs = FileSystem(base_dir=base, fsync_policy=fsync)
+        legacy_path = os.path.join(base, "legacy.json")
+        status = {"status": "delayed", "flight_number": "AA123", "delay_minutes": 45}
+
+        with open(legacy_path, "w") as f:
+            json.dump({"updates": [status] * history}, f, indent=2)
+        for _ in range(history):
+            fs.add_status_update("trip", dict(status))
+
+        start = time.perf_counter()
+        for _ in range(samples):
+            legacy_add(legacy_path, dict(status))
+        legacy_us = (time.perf_counter() - start) * 1e6 / samples
+
+        start = time.perf_counter()
+        for _ in range(samples):
+            fs.add_status_update("trip", dict(status))
+        append_us = (time.perf_counter() - start) * 1e6 / samples
+
+        start = time.perf_counter()
+        fs.tail_status_updates("trip", 10)
+        tail_us = (time.perf_counter() - start) * 1e6
+
+    print(f"{history:>8} {legacy_us:>14.1f} {append_us:>12.1f} {tail_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--histories", default="100,1000,10000")
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--fsync", default="never", choices=FileSystem.FSYNC_POLICIES)
+    args = parser.parse_args()
+    print(f"{'history':>8} {'rewrite us/op':>14} {'append us/op':>12} {'tail10 us':>10}")
+    for history in (int(h) for h in args.histories.split(",")):
+        run(history, args.samples, args.fsync)
@@ -0,0 +1,156 @@
+"""
+Upstream resilience: tail latency, errors and load under injected faults.
+
+Starts a local stub of the flight API that answers in a few milliseconds,
+except for a fraction of slow responses (the tail), a fraction of 503s,
+and an outage window during which every request hangs. `FlightAPI` is
+driven with four policies: no protection (a long timeout only), timeout
+plus retries, the same with a circuit breaker and stale fallback, and all
+of that plus hedged requests. Calls arrive at a fixed rate whatever the
+latency, as user traffic does. Reports caller
+latency percentiles, failed calls, stale responses and how many requests
+reached the upstream.
+
+    python benchmarks/bench_upstream_resilience.py --calls 3000 --rate 1000 --slow-rate 0.03 --error-rate 0.03
+"""
+
+import argparse
+import asyncio
+import contextlib
+import random
+import statistics
+import time
+
+from aiohttp import web
+
+from agenticai.core.resilience import CircuitBreaker, Upstream
+from agenticai.resources.apis import FlightAPI
+from agenticai.resources.http import HTTPClientPool
+
+
+class FaultyUpstream:
+    """Flight API stub with a slow tail, injected errors and an outage window."""
+
+    def __init__(self, args, rng: random.Random):
+        self.args = args
+        self.rng = rng
+        self.requests = 0
+        self.outage: tuple[float, float] = (0.0, 0.0)
+
+    async def flight(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        now = time.perf_counter()
+        if self.outage[0] <= now < self.outage[1]:
+            await asyncio.sleep(self.outage[1] - now + 1)
+        roll = self.rng.random()
+        if roll < self.args.error_rate:
+            return web.Response(status=503, text="injected fault")
+        if roll < self.args.error_rate + self.args.slow_rate:
+            await asyncio.sleep(self.args.slow_ms / 1000)
+        else:
+            await asyncio.sleep(self.rng.uniform(0.002, 0.008))
+        return web.json_response({"ident": request.match_info["flight"]})
+
+
+def policies(args) -> dict[str, Upstream]:
+    def breaker() -> CircuitBreaker:
+        return CircuitBreaker("flights", failure_threshold=5, reset_timeout=args.outage_ms / 2000)
+
+    return {
+        "unprotected": Upstream(
+            "flights", timeout=30, retries=0, breaker=CircuitBreaker("flights", 10**9), stale_ttl=0
+        ),
+        "timeout+retry": Upstream(
+            "flights",
+            timeout=args.timeout_ms / 1000,
+            retries=2,
+            backoff_base=0.01,
+            breaker=CircuitBreaker("flights", 10**9),
+            stale_ttl=0,
+        ),
+        "+breaker+stale": Upstream(
+            "flights", timeout=args.timeout_ms / 1000, retries=2, backoff_base=0.01, breaker=breaker()
+        ),
+        "+hedging": Upstream(
+            "flights",
+            timeout=args.timeout_ms / 1000,
+            retries=2,
+            backoff_base=0.01,
+            hedge_after=args.hedge_ms / 1000,
+            breaker=breaker(),
+        ),
+    }
+
+
+async def run(name: str, upstream: Upstream, args) -> None:
+    rng = random.Random(args.seed)
+    stub = FaultyUpstream(args, rng)
+    app = web.Application()
+    app.router.add_get("/flights/{flight}", stub.flight)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    pool = HTTPClientPool(limit=0, limit_per_host=0)
+    api = FlightAPI("key", pool=pool, base_url=f"http://127.0.0.1:{runner.addresses[0][1]}", upstream=upstream)
+
+    flights = [f"AA{n}" for n in range(args.flights)]
+    for flight in flights:  # warm the stale copies, as normal traffic would
+        with contextlib.suppress(Exception):
+            await api.get_flight_info(flight)
+    stub.requests = 0
+
+    latencies = []
+    failed = 0
+    start = time.perf_counter()
+    outage_at = start + args.outage_after_ms / 1000
+    stub.outage = (outage_at, outage_at + args.outage_ms / 1000)
+
+    async def one(flight: str) -> None:
+        nonlocal failed
+        began = time.perf_counter()
+        try:
+            await api.get_flight_info(flight)
+        except Exception:
+            failed += 1
+        latencies.append((time.perf_counter() - began) * 1000)
+
+    calls = []
+    for i in range(args.calls):
+        await asyncio.sleep(max(0.0, start + i / args.rate - time.perf_counter()))
+        calls.append(asyncio.ensure_future(one(rng.choice(flights))))
+    await asyncio.gather(*calls)
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    await runner.cleanup()
+
+    latencies.sort()
+    stats = upstream.stats()
+    print(
+        f"{name:<15} p50 {statistics.median(latencies):7.1f} ms  p99 {latencies[int(len(latencies) * 0.99)]:7.1f} ms  "
+        f"max {latencies[-1]:7.1f} ms  failed {failed:4d}  stale {stats['stale_served']:4d}  "
+        f"upstream requests {stub.requests:5d}  hedges {stats['hedged']:4d}  total {elapsed:5.2f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=3000)
+    parser.add_argument("--flights", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=1000, help="calls per second")
+    parser.add_argument("--slow-rate", type=float, default=0.03, help="fraction of slow responses")
+    parser.add_argument("--slow-ms", type=float, default=400)
+    parser.add_argument("--error-rate", type=float, default=0.03, help="fraction of 503 responses")
+    parser.add_argument("--timeout-ms", type=float, default=250, help="per-attempt timeout")
+    parser.add_argument("--hedge-ms", type=float, default=30, help="delay before a hedged request")
+    parser.add_argument("--outage-after-ms", type=float, default=1000)
+    parser.add_argument("--outage-ms", type=float, default=1000, help="length of the upstream outage")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for name, upstream in policies(args).items():
+        asyncio.run(run(name, upstream, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Recall and latency of the IVF vector index against exact brute-force search.
+
+Embeds synthetic chat memories with the hashing embedder, then for a batch
+of paraphrased queries compares IVF top-k results with exact top-k at
+several n_probe settings.
+
+    python benchmarks/bench_vector_index.py --sizes 10000,100000 --k 10
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from agenticai.resources.vector_index import HashingEmbedder, VectorIndex
+
+AIRPORTS = ["JFK", "LAX", "ORD", "DFW", "ATL", "SFO", "SEA", "BOS", "MIA", "DEN"]
+TEMPLATES = [
+    "weather at {a} is {w} with strong winds, delay risk {r}",
+    "flight {f} from {a} to {b} is delayed because of {w}",
+    "book a hotel near {b} for late arrival of {f}",
+    "alternative route from {a} to {b} via {c} for {f}",
+    "notify contacts that {f} lands late at {b}",
+]
+WEATHER = ["thunderstorms", "snow", "fog", "rain", "clear skies", "ice"]
+
+
+def make_text(rng: random.Random) -> str:
+    a, b, c = rng.sample(AIRPORTS, 3)
+    return rng.choice(TEMPLATES).format(
+        a=a, b=b, c=c, f=f"AA{rng.randint(100, 999)}", w=rng.choice(WEATHER), r=rng.choice(["low", "high"])
+    )
+
+
+def run(size: int, n_queries: int, k: int, probes: list[int]) -> None:
+    rng = random.Random(size)
+    embedder = HashingEmbedder(256)
+    index = VectorIndex(embedding_function=embedder, dim=256, ivf_threshold=0)
+
+    start = time.perf_counter()
+    texts = [make_text(rng) for _ in range(size)]
+    for i in range(0, size, 10_000):
+        index.add([f"doc{j}" for j in range(i, min(i + 10_000, size))], texts[i : i + 10_000])
+    embed_s = time.perf_counter() - start
+
+    queries = embedder([make_text(rng) for _ in range(n_queries)])
+
+    start = time.perf_counter()
+    exact = index.search_vectors(queries, k, exact=True)
+    exact_ms = (time.perf_counter() - start) * 1000 / n_queries
+
+    start = time.perf_counter()
+    index._ensure_ivf()
+    build_s = time.perf_counter() - start
+
+    print(f"\n{size:,} vectors (embed+add {embed_s:.1f}s, IVF build {build_s:.2f}s, {len(index._lists)} lists)")
+    print(f"  exact         {exact_ms:8.3f} ms/query  recall@{k} 1.000")
+    for n_probe in probes:
+        index.n_probe = n_probe
+        start = time.perf_counter()
+        approx = index.search_vectors(queries, k)
+        ivf_ms = (time.perf_counter() - start) * 1000 / n_queries
+        # A hit is any result scoring at least the exact k-th score, so duplicate texts (ties) count
+        recall = np.mean([sum(score >= e[-1][1] - 1e-6 for _, score in a) / len(e) for a, e in zip(approx, exact) if e])
+        print(f"  ivf probe={n_probe:<3} {ivf_ms:8.3f} ms/query  recall@{k} {recall:.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--probes", default="1,4,8,16")
+    args = parser.parse_args()
+    for size in (int(s) for s in args.sizes.split(",")):
+        run(size, args.queries, args.k, [int(p) for p in args.probes.split(",")])
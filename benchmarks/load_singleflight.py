@@ -0,0 +1,95 @@
+"""
+Load test for single-flight coalescing of concurrent flight lookups.
+
+Simulates a burst of passengers on a handful of delayed flights hitting
+FlightAPI.get_flight_info against a local stub server and counts how many
+requests actually reach upstream, with and without coalescing. The same
+burst is then replayed through FlightDelayScannerAgent.analyze_delay.
+
+    python benchmarks/load_singleflight.py --callers 2000 --flights 5
+"""
+
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+
+from agenticai.agents import FlightDelayScannerAgent
+from agenticai.resources.apis import FlightAPI
+from agenticai.resources.http import HTTPClientPool
+
+
+class StubFlightServer:
+    """Local flight API that counts requests and answers after a fixed latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = 0
+
+    async def flight(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return web.json_response({"ident": request.match_info["ident"], "status": "Delayed"})
+
+    async def start(self) -> tuple[web.AppRunner, str]:
+        app = web.Application()
+        app.router.add_get("/flights/{ident}", self.flight)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, f"http://127.0.0.1:{port}"
+
+
+async def burst(call, callers: int, flights: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(call(f"AA{100 + i % flights}") for i in range(callers)))
+    return time.perf_counter() - start
+
+
+async def main(callers: int, flights: int, latency: float) -> None:
+    server = StubFlightServer(latency)
+    runner, base_url = await server.start()
+    pool = HTTPClientPool(limit=200, limit_per_host=200)
+    api = FlightAPI(api_key="bench", pool=pool, base_url=base_url)
+    try:
+        elapsed = await burst(api._fetch_flight_info, callers, flights)
+        print(f"{'uncoalesced':<12} {callers} callers -> {server.requests:>5} upstream calls in {elapsed:.2f}s")
+
+        server.requests = 0
+        elapsed = await burst(api.get_flight_info, callers, flights)
+        stats = api.singleflight.stats()
+        print(
+            f"{'singleflight':<12} {callers} callers -> {server.requests:>5} upstream calls in {elapsed:.2f}s "
+            f"(deduplicated {stats['deduplicated']}, ratio {stats['dedup_ratio']:.1%})"
+        )
+    finally:
+        await pool.close()
+        await runner.cleanup()
+
+    agent = FlightDelayScannerAgent()
+    analyses = 0
+    analyze = agent._analyze_delay
+
+    async def counted(*args):
+        nonlocal analyses
+        analyses += 1
+        await asyncio.sleep(latency)
+        return await analyze(*args)
+
+    agent._analyze_delay = counted
+    await asyncio.gather(
+        *(agent.analyze_delay(f"AA{100 + i % flights}", "JFK to LAX", "2024-03-24") for i in range(callers))
+    )
+    print(f"{'agent':<12} {callers} callers -> {analyses:>5} analyses ({agent.singleflight.stats()})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--callers", type=int, default=1000)
+    parser.add_argument("--flights", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="upstream latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.callers, args.flights, args.latency))
@@ -0,0 +1,139 @@
+"""
+Hold many idle trip-update WebSockets on one uvicorn worker.
+
+Starts the API in a single uvicorn worker, registers a few monitored trips,
+opens `--connections` WebSockets spread across them and lets them idle.
+Reports the server's resident memory and CPU use while idle, then pauses
+each trip's monitor and measures how long the resulting event takes to
+reach every subscriber.
+
+    python benchmarks/load_trip_websockets.py --connections 10000 --trips 10 --idle 10
+
+Each connection is a file descriptor on both sides; raise `ulimit -n` well
+above the connection count first.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+
+def proc_stats(pid: int) -> tuple[float, float]:
+    """Resident MB and CPU seconds (user + system) of a process."""
+    with open(f"/proc/{pid}/status") as f:
+        rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmRSS"))
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    return rss_kb / 1024, (int(fields[11]) + int(fields[12])) / ticks
+
+
+async def wait_for_server(session: aiohttp.ClientSession, base: str) -> None:
+    for _ in range(100):
+        try:
+            async with session.get(f"{base}/") as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def main(connections: int, trips: int, idle: float, port: int) -> None:
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "agenticai.api:app",
+            "--port",
+            str(port),
+            "--ws",
+            "auto",
+            "--log-level",
+            "warning",
+            "--backlog",
+            "4096",
+        ],
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            await wait_for_server(session, base)
+            rss_start, _ = proc_stats(server.pid)
+
+            flight = {"origin": "JFK", "destination": "LAX", "scheduled_departure": "2099-01-01T10:00:00Z"}
+            trip_ids = []
+            for i in range(trips):
+                async with session.post(f"{base}/api/flight/monitor", json=dict(flight, flight_number=f"AA{i}")) as r:
+                    trip_ids.append((await r.json())["trip_id"])
+
+            semaphore = asyncio.Semaphore(500)
+            received: dict[str, list[float]] = {trip_id: [] for trip_id in trip_ids}
+            sockets = []
+
+            async def connect(i: int) -> None:
+                trip_id = trip_ids[i % trips]
+                async with semaphore:
+                    websocket = await session.ws_connect(f"{base.replace('http', 'ws')}/ws/trips/{trip_id}")
+                sockets.append(websocket)
+                async for message in websocket:
+                    event = message.json()
+                    if event["type"] == "monitor" and event["data"]["state"] == "paused":
+                        received[trip_id].append(time.perf_counter())
+
+            start = time.perf_counter()
+            readers = [asyncio.ensure_future(connect(i)) for i in range(connections)]
+            while len(sockets) < connections:
+                await asyncio.sleep(0.05)
+            print(f"opened {connections:,} WebSockets in {time.perf_counter() - start:.1f}s")
+
+            _, cpu_before = proc_stats(server.pid)
+            await asyncio.sleep(idle)
+            rss, cpu_after = proc_stats(server.pid)
+            print(
+                f"idle {idle:.0f}s: server RSS {rss:.0f} MB ({(rss - rss_start) * 1024 / connections:.1f} KB/connection), "
+                f"CPU {100 * (cpu_after - cpu_before) / idle:.1f}%"
+            )
+
+            latencies = []
+            per_trip = connections // trips
+            for trip_id in trip_ids:
+                sent = time.perf_counter()
+                async with session.post(f"{base}/api/monitors/{trip_id}/pause"):
+                    pass
+                while len(received[trip_id]) < per_trip and time.perf_counter() - sent < 10:
+                    await asyncio.sleep(0.001)
+                latencies.extend(t - sent for t in received[trip_id])
+            latencies.sort()
+            print(
+                f"fan-out to ~{per_trip:,} subscribers per trip: delivered {len(latencies):,}, "
+                f"p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+                f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms"
+            )
+
+            for websocket in sockets:
+                await websocket.close()
+            for reader in readers:
+                reader.cancel()
+            await asyncio.gather(*readers, return_exceptions=True)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--trips", type=int, default=10)
+    parser.add_argument("--idle", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(main(args.connections, args.trips, args.idle, args.port))
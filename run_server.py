@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 """
-Simple server script that directly runs with uvicorn
+Simple server script that runs the multi-worker API launcher
 """
 
 import importlib.util
@@ -23,14 +23,10 @@ os.makedirs(tmp_dir, exist_ok=True)
 os.environ["TMPDIR"] = tmp_dir
 
 # Import necessary modules
-import uvicorn
+from agenticai.run_api import run_server
 
 # Run the server directly
 if __name__ == "__main__":
     print("Starting the API server directly...")
-    uvicorn.run(
-        "agenticai.api:app",
-        host="0.0.0.0",
-        port=8080,  # Using port 8080 which is often exposed in containers
-        reload=False,  # Disable reload to avoid forking issues
-    )
+    # Port 8080 is often exposed in containers; workers come from SERVER_WORKERS (default: one per core)
+    run_server(host="0.0.0.0", port=8080, reload=False)
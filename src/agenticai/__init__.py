@@ -6,22 +6,27 @@ weather checks, delay predictions, reservation adjustments, stakeholder
 notifications, and alternate travel suggestions.
 """
 
-from .agents import (
-    AlternativeRouteSuggesterAgent,
-    FlightDelayScannerAgent,
-    ReservationAdjusterAgent,
-    StakeholderNotifierAgent,
-    TravelOrganizerAgent,
-    WeatherCheckerAgent,
-)
-from .core import FlightDelayCrew, Monitoring
-from .resources import FileSystem, FlightAPI, Memory, NotificationAPI, WeatherAPI
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_exports
 
 __version__ = "0.1.0"
 
-from .api import app as api_app
-from .run_api import run_server
-from .run_app import run_app
+if TYPE_CHECKING:
+    from .agents import (
+        AlternativeRouteSuggesterAgent,
+        FlightDelayScannerAgent,
+        ReservationAdjusterAgent,
+        StakeholderNotifierAgent,
+        TravelOrganizerAgent,
+        WeatherCheckerAgent,
+    )
+    from .api import app as api_app
+    from .core import FlightDelayCrew, Monitoring
+    from .registry import AgentRegistry
+    from .resources import FileSystem, FlightAPI, Memory, NotificationAPI, WeatherAPI
+    from .run_api import run_server
+    from .run_app import run_app
 
 __all__ = [
     "WeatherCheckerAgent",
@@ -32,6 +37,7 @@ __all__ = [
     "TravelOrganizerAgent",
     "FlightDelayCrew",
     "Monitoring",
+    "AgentRegistry",
     "Memory",
     "FileSystem",
     "WeatherAPI",
@@ -41,3 +47,31 @@ __all__ = [
     "run_server",
     "run_app",
 ]
+
+
+# Imported on first access (PEP 562), so `import agenticai` stays cheap and a
+# CLI run, test or worker only loads what it uses: the API pulls in FastAPI,
+# the launchers uvicorn and subprocess machinery.
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    globals(),
+    {
+        "WeatherCheckerAgent": ".agents",
+        "FlightDelayScannerAgent": ".agents",
+        "ReservationAdjusterAgent": ".agents",
+        "StakeholderNotifierAgent": ".agents",
+        "AlternativeRouteSuggesterAgent": ".agents",
+        "TravelOrganizerAgent": ".agents",
+        "FlightDelayCrew": ".core",
+        "Monitoring": ".core",
+        "AgentRegistry": ".registry",
+        "Memory": ".resources",
+        "FileSystem": ".resources",
+        "WeatherAPI": ".resources",
+        "FlightAPI": ".resources",
+        "NotificationAPI": ".resources",
+        "api_app": (".api", "app"),
+        "run_server": ".run_api",
+        "run_app": ".run_app",
+    },
+)
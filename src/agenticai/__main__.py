@@ -24,7 +24,7 @@ from .agents import (
 from .core import FlightDelayCrew, Monitoring
 
 # Import resources
-from .resources import FileSystem, Memory
+from .resources import AsyncFileSystem, Memory
 
 
 async def main():
@@ -33,7 +33,7 @@ async def main():
 
     # Initialize resources
     memory = Memory()
-    file_system = FileSystem()
+    file_system = AsyncFileSystem()
     monitoring = Monitoring()
 
     # Initialize agents
@@ -76,15 +76,15 @@ async def main():
     }
 
     # Create trip folder for documents
-    file_system.create_trip_folder(booking_data["trip_id"])
+    await file_system.create_trip_folder(booking_data["trip_id"])
 
     # Add initial flight information
-    file_system.save_document(
+    await file_system.save_document(
         trip_id=booking_data["trip_id"], document_type="flight", content=flight_info, filename="flight_info.json"
     )
 
     # Add initial status
-    file_system.add_status_update(
+    await file_system.add_status_update(
         trip_id=booking_data["trip_id"],
         status={
             "status": "Flight delayed",
@@ -114,6 +114,8 @@ async def main():
     except Exception as e:
         logger.error(f"Error handling flight delay: {e}")
         monitoring.log_error("FlightDelayCrew", "handle_flight_delay", e)
+    finally:
+        await file_system.aclose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,31 @@
+"""PEP 562 lazy exports for package `__init__` modules."""
+
+import importlib
+from collections.abc import Mapping
+from typing import Any, Callable, Union
+
+
+def lazy_exports(
+    package: str, namespace: dict[str, Any], exports: Mapping[str, Union[str, tuple[str, str]]]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Build a package's `__getattr__` and `__dir__` for names imported on first access.
+
+    `exports` maps each public name to the relative module defining it,
+    or to `(module, attribute)` when it is exported under another name.
+    A resolved name is stored in `namespace` (the package globals), so
+    later lookups are plain attribute reads.
+    """
+
+    def __getattr__(name: str) -> Any:
+        target = exports.get(name)
+        if target is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module, attribute = (target, name) if isinstance(target, str) else target
+        value = getattr(importlib.import_module(module, package), attribute)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
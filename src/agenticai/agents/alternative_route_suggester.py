@@ -1,11 +1,26 @@
 from typing import Any, Dict
 
+from ..core.memo import memoize
+from ..core.tracing import traced
 from .base import AgentConfig, BaseAgent
 
 
 class AlternativeRouteSuggesterAgent(BaseAgent):
     """Agent responsible for suggesting alternative travel routes when flights are delayed."""
 
+    INTENT_KEYWORDS = (
+        "alternative",
+        "other flight",
+        "another flight",
+        "different flight",
+        "rebook",
+        "reroute",
+        "earlier flight",
+        "later flight",
+        "backup",
+        "instead",
+    )
+
     def __init__(self):
         config = AgentConfig(
             name="AlternativeRouteSuggester",
@@ -18,15 +33,17 @@ class AlternativeRouteSuggesterAgent(BaseAgent):
         )
         super().__init__(config)
 
+    @traced()
+    @memoize(key=("current_flight", "destination"), disk=True)
     async def suggest_alternatives(self, current_flight: Dict[str, Any], destination: str) -> Dict[str, Any]:
         """Suggest alternative routes to a destination when a flight is delayed."""
         # Generate simulated alternative routes
         origin = current_flight.get("origin", "Unknown")
         flight_num = current_flight.get("flight_number", "Unknown")
-        
+
         # Create mocked alternative routes
         alternatives = []
-        
+
         # Direct flight alternative (different airline)
         direct = {
             "type": "direct_flight",
@@ -35,19 +52,13 @@ class AlternativeRouteSuggesterAgent(BaseAgent):
             "departure_time": "2 hours from now",
             "arrival_time": "4 hours from now",
             "price_difference": "+$150",
-            "availability": "6 seats left"
+            "availability": "6 seats left",
         }
-        
+
         # Connection flight alternative
-        connecting_cities = {
-            "JFK": "BOS",
-            "LAX": "SFO",
-            "ORD": "DTW",
-            "DFW": "IAH",
-            "ATL": "CLT"
-        }
+        connecting_cities = {"JFK": "BOS", "LAX": "SFO", "ORD": "DTW", "DFW": "IAH", "ATL": "CLT"}
         connection = connecting_cities.get(origin, "DCA")
-        
+
         connection_flight = {
             "type": "connection",
             "flights": [
@@ -55,31 +66,25 @@ class AlternativeRouteSuggesterAgent(BaseAgent):
                     "flight": f"UA{int(flight_num[2:]) - 50}" if flight_num[0:2].isalpha() else "UA1422",
                     "from": origin,
                     "to": connection,
-                    "departure_time": "1.5 hours from now"
+                    "departure_time": "1.5 hours from now",
                 },
                 {
                     "flight": f"UA{int(flight_num[2:]) + 75}" if flight_num[0:2].isalpha() else "UA1575",
                     "from": connection,
                     "to": destination,
-                    "departure_time": "4 hours from now"
-                }
+                    "departure_time": "4 hours from now",
+                },
             ],
             "airline": "United Airlines",
             "total_travel_time": "6.5 hours",
             "price_difference": "+$50",
-            "availability": "12 seats left"
+            "availability": "12 seats left",
         }
-        
+
         # Alternative airport
-        nearby_airports = {
-            "JFK": "LGA",
-            "LAX": "BUR",
-            "ORD": "MDW",
-            "DFW": "DAL",
-            "ATL": "PDK"
-        }
+        nearby_airports = {"JFK": "LGA", "LAX": "BUR", "ORD": "MDW", "DFW": "DAL", "ATL": "PDK"}
         alt_airport = nearby_airports.get(destination, destination)
-        
+
         alternative_airport = {
             "type": "alternative_airport",
             "flight": f"AA{int(flight_num[2:]) + 200}" if flight_num[0:2].isalpha() else "AA3689",
@@ -89,16 +94,16 @@ class AlternativeRouteSuggesterAgent(BaseAgent):
             "distance_to_original": "25 miles",
             "ground_transport": "Taxi, Shuttle, Rideshare available",
             "price_difference": "-$75",
-            "availability": "2 seats left"
+            "availability": "2 seats left",
         }
-        
+
         # Add all alternatives
         alternatives.extend([direct, connection_flight, alternative_airport])
-        
+
         return {
             "original_flight": flight_num,
             "origin": origin,
             "destination": destination,
             "alternatives": alternatives,
-            "recommendation": "We recommend the direct Delta flight as the fastest option to your destination."
+            "recommendation": "We recommend the direct Delta flight as the fastest option to your destination.",
         }
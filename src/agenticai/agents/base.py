@@ -1,20 +1,39 @@
 """Base agent classes."""
+
+from collections.abc import Awaitable
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from ..core.governor import Governor, estimate_tokens
+from ..core.memo import AgentMemo, MemoSpec, cache_mode, memoize
+from ..core.tracing import CLIENT, get_tracer, traced
+
+if TYPE_CHECKING:
+    from ..resources.semantic_cache import SemanticCache
+
 # Replace actual crewai import with a mock implementation
 # from crewai import Agent
 
+
 @dataclass
 class AgentConfig:
     """Configuration for an agent."""
+
     name: str
     role: str
     goal: str
     backstory: str = ""
     temperature: float = 0.7
     verbose: bool = False
+    allow_delegation: bool = True
     llm_config: dict = None
     tools: list = None
-    
+    # Upstream/LLM budgets enforced by the governor (None: settings default, 0: unlimited)
+    max_rpm: Optional[int] = None
+    max_tpm: Optional[int] = None
+    max_in_flight: Optional[int] = None
+    priority: int = 5  # lower is admitted first when calls are queued
+
     def to_dict(self):
         """Convert config to dictionary."""
         return {
@@ -24,16 +43,38 @@ class AgentConfig:
             "backstory": self.backstory,
             "temperature": self.temperature,
             "verbose": self.verbose,
+            "allow_delegation": self.allow_delegation,
             "llm_config": self.llm_config,
-            "tools": self.tools
+            "tools": self.tools,
+            "max_rpm": self.max_rpm,
+            "max_tpm": self.max_tpm,
+            "max_in_flight": self.max_in_flight,
+            "priority": self.priority,
         }
 
+
 # Create a mock Agent class to replace the crewAI one
 class Agent:
     """Mock crewAI Agent class."""
-    def __init__(self, name, role, goal, backstory="", verbose=False, allow_delegation=True, 
-                 tools=None, max_iter=15, max_rpm=None, max_tokens=None, memory=True,
-                 temperature=0.7, callbacks=None, llm=None, **kwargs):
+
+    def __init__(
+        self,
+        name,
+        role,
+        goal,
+        backstory="",
+        verbose=False,
+        allow_delegation=True,
+        tools=None,
+        max_iter=15,
+        max_rpm=None,
+        max_tokens=None,
+        memory=True,
+        temperature=0.7,
+        callbacks=None,
+        llm=None,
+        **kwargs,
+    ):
         self.name = name
         self.role = role
         self.goal = goal
@@ -50,9 +91,13 @@ class Agent:
         self.llm = llm
         self.kwargs = kwargs
 
+
 class BaseAgent:
     """Base agent class with common functionality."""
-    
+
+    # Chat keywords that route a message to this agent (see core.router)
+    INTENT_KEYWORDS: tuple = ()
+
     def __init__(self, config: AgentConfig = None):
         """Initialize the agent with configuration."""
         self.config = config or AgentConfig(
@@ -60,7 +105,7 @@ class BaseAgent:
             role="Generic Agent",
             goal="Perform tasks as assigned",
         )
-        
+
         # Create a crewAI agent with the configuration
         self.agent = Agent(
             name=self.config.name,
@@ -68,17 +113,89 @@ class BaseAgent:
             goal=self.config.goal,
             backstory=self.config.backstory,
             verbose=self.config.verbose,
+            allow_delegation=self.config.allow_delegation,
             temperature=self.config.temperature,
             tools=self.config.tools or [],
+            max_rpm=self.config.max_rpm,
         )
-        
+
+        # Caches for methods declared with @memoize; the registry may attach a shared disk tier
+        self.memo = AgentMemo(self.config.name)
+
+        # Async prompt -> completion callable; without one, execute() returns a mock response
+        self.llm: Optional[Callable[[str], Awaitable[str]]] = None
+        # Completions shared across agents for near-duplicate prompts; attached by the registry
+        self.prompt_cache: Optional[SemanticCache] = None
+        # Shared rate-limit and concurrency governor for LLM calls; attached by the registry
+        self.governor: Optional[Governor] = None
+
+    @traced()
+    @memoize(key=("task_description", "context"))
     async def execute(self, task_description: str, context: dict = None) -> dict:
         """Execute a task with the agent (async interface)."""
-        # In a real implementation, this would call the crewAI agent
-        # For now, just return a mock response
+        if self.llm is None:
+            # In a real implementation, this would call the crewAI agent
+            # For now, just return a mock response
+            result = f"Executed '{task_description}' with agent {self.config.name}"
+        else:
+            result = await self.complete(task_description)
         return {
-            "result": f"Executed '{task_description}' with agent {self.config.name}",
+            "result": result,
             "agent": self.config.name,
             "task": task_description,
             "context": context or {},
         }
+
+    async def complete(self, prompt: str) -> str:
+        """Get the LLM completion for a prompt, reusing the completion of a near-duplicate prompt."""
+        mode = cache_mode()
+        if self.prompt_cache is None or mode == "bypass":
+            return await self._call_llm(prompt)
+        if mode == "refresh":
+            completion = await self._call_llm(prompt)
+            self.prompt_cache.store(prompt, completion, namespace=self.config.name)
+            return completion
+        cached: str = await self.prompt_cache.get_or_complete(prompt, self._call_llm, namespace=self.config.name)
+        return cached
+
+    async def _call_llm(self, prompt: str) -> str:
+        """Call the LLM once the governor admits it under this agent's budgets."""
+        llm = self.llm
+        if llm is None:
+            raise RuntimeError(f"{self.config.name} has no LLM attached")
+        with get_tracer().span("llm.complete", CLIENT, {"agent": self.config.name}) as span:
+            if self.governor is None:
+                return await llm(prompt)
+            tokens = estimate_tokens(prompt)
+            async with self.governor.slot(self.config.name, tokens=tokens) as permit:
+                completion = await llm(prompt)
+                permit.record_tokens(tokens + estimate_tokens(completion))
+            if span is not None:
+                span.set_attribute("llm.tokens", permit.tokens)
+                span.set_attribute("governor.wait_ms", round(permit.waited * 1000, 3))
+            return completion
+
+    def cache_stats(self) -> dict[str, Any]:
+        """Hit-rate metrics for this agent's memoized methods."""
+        return self.memo.stats()
+
+    async def invalidate_cache(self, method: str, *args: Any, **kwargs: Any) -> None:
+        """Drop the cached result of `method` for these arguments from every tier."""
+        spec = self._memo_spec(method)
+        await self.memo.invalidate(spec, spec.key(self, args, kwargs))
+
+    async def clear_cache(self, method: Optional[str] = None) -> None:
+        """Drop every cached result of one memoized method, or of all of them."""
+        if method is not None:
+            await self.memo.invalidate(self._memo_spec(method))
+            return
+        for name in dir(type(self)):
+            spec = getattr(getattr(type(self), name), "memo_spec", None)
+            if spec is not None:
+                await self.memo.invalidate(spec)
+
+    def _memo_spec(self, method: str) -> MemoSpec:
+        spec: Optional[MemoSpec] = getattr(getattr(type(self), method, None), "memo_spec", None)
+        if spec is None:
+            raise ValueError(f"{self.config.name}.{method} is not memoized")
+        return spec
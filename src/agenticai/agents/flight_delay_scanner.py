@@ -1,11 +1,42 @@
+import asyncio
+from collections.abc import Sequence
 from typing import Any, Dict
 
+from ..core.memo import memoize
+from ..core.singleflight import SingleFlight
+from ..core.tracing import traced
 from .base import AgentConfig, BaseAgent
 
 
 class FlightDelayScannerAgent(BaseAgent):
     """Agent responsible for scanning and analyzing potential flight delays."""
 
+    INTENT_KEYWORDS = (
+        "delay",
+        "status",
+        "on time",
+        "running late",
+        "cancel",
+        "cancelled",
+        "cancellation",
+        "estimated arrival",
+        "eta",
+    )
+
+    DELAY_STATUSES = ("ON TIME", "SLIGHT DELAY", "DELAYED", "SIGNIFICANTLY DELAYED", "CANCELLED")
+    DELAY_REASONS = (
+        "No delays expected",
+        "Minor air traffic congestion",
+        "Weather conditions at destination",
+        "Technical maintenance required",
+        "Crew availability issues",
+        "Airport capacity constraints",
+        "Air traffic control restrictions",
+        "Previous flight delay impact",
+        "Incoming aircraft delayed",
+        "Operational constraints",
+    )
+
     def __init__(self):
         config = AgentConfig(
             name="FlightDelayScanner",
@@ -17,33 +48,62 @@ class FlightDelayScannerAgent(BaseAgent):
             verbose=True,
         )
         super().__init__(config)
+        self.singleflight = SingleFlight("flight_delay_scanner")
 
+    @staticmethod
+    def analysis_args(flight_number: str, origin: str, destination: str, departure: str) -> dict[str, str]:
+        """`analyze_delay` arguments for a flight.
+
+        Every caller builds the route and date the same way ("JFK to LAX"
+        and the departure day), so they share cache and single-flight entries.
+        """
+        return {
+            "flight_number": flight_number.upper(),
+            "route": f"{origin} to {destination}",
+            "date": str(departure)[:10],
+        }
+
+    @traced()
     async def analyze_delay(self, flight_number: str, route: str, date: str) -> Dict[str, Any]:
-        """Analyze delay probability for a specific flight."""
+        """Analyze delay probability for a specific flight.
+
+        Concurrent requests for the same flight, route and date share one analysis.
+        """
+        return await self._shared_analysis(flight_number, route, date)
+
+    @traced()
+    async def analyze_batch(self, flights: Sequence[dict[str, str]]) -> list[dict[str, Any]]:
+        """Analyze delay probability for many flights at once.
+
+        Each flight is a dict with `flight_number`, `route` and `date`.
+        Results come back in input order; duplicate flights are analyzed
+        once and share a result. Flights go through the same cache and
+        single-flight layers as `analyze_delay`, without a span each.
+        """
+        keys = [(f["flight_number"], f["route"], f["date"]) for f in flights]
+        unique = list(dict.fromkeys(keys))
+        results = dict(zip(unique, await asyncio.gather(*(self._shared_analysis(*key) for key in unique))))
+        return [results[key] for key in keys]
+
+    async def _shared_analysis(self, flight_number: str, route: str, date: str) -> dict[str, Any]:
+        key = (flight_number.upper(), route, date)
+        return await self.singleflight.do(key, lambda: self._analyze_delay(flight_number, route, date))
+
+    @memoize(key=("flight_number", "route", "date"), disk=True)
+    async def _analyze_delay(self, flight_number: str, route: str, date: str) -> dict[str, Any]:
+        """Run the delay analysis for a single flight."""
         # Instead of calling LLM, return mocked delay data
         # Create deterministic but varied responses based on flight number
-        last_digit = int(flight_number[-1]) if flight_number[-1].isdigit() else 0
-        
-        delay_statuses = ["ON TIME", "SLIGHT DELAY", "DELAYED", "SIGNIFICANTLY DELAYED", "CANCELLED"]
-        delay_reasons = [
-            "No delays expected",
-            "Minor air traffic congestion",
-            "Weather conditions at destination",
-            "Technical maintenance required",
-            "Crew availability issues",
-            "Airport capacity constraints",
-            "Air traffic control restrictions",
-            "Previous flight delay impact",
-            "Incoming aircraft delayed",
-            "Operational constraints"
-        ]
-        
+        last_digit = int(flight_number[-1]) if flight_number[-1:].isdigit() else 0
+        delay_statuses = self.DELAY_STATUSES
+        delay_reasons = self.DELAY_REASONS
+
         # Use the flight number to determine status (for demo purposes)
         status_index = last_digit % len(delay_statuses)
         reason_index = (last_digit * 2) % len(delay_reasons)
-        
+
         delay_mins = last_digit * 15 if status_index > 0 else 0
-        
+
         return {
             "flight_number": flight_number,
             "route": route,
@@ -52,5 +112,5 @@ class FlightDelayScannerAgent(BaseAgent):
             "delay_reason": delay_reasons[reason_index],
             "predicted_delay_minutes": delay_mins,
             "confidence": "90%",
-            "recommendation": "Monitor flight status" if delay_mins < 30 else "Consider alternative arrangements"
+            "recommendation": "Monitor flight status" if delay_mins < 30 else "Consider alternative arrangements",
         }
@@ -1,5 +1,6 @@
 from typing import Any, Dict, Optional
 
+from ..core.tracing import traced
 from .base import AgentConfig, BaseAgent
 
 
@@ -19,6 +20,7 @@ class ReservationAdjusterAgent(BaseAgent):
         )
         super().__init__(config)
 
+    @traced()
     async def adjust_reservations(
         self, booking_data: Dict[str, Any], delay_info: Dict[str, Any], new_arrival_time: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -1,5 +1,6 @@
 from typing import Any, Dict, List
 
+from ..core.tracing import traced
 from .base import AgentConfig, BaseAgent
 
 
@@ -16,9 +17,11 @@ class StakeholderNotifierAgent(BaseAgent):
             and can prioritize notifications based on urgency and recipient needs.""",
             verbose=True,
             allow_delegation=False,
+            priority=1,
         )
         super().__init__(config)
 
+    @traced()
     async def notify_stakeholders(
         self,
         calendar_event: Dict[str, Any],
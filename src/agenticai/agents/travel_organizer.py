@@ -1,5 +1,6 @@
 from typing import Any, Dict, List
 
+from ..core.tracing import traced
 from .base import AgentConfig, BaseAgent
 
 
@@ -16,9 +17,11 @@ class TravelOrganizerAgent(BaseAgent):
             status tracking systems to ensure all travel information is easily accessible and up to date.""",
             verbose=True,
             allow_delegation=False,
+            priority=9,
         )
         super().__init__(config)
 
+    @traced()
     async def organize_travel_documents(
         self,
         booking_details: Dict[str, Any],
@@ -1,11 +1,29 @@
 from typing import Any, Dict
 
+from ..config.settings import settings
+from ..core.cache import TTLCache, time_bucket
+from ..core.tracing import traced
 from .base import AgentConfig, BaseAgent
 
 
 class WeatherCheckerAgent(BaseAgent):
     """Agent responsible for checking weather conditions at airports."""
 
+    INTENT_KEYWORDS = (
+        "weather",
+        "forecast",
+        "storm",
+        "snow",
+        "rain",
+        "wind",
+        "fog",
+        "foggy",
+        "thunder",
+        "thunderstorm",
+        "temperature",
+        "hurricane",
+    )
+
     def __init__(self):
         config = AgentConfig(
             name="WeatherChecker",
@@ -17,9 +35,29 @@ class WeatherCheckerAgent(BaseAgent):
             verbose=True,
         )
         super().__init__(config)
+        self.cache = TTLCache(
+            ttl=settings.WEATHER_CACHE_TTL, maxsize=settings.WEATHER_CACHE_MAXSIZE, name="weather_checker"
+        )
 
+    @traced()
     async def check_weather(self, airport_code: str, date_time: str) -> Dict[str, Any]:
         """Check weather conditions for a specific airport at a given time."""
+        # Conditions are cached per airport and time bucket; the report itself is cheap to rebuild
+        key = (airport_code.upper(), time_bucket(self.cache.ttl, date_time))
+        weather_data = await self.cache.get_or_set(key, lambda: self._fetch_conditions(airport_code))
+
+        return {
+            "airport": airport_code,
+            "timestamp": date_time,
+            "condition": weather_data["condition"],
+            "temperature": weather_data["temperature"],
+            "wind": weather_data["wind"],
+            "delay_risk": weather_data["risk"],
+            "summary": f"Weather at {airport_code} is {weather_data['condition']} with {weather_data['temperature']}. Wind: {weather_data['wind']}. Delay risk: {weather_data['risk']}.",
+        }
+
+    async def _fetch_conditions(self, airport_code: str) -> dict[str, str]:
+        """Look up the current conditions for an airport."""
         # Instead of calling LLM, return mocked weather data
         weather_map = {
             "JFK": {"condition": "Clear", "temperature": "72°F", "wind": "5mph NE", "risk": "Low"},
@@ -28,17 +66,8 @@ class WeatherCheckerAgent(BaseAgent):
             "DFW": {"condition": "Thunderstorms", "temperature": "75°F", "wind": "20mph S", "risk": "High"},
             "ATL": {"condition": "Rain", "temperature": "70°F", "wind": "15mph SE", "risk": "Moderate"},
         }
-        
+
         # Return default data for unknown airports
-        weather_data = weather_map.get(airport_code.upper(), 
-                                      {"condition": "Unknown", "temperature": "70°F", "wind": "10mph", "risk": "Unknown"})
-        
-        return {
-            "airport": airport_code,
-            "timestamp": date_time,
-            "condition": weather_data["condition"],
-            "temperature": weather_data["temperature"],
-            "wind": weather_data["wind"],
-            "delay_risk": weather_data["risk"],
-            "summary": f"Weather at {airport_code} is {weather_data['condition']} with {weather_data['temperature']}. Wind: {weather_data['wind']}. Delay risk: {weather_data['risk']}."
-        }
+        return weather_map.get(
+            airport_code.upper(), {"condition": "Unknown", "temperature": "70°F", "wind": "10mph", "risk": "Unknown"}
+        )
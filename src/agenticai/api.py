@@ -1,30 +1,167 @@
 import asyncio
+import json
+import logging
+import re
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Optional
+from typing import Annotated, Any, Optional, TypeVar
 
-from fastapi import BackgroundTasks, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Import our multi-agent system components
-from .agents import (
-    AlternativeRouteSuggesterAgent,
-    FlightDelayScannerAgent,
-    ReservationAdjusterAgent,
-    StakeholderNotifierAgent,
-    TravelOrganizerAgent,
-    WeatherCheckerAgent,
+from .config.settings import settings
+from .core import (
+    EventBus,
+    FlightDelayCrew,
+    FlightMonitor,
+    IntentRouter,
+    Monitoring,
+    MonitorScheduler,
+    Subscription,
+    cache_policy,
+    get_tracer,
 )
-from .core import FlightDelayCrew, Monitoring
-from .resources import FileSystem, Memory
+from .core.tracing import SERVER, Span
+from .registry import AgentRegistry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Build the agent registry once at startup and shut it down on exit."""
+    registry = AgentRegistry()
+    await registry.startup()
+    app.state.registry = registry
+    try:
+        yield
+    finally:
+        await registry.shutdown()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Flight Delay Response System API",
     description="API for the multi-agent flight delay response system",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+
+class AgentCachePolicyMiddleware:
+    """Apply a request's Cache-Control header to memoized agent calls.
+
+    `no-cache` recomputes and refreshes cached agent results, `no-store`
+    bypasses the caches entirely.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        mode: Optional[str] = None
+        if scope["type"] == "http":
+            header = dict(scope["headers"]).get(b"cache-control", b"").lower()
+            if b"no-store" in header:
+                mode = "bypass"
+            elif b"no-cache" in header:
+                mode = "refresh"
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        with cache_policy(mode):
+            await self.app(scope, receive, send)
+
+
+app.add_middleware(AgentCachePolicyMiddleware)
+
+
+class RequestMetricsMiddleware:
+    """Record each HTTP request's status and latency under its route template.
+
+    Unmatched paths share one `unmatched` route so that scanners and typos
+    cannot create unbounded metric series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            registry = getattr(scope["app"].state, "registry", None)
+            monitoring = registry.resources.get("monitoring") if registry is not None else None
+            if monitoring is not None:
+                route = getattr(scope.get("route"), "path", "unmatched")
+                monitoring.record_request(scope["method"], route, status, time.perf_counter() - started)
+
+
+app.add_middleware(RequestMetricsMiddleware)
+
+
+class RequestTracingMiddleware:
+    """Open a server span for each HTTP request that the agent, crew and API spans nest under.
+
+    A W3C `traceparent` request header continues the caller's trace.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tracer = get_tracer()
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = dict(scope["headers"]).get(b"traceparent", b"").decode("latin-1") or None
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with tracer.span(f"{scope['method']} {scope['path']}", SERVER, traceparent=traceparent) as span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                if span is not None:
+                    route = getattr(scope.get("route"), "path", None)
+                    if route is not None:
+                        span.name = f"{scope['method']} {route}"
+                    span.set_attribute("http.method", scope["method"])
+                    span.set_attribute("http.target", scope["path"])
+                    span.set_attribute("http.status_code", status)
+                    if status >= 500:
+                        span.error = span.error or f"HTTP {status}"
+
+
+app.add_middleware(RequestTracingMiddleware)
+
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
     CORSMiddleware,
@@ -75,90 +212,131 @@ class NotificationData(BaseModel):
     delay_reason: Optional[str] = None
 
 
-# Dependency to get resources
-async def get_resources():
-    # Initialize shared resources
-    memory = Memory()
-    file_system = FileSystem()
-    monitoring = Monitoring()
+# Dependency to get the process-wide registry
+def get_registry(request: Request) -> AgentRegistry:
+    registry: AgentRegistry = request.app.state.registry
+    return registry
 
-    return {"memory": memory, "file_system": file_system, "monitoring": monitoring}
+
+# Dependency to get resources
+def get_resources(registry: Annotated[AgentRegistry, Depends(get_registry)]) -> dict[str, Any]:
+    return registry.resources
 
 
 # Dependency to get agents
-async def get_agents():
-    # Initialize agents
-    weather_checker = WeatherCheckerAgent()
-    flight_delay_scanner = FlightDelayScannerAgent()
-    reservation_adjuster = ReservationAdjusterAgent()
-    stakeholder_notifier = StakeholderNotifierAgent()
-    alternative_route_suggester = AlternativeRouteSuggesterAgent()
-    travel_organizer = TravelOrganizerAgent()
+def get_agents(registry: Annotated[AgentRegistry, Depends(get_registry)]) -> dict[str, Any]:
+    return registry.agents
 
-    return {
-        "weather_checker": weather_checker,
-        "flight_delay_scanner": flight_delay_scanner,
-        "reservation_adjuster": reservation_adjuster,
-        "stakeholder_notifier": stakeholder_notifier,
-        "alternative_route_suggester": alternative_route_suggester,
-        "travel_organizer": travel_organizer,
-    }
+
+def _started(component: Optional[T]) -> T:
+    # The registry builds these on startup and drops them on shutdown
+    if component is None:
+        raise HTTPException(status_code=503, detail="Service is not running")
+    return component
 
 
 # Dependency to get crew
-async def get_crew():
-    # Create crew with all agents
-    agents = await get_agents()
-    agents_list = list(agents.values())
-    crew = FlightDelayCrew(agents_list)
-    return crew
+def get_crew(registry: Annotated[AgentRegistry, Depends(get_registry)]) -> FlightDelayCrew:
+    return _started(registry.crew)
+
+
+# Dependency to get the flight monitor scheduler
+def get_scheduler(registry: Annotated[AgentRegistry, Depends(get_registry)]) -> MonitorScheduler:
+    return _started(registry.scheduler)
+
+
+# Dependency to get the chat intent router
+def get_router(registry: Annotated[AgentRegistry, Depends(get_registry)]) -> IntentRouter:
+    return _started(registry.router)
 
 
-# Global registry to store running tasks
-background_tasks = {}
+Agents = Annotated[dict[str, Any], Depends(get_agents)]
+Resources = Annotated[dict[str, Any], Depends(get_resources)]
+Crew = Annotated[FlightDelayCrew, Depends(get_crew)]
+Scheduler = Annotated[MonitorScheduler, Depends(get_scheduler)]
+Router = Annotated[IntentRouter, Depends(get_router)]
 
 
 # API Routes
 @app.get("/")
-async def root():
+async def root(registry: Annotated[AgentRegistry, Depends(get_registry)]):
     """Root endpoint with API information"""
-    return {"status": "online", "api": "Flight Delay Response System", "version": "0.1.0"}
+    return {
+        "status": "online",
+        "api": "Flight Delay Response System",
+        "version": "0.1.0",
+        "warmup_seconds": registry.warmup_seconds,
+    }
 
 
 @app.post("/api/flight/status", response_model=dict[str, Any])
-async def check_flight_status(flight_info: FlightInfo):
+async def check_flight_status(flight_info: FlightInfo, agents: Agents, resources: Resources):
     """Check flight status and delay probability"""
-    agents = await get_agents()
-    resources = await get_resources()
 
+    started = time.perf_counter()
     try:
         # Get the flight delay scanner agent
         flight_delay_scanner = agents["flight_delay_scanner"]
 
         # Analyze flight delay
         result = await flight_delay_scanner.analyze_delay(
-            flight_number=flight_info.flight_number,
-            route=f"{flight_info.origin} to {flight_info.destination}",
-            date=flight_info.scheduled_departure,
+            **flight_delay_scanner.analysis_args(
+                flight_info.flight_number, flight_info.origin, flight_info.destination, flight_info.scheduled_departure
+            )
         )
 
         # Log the operation
         resources["monitoring"].log_agent_execution(
-            agent_name="FlightDelayScanner", task="analyze_delay", result=result
+            agent_name="FlightDelayScanner", task="analyze_delay", result=result, duration=time.perf_counter() - started
         )
     except Exception as e:
-        resources["monitoring"].log_error(agent_name="FlightDelayScanner", task="analyze_delay", error=e)
+        resources["monitoring"].log_error(
+            agent_name="FlightDelayScanner", task="analyze_delay", error=e, duration=time.perf_counter() - started
+        )
         raise HTTPException(status_code=500, detail=str(e)) from e
     else:
         return result
 
 
+@app.post("/api/flight/status:batch")
+async def check_flight_status_batch(
+    flights: list[FlightInfo], agents: Agents, resources: Resources
+) -> StreamingResponse:
+    """Check status and delay probability for many flights, streamed as NDJSON (one result per line)"""
+    if len(flights) > settings.FLIGHT_STATUS_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {settings.FLIGHT_STATUS_BATCH_MAX} flights per batch")
+
+    flight_delay_scanner = agents["flight_delay_scanner"]
+    requests = [
+        flight_delay_scanner.analysis_args(
+            flight.flight_number, flight.origin, flight.destination, flight.scheduled_departure
+        )
+        for flight in flights
+    ]
+
+    async def stream_results() -> AsyncIterator[str]:
+        # Analyze and send in chunks so the first results go out before the whole board is done
+        chunk_size = settings.FLIGHT_STATUS_BATCH_CHUNK
+        try:
+            for start in range(0, len(requests), chunk_size):
+                results = await flight_delay_scanner.analyze_batch(requests[start : start + chunk_size])
+                yield "".join(json.dumps(result) + "\n" for result in results)
+        except Exception as e:
+            resources["monitoring"].log_error(agent_name="FlightDelayScanner", task="analyze_batch", error=e)
+            yield json.dumps({"error": str(e)}) + "\n"
+        else:
+            resources["monitoring"].log_agent_execution(
+                agent_name="FlightDelayScanner", task="analyze_batch", result={"flights": len(requests)}
+            )
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @app.get("/api/weather/{airport_code}", response_model=dict[str, Any])
-async def get_weather(airport_code: str):
+async def get_weather(airport_code: str, agents: Agents, resources: Resources):
     """Get weather information for a specific airport"""
-    agents = await get_agents()
-    resources = await get_resources()
 
+    started = time.perf_counter()
     try:
         # Get the weather checker agent
         weather_checker = agents["weather_checker"]
@@ -170,20 +348,23 @@ async def get_weather(airport_code: str):
         result = await weather_checker.check_weather(airport_code=airport_code, date_time=now)
 
         # Log the operation
-        resources["monitoring"].log_agent_execution(agent_name="WeatherChecker", task="check_weather", result=result)
+        resources["monitoring"].log_agent_execution(
+            agent_name="WeatherChecker", task="check_weather", result=result, duration=time.perf_counter() - started
+        )
     except Exception as e:
-        resources["monitoring"].log_error(agent_name="WeatherChecker", task="check_weather", error=e)
+        resources["monitoring"].log_error(
+            agent_name="WeatherChecker", task="check_weather", error=e, duration=time.perf_counter() - started
+        )
         raise HTTPException(status_code=500, detail=str(e)) from e
     else:
         return result
 
 
 @app.post("/api/flight/alternatives", response_model=dict[str, Any])
-async def get_alternative_routes(flight_info: FlightInfo):
+async def get_alternative_routes(flight_info: FlightInfo, agents: Agents, resources: Resources):
     """Get alternative travel options for a flight"""
-    agents = await get_agents()
-    resources = await get_resources()
 
+    started = time.perf_counter()
     try:
         # Get the alternative route suggester agent
         alternative_route_suggester = agents["alternative_route_suggester"]
@@ -203,10 +384,18 @@ async def get_alternative_routes(flight_info: FlightInfo):
 
         # Log the operation
         resources["monitoring"].log_agent_execution(
-            agent_name="AlternativeRouteSuggester", task="suggest_alternatives", result=result
+            agent_name="AlternativeRouteSuggester",
+            task="suggest_alternatives",
+            result=result,
+            duration=time.perf_counter() - started,
         )
     except Exception as e:
-        resources["monitoring"].log_error(agent_name="AlternativeRouteSuggester", task="suggest_alternatives", error=e)
+        resources["monitoring"].log_error(
+            agent_name="AlternativeRouteSuggester",
+            task="suggest_alternatives",
+            error=e,
+            duration=time.perf_counter() - started,
+        )
         raise HTTPException(status_code=500, detail=str(e)) from e
     else:
         return result
@@ -216,11 +405,12 @@ async def get_alternative_routes(flight_info: FlightInfo):
 async def update_reservation(
     reservation_data: ReservationData,
     flight_info: FlightInfo,
+    agents: Agents,
+    resources: Resources,
 ):
     """Update hotel and car rental reservations based on flight changes"""
-    agents = await get_agents()
-    resources = await get_resources()
 
+    started = time.perf_counter()
     try:
         # Get the reservation adjuster agent
         reservation_adjuster = agents["reservation_adjuster"]
@@ -244,21 +434,28 @@ async def update_reservation(
 
         # Log the operation
         resources["monitoring"].log_agent_execution(
-            agent_name="ReservationAdjuster", task="adjust_reservations", result=result
+            agent_name="ReservationAdjuster",
+            task="adjust_reservations",
+            result=result,
+            duration=time.perf_counter() - started,
         )
     except Exception as e:
-        resources["monitoring"].log_error(agent_name="ReservationAdjuster", task="adjust_reservations", error=e)
+        resources["monitoring"].log_error(
+            agent_name="ReservationAdjuster",
+            task="adjust_reservations",
+            error=e,
+            duration=time.perf_counter() - started,
+        )
         raise HTTPException(status_code=500, detail=str(e)) from e
     else:
         return result
 
 
 @app.post("/api/notifications/send", response_model=dict[str, Any])
-async def send_notifications(notification_data: NotificationData):
+async def send_notifications(notification_data: NotificationData, agents: Agents, resources: Resources):
     """Send notifications to stakeholders about flight changes"""
-    agents = await get_agents()
-    resources = await get_resources()
 
+    started = time.perf_counter()
     try:
         # Get the stakeholder notifier agent
         stakeholder_notifier = agents["stakeholder_notifier"]
@@ -279,20 +476,26 @@ async def send_notifications(notification_data: NotificationData):
 
         # Log the operation
         resources["monitoring"].log_agent_execution(
-            agent_name="StakeholderNotifier", task="notify_stakeholders", result=result
+            agent_name="StakeholderNotifier",
+            task="notify_stakeholders",
+            result=result,
+            duration=time.perf_counter() - started,
         )
     except Exception as e:
-        resources["monitoring"].log_error(agent_name="StakeholderNotifier", task="notify_stakeholders", error=e)
+        resources["monitoring"].log_error(
+            agent_name="StakeholderNotifier",
+            task="notify_stakeholders",
+            error=e,
+            duration=time.perf_counter() - started,
+        )
         raise HTTPException(status_code=500, detail=str(e)) from e
     else:
         return result
 
 
 @app.post("/api/chat", response_model=ChatResponse)
-async def process_chat(request: ChatRequest):
+async def process_chat(request: ChatRequest, agents: Agents, resources: Resources, router: Router):
     """Process a chat message with the multi-agent system"""
-    agents = await get_agents()
-    resources = await get_resources()
 
     try:
         # Extract conversation history
@@ -306,173 +509,427 @@ async def process_chat(request: ChatRequest):
             # Handle the error case outside of this function to avoid linting issues
             return process_missing_user_message()
 
-        latest_user_message = user_messages[-1]
+        response = ""
+        events = chat_events(user_messages[-1].content, request.flight_data, agents, resources, router)
+        async for event, data in events:
+            if event == "done":
+                response = data["response"]
+
+        return ChatResponse(response=response)
+
+    except Exception as e:
+        resources["monitoring"].log_error(agent_name="ChatAPI", task="process_chat", error=e)
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
 
-        # Flight data might be needed to provide context to agents
-        flight_data = request.flight_data
+@app.post("/api/chat/stream")
+async def stream_chat(
+    request: ChatRequest, http_request: Request, agents: Agents, resources: Resources, router: Router
+):
+    """Process a chat message, streaming progress and the reply as Server-Sent Events
+
+    Events: `route` (which agent handles the query), `tool_call` and `tool_result`
+    (agent calls), `delta` (partial reply text), `done` (full reply) or `error`.
+    """
+    started = time.perf_counter()
+    user_messages = [msg for msg in request.messages if msg.role == "user"]
+    if not user_messages:
+        raise HTTPException(status_code=400, detail="No user message found")
+
+    events = chat_events(user_messages[-1].content, request.flight_data, agents, resources, router)
+    return StreamingResponse(
+        sse_stream(http_request, events, resources["monitoring"], started),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def chat_events(
+    message: str,
+    flight_data: FlightInfo,
+    agents: dict[str, Any],
+    resources: dict[str, Any],
+    router: IntentRouter,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """Answer a chat message, yielding (event, data) progress events as the work happens."""
+    # Create a more detailed context
+    context = {
+        "flight_number": flight_data.flight_number,
+        "origin": flight_data.origin,
+        "destination": flight_data.destination,
+        "scheduled_departure": flight_data.scheduled_departure,
+        "airline": flight_data.airline or "Unknown",
+    }
+
+    # Based on the message, determine which agent should handle it
+    query = message.lower()
+
+    # Store the conversation in memory for future reference
+    memory_key = f"{flight_data.flight_number}_{datetime.now().strftime('%Y%m%d')}"
+
+    # Log the interaction
+    resources["memory"].store(
+        agent_name="ChatSystem",
+        task="process_query",
+        result={"query": query, "context": context},
+        metadata={"timestamp": str(datetime.now().timestamp()), "memory_key": memory_key},
+    )
+
+    decision = router.route(query)
+    route = decision.intent
+    agent = agents[route]
+    yield "route", {"agent": route, "method": decision.method, "score": decision.score}
+
+    if route == "weather_checker":
+        airport = flight_data.origin if "origin" in query or "departure" in query else flight_data.destination
+        args: dict[str, Any] = {"airport_code": airport, "date_time": flight_data.scheduled_departure}
+        yield "tool_call", {"agent": route, "tool": "check_weather", "args": args}
+        response_data = await agent.check_weather(**args)
+        response = f"Weather for {airport}: {response_data.get('summary', 'Information not available')}"
+
+    elif route == "flight_delay_scanner":
+        args = agent.analysis_args(
+            flight_data.flight_number, flight_data.origin, flight_data.destination, flight_data.scheduled_departure
+        )
+        yield "tool_call", {"agent": route, "tool": "analyze_delay", "args": args}
+        response_data = await agent.analyze_delay(**args)
+        delay_status = response_data.get("delay_status", "unknown")
+        delay_reason = response_data.get("delay_reason", "No specific reason provided")
+        response = f"Flight {flight_data.flight_number} status: {delay_status}. {delay_reason}"
 
-        # Create a more detailed context
-        context = {
+    elif route == "alternative_route_suggester":
+        current_flight = {
             "flight_number": flight_data.flight_number,
             "origin": flight_data.origin,
-            "destination": flight_data.destination,
             "scheduled_departure": flight_data.scheduled_departure,
-            "airline": flight_data.airline or "Unknown"
+            "current_status": "DELAYED",  # Assuming if they're asking for alternatives
         }
+        args = {"current_flight": current_flight, "destination": flight_data.destination}
+        yield "tool_call", {"agent": route, "tool": "suggest_alternatives", "args": args}
+        response_data = await agent.suggest_alternatives(**args)
+
+        alternatives = response_data.get("alternatives", [])
+        if alternatives:
+            response = "Here are some alternative routes:\n"
+            for idx, alt in enumerate(alternatives[:3], 1):
+                response += f"{idx}. {alt.get('flight', 'Flight')} - {alt.get('departure_time', 'N/A')}\n"
+        else:
+            response = "I couldn't find any alternative routes at this time."
 
-        # Based on the message, determine which agent should handle it
-        query = latest_user_message.content.lower()
-
-        # Store the conversation in memory for future reference
-        memory_key = f"{flight_data.flight_number}_{datetime.now().strftime('%Y%m%d')}"
-
-        # Log the interaction
-        resources["memory"].store(
-            agent_name="ChatSystem",
-            task="process_query",
-            result={"query": query, "context": context},
-            metadata={"timestamp": str(datetime.now().timestamp()), "memory_key": memory_key}
+    else:
+        args = {"task_description": f"Give travel advice for this request: {query}", "context": context}
+        yield "tool_call", {"agent": route, "tool": "execute", "args": args}
+        response_data = await agent.execute(**args)
+        response = response_data.get("advice") or response_data.get(
+            "result", "I'm not sure how to help with that specific query."
         )
 
-        # Use the appropriate agent based on the query
-        # This is a simple keyword-based routing
-        if "weather" in query:
-            agent = agents["weather_checker"]
-            airport = flight_data.origin if "origin" in query or "departure" in query else flight_data.destination
-            response_data = await agent.check_weather(airport_code=airport, date_time=flight_data.scheduled_departure)
-            response = f"Weather for {airport}: {response_data.get('summary', 'Information not available')}"
-
-        elif "delay" in query or "status" in query:
-            agent = agents["flight_delay_scanner"]
-            response_data = await agent.analyze_delay(
-                flight_number=flight_data.flight_number,
-                route=f"{flight_data.origin} to {flight_data.destination}",
-                date=flight_data.scheduled_departure
-            )
-            delay_status = response_data.get("delay_status", "unknown")
-            delay_reason = response_data.get("delay_reason", "No specific reason provided")
-            response = f"Flight {flight_data.flight_number} status: {delay_status}. {delay_reason}"
-
-        elif "alternative" in query or "other flight" in query:
-            agent = agents["alternative_route_suggester"]
-            current_flight = {
-                "flight_number": flight_data.flight_number,
-                "origin": flight_data.origin,
-                "scheduled_departure": flight_data.scheduled_departure,
-                "current_status": "DELAYED",  # Assuming if they're asking for alternatives
-            }
-            response_data = await agent.suggest_alternatives(
-                current_flight=current_flight,
-                destination=flight_data.destination
-            )
+    yield "tool_result", {"agent": route, "result": response_data}
 
-            alternatives = response_data.get("alternatives", [])
-            if alternatives:
-                response = "Here are some alternative routes:\n"
-                for idx, alt in enumerate(alternatives[:3], 1):
-                    response += f"{idx}. {alt.get('flight', 'Flight')} - {alt.get('departure_time', 'N/A')}\n"
-            else:
-                response = "I couldn't find any alternative routes at this time."
+    # Send the reply line by line / sentence by sentence as it becomes available
+    for chunk in re.findall(r"[^\n.]+[.\n]*|[.\n]+", response):
+        yield "delta", {"text": chunk}
+    yield "done", {"response": response}
 
-        else:
-            # For queries we don't specifically categorize, send to the travel organizer
-            # for general travel advice
-            agent = agents["travel_organizer"]
-            response_data = await agent.organize_travel(
-                flight_info=context,
-                special_requests=query
-            )
-            response = response_data.get("advice", "I'm not sure how to help with that specific query.")
 
-        return ChatResponse(response=response)
+async def sse_stream(
+    http_request: Request,
+    events: AsyncIterator[tuple[str, dict[str, Any]]],
+    monitoring: Monitoring,
+    started: float,
+) -> AsyncIterator[str]:
+    """Format events as SSE; a client disconnect cancels the work producing them."""
+    queue: asyncio.Queue = asyncio.Queue()
 
-    except Exception as e:
-        resources["monitoring"].log_error(agent_name="ChatAPI", task="process_chat", error=e)
-        raise HTTPException(status_code=500, detail=str(e)) from e
+    async def produce() -> None:
+        try:
+            async for item in events:
+                await queue.put(item)
+        except Exception as e:
+            monitoring.log_error(agent_name="ChatAPI", task="stream_chat", error=e)
+            await queue.put(("error", {"detail": str(e)}))
+        finally:
+            await queue.put(None)
+
+    async def watch_disconnect() -> None:
+        while (await http_request.receive())["type"] != "http.disconnect":
+            pass
+        logger.info("Chat stream client disconnected; cancelling agent work")
+        producer.cancel()
+
+    producer = asyncio.ensure_future(produce())
+    watcher = asyncio.ensure_future(watch_disconnect())
+    first = True
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            if first:
+                # Measured from when the validated request reached the handler
+                monitoring.record_timing("chat_stream_ttfb", time.perf_counter() - started)
+                first = False
+            event, data = item
+            yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    finally:
+        producer.cancel()
+        watcher.cancel()
+        monitoring.record_timing("chat_stream_total", time.perf_counter() - started)
 
 
 @app.post("/api/flight/monitor")
-async def monitor_flight(flight_info: FlightInfo, background_tasks: BackgroundTasks):
+async def monitor_flight(flight_info: FlightInfo, scheduler: Scheduler) -> dict[str, Any]:
     """Start monitoring a flight in the background"""
-    crew = await get_crew()
-    resources = await get_resources()
 
     # Create a unique trip ID
     trip_id = f"{flight_info.flight_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
-    async def monitor_task(flight_data, trip_id):
-        """Background task to monitor a flight"""
-        try:
-            # Convert flight info to dictionary for the crew
-            flight_dict = {
-                "flight_number": flight_data.flight_number,
-                "origin": flight_data.origin,
-                "destination": flight_data.destination,
-                "scheduled_departure": flight_data.scheduled_departure,
-                "airline": flight_data.airline,
-            }
-
-            # Begin monitoring - this is a simplified version
-            # In a real system, this would periodically check flight status
-            # and take actions when delays are detected
-
-            # Initial status check
-            status_data = await crew.handle_flight_delay(flight_dict)
-
-            # Store the initial check result
-            resources["file_system"].add_status_update(
-                trip_id=trip_id,
-                status={
-                    "timestamp": datetime.now().isoformat(),
-                    "status": "MONITORING",
-                    "data": status_data,
-                }
-            )
-
-            # In a real system, we would set up a periodic check here
-            # For this example, we'll just do one check
-            await asyncio.sleep(5)  # Simulate some processing time
-
-            # Final status update
-            resources["file_system"].add_status_update(
-                trip_id=trip_id,
-                status={
-                    "timestamp": datetime.now().isoformat(),
-                    "status": "COMPLETED",
-                    "message": "Flight monitoring completed",
-                }
-            )
-
-        except Exception as e:
-            # Log any errors
-            resources["monitoring"].log_error(
-                agent_name="FlightMonitor",
-                task="monitor_flight",
-                error=e,
-                metadata={"trip_id": trip_id}
-            )
-
-            # Update status with error
-            resources["file_system"].add_status_update(
-                trip_id=trip_id,
-                status={
-                    "timestamp": datetime.now().isoformat(),
-                    "status": "ERROR",
-                    "message": str(e),
-                }
-            )
+    # Convert flight info to dictionary for the crew
+    flight_dict = {
+        "flight_number": flight_info.flight_number,
+        "origin": flight_info.origin,
+        "destination": flight_info.destination,
+        "scheduled_departure": flight_info.scheduled_departure,
+        "airline": flight_info.airline,
+    }
 
-    # Add the monitoring task to background tasks
-    background_tasks.add_task(monitor_task, flight_info, trip_id)
+    # The scheduler checks the flight periodically and appends each result to the trip status log
+    scheduler.add(trip_id, flight_dict)
 
     # Return the trip ID for client to use for status checks
     return {
         "status": "monitoring_started",
         "trip_id": trip_id,
-        "message": "Flight monitoring has been started in the background"
+        "message": "Flight monitoring has been started in the background",
+    }
+
+
+@app.get("/api/monitors")
+async def list_monitors(scheduler: Scheduler) -> dict[str, Any]:
+    """List active and paused flight monitors"""
+    return {
+        "monitors": [monitor.to_dict() for monitor in scheduler.list_monitors()],
+        "stats": scheduler.stats(),
     }
 
 
+@app.get("/api/monitors/{trip_id}")
+async def get_monitor(trip_id: str, scheduler: Scheduler) -> dict[str, Any]:
+    """Get the state of a flight monitor"""
+    return _monitor_or_404(scheduler.get(trip_id), trip_id)
+
+
+@app.post("/api/monitors/{trip_id}/pause")
+async def pause_monitor(trip_id: str, scheduler: Scheduler) -> dict[str, Any]:
+    """Pause a flight monitor"""
+    return _monitor_or_404(scheduler.pause(trip_id), trip_id)
+
+
+@app.post("/api/monitors/{trip_id}/resume")
+async def resume_monitor(trip_id: str, scheduler: Scheduler) -> dict[str, Any]:
+    """Resume a paused flight monitor"""
+    return _monitor_or_404(scheduler.resume(trip_id), trip_id)
+
+
+@app.delete("/api/monitors/{trip_id}")
+async def cancel_monitor(trip_id: str, scheduler: Scheduler) -> dict[str, Any]:
+    """Stop monitoring a flight"""
+    return _monitor_or_404(scheduler.cancel(trip_id), trip_id)
+
+
+@app.get("/api/agents/cache")
+async def agent_cache_stats(agents: Agents) -> dict[str, Any]:
+    """Hit-rate metrics for each agent's memoized methods"""
+    return {name: agent.cache_stats() for name, agent in agents.items()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics(resources: Resources) -> PlainTextResponse:
+    """Metrics in the Prometheus text format"""
+    return PlainTextResponse(
+        resources["monitoring"].metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/debug/traces")
+async def debug_traces(
+    limit: int = 10, route: str = "", output: Annotated[str, Query(alias="format")] = "summary"
+) -> dict[str, Any]:
+    """The slowest recent traces as span trees, or as OTLP/JSON with `format=otlp`
+
+    `route` keeps only traces whose root span name starts with it (e.g. `POST /api/chat`).
+    """
+    tracer = get_tracer()
+    traces = tracer.slowest(limit=min(max(limit, 1), 100), name_prefix=route)
+    if output == "otlp":
+        return tracer.to_otlp([span for spans in traces for span in spans])
+    return {"stats": tracer.stats(), "traces": [_trace_summary(spans) for spans in traces]}
+
+
+def _trace_summary(spans: list[Span]) -> dict[str, Any]:
+    """A trace as nested spans with offsets from the root span's start, in milliseconds."""
+    root = next(span for span in spans if span.root)
+    children: dict[Optional[str], list[Span]] = {}
+    for span in spans:
+        if span is not root:
+            children.setdefault(span.parent_id, []).append(span)
+
+    def node(span: Span) -> dict[str, Any]:
+        return {
+            "name": span.name,
+            "span_id": span.span_id,
+            "offset_ms": round((span.start_ns - root.start_ns) / 1e6, 3),
+            "duration_ms": round(span.duration_ms, 3),
+            "attributes": span.attributes,
+            "error": span.error,
+            "children": [node(child) for child in children.get(span.span_id, [])],
+        }
+
+    return {"trace_id": root.trace_id, "duration_ms": round(root.duration_ms, 3), "root": node(root)}
+
+
+@app.delete("/api/agents/{agent_name}/cache")
+async def clear_agent_cache(agent_name: str, agents: Agents, method: Optional[str] = None) -> dict[str, Any]:
+    """Drop an agent's cached results, for one method or all of them"""
+    agent = agents.get(agent_name)
+    if agent is None:
+        raise HTTPException(status_code=404, detail=f"Unknown agent {agent_name}")
+    try:
+        await agent.clear_cache(method)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    stats: dict[str, Any] = agent.cache_stats()
+    return stats
+
+
+def _monitor_or_404(monitor: Optional[FlightMonitor], trip_id: str) -> dict[str, Any]:
+    if monitor is None:
+        raise HTTPException(status_code=404, detail=f"No monitor for trip {trip_id}")
+    return monitor.to_dict()
+
+
+@app.websocket("/ws/trips/{trip_id}")
+async def trip_updates_ws(websocket: WebSocket, trip_id: str, history: int = 0) -> None:
+    """Push a trip's status updates and monitor changes over a WebSocket
+
+    With `history`, the last `history` status updates are sent first. A client
+    that falls too far behind is disconnected with code 1013 (try again later).
+    """
+    registry: AgentRegistry = websocket.app.state.registry
+    bus: EventBus = registry.resources["event_bus"]
+
+    # Subscribe before reading history so nothing published in between is missed
+    subscription = bus.subscribe(trip_id)
+    try:
+        await websocket.accept()
+        past = await _trip_history(registry.resources, trip_id, history)
+        for update in past:
+            await websocket.send_json({"type": "status", "trip_id": trip_id, "data": update})
+
+        replayed = _replay_keys(past)
+        reader = asyncio.ensure_future(_close_on_disconnect(websocket, subscription))
+        try:
+            while True:
+                event = await subscription.get()
+                if event is None:
+                    break
+                if not _already_sent(event, replayed):
+                    await websocket.send_json(event)
+        finally:
+            reader.cancel()
+
+        if subscription.close_reason == "slow_consumer":
+            await websocket.close(code=1013, reason="Too slow; reconnect to resume")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+
+
+@app.get("/api/trips/{trip_id}/events")
+async def trip_updates_sse(
+    trip_id: str, http_request: Request, resources: Resources, history: int = 0
+) -> StreamingResponse:
+    """Server-Sent Events fallback for the trip updates WebSocket"""
+    bus: EventBus = resources["event_bus"]
+    # Subscribe before reading history so nothing published in between is missed
+    subscription = bus.subscribe(trip_id)
+    try:
+        past = await _trip_history(resources, trip_id, history)
+    except BaseException:
+        subscription.close()
+        raise
+    replayed = _replay_keys(past)
+
+    async def watch_disconnect() -> None:
+        while (await http_request.receive())["type"] != "http.disconnect":
+            pass
+        subscription.close("disconnected")
+
+    async def stream_events() -> AsyncIterator[str]:
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            for update in past:
+                yield f"event: status\ndata: {json.dumps({'type': 'status', 'trip_id': trip_id, 'data': update})}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"  # stops proxies from closing an idle stream
+                    continue
+                if event is None:
+                    break
+                if not _already_sent(event, replayed):
+                    yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            watcher.cancel()
+            subscription.close()
+
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _trip_history(resources: dict[str, Any], trip_id: str, n: int) -> list[dict[str, Any]]:
+    if n <= 0:
+        return []
+    updates: list[dict[str, Any]] = await resources["file_system"].tail_status_updates(trip_id, n)
+    return updates
+
+
+def _replay_keys(history: list[dict[str, Any]]) -> set[str]:
+    return {json.dumps(update, sort_keys=True, default=str) for update in history}
+
+
+def _already_sent(event: dict[str, Any], replayed: set[str]) -> bool:
+    """Whether a bus event repeats a status update that was sent from the history.
+
+    An update written between subscribing and reading the history arrives
+    both ways; it is matched on its content, timestamp included, and
+    skipped once.
+    """
+    if not replayed or event.get("type") != "status":
+        return False
+    key = json.dumps(event.get("data"), sort_keys=True, default=str)
+    if key not in replayed:
+        return False
+    replayed.discard(key)
+    return True
+
+
+async def _close_on_disconnect(websocket: WebSocket, subscription: Subscription) -> None:
+    """Read (and ignore) client messages until the client goes away, then end the subscription."""
+    try:
+        while True:
+            await websocket.receive_text()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        subscription.close("disconnected")
+
+
 async def process_missing_user_message():
     """Handle the case where no user message is found."""
     error_msg = "No user message found"
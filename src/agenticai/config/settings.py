@@ -14,37 +14,149 @@ class Settings(BaseSettings):
     # Environment
     ENV: str = os.getenv("ENVIRONMENT", "development")
 
+    # API server launcher (python -m agenticai.run_api); outside development it must be reachable from outside
+    SERVER_HOST: str = os.getenv(
+        "SERVER_HOST",
+        "127.0.0.1" if os.getenv("ENVIRONMENT", "development") == "development" else "0.0.0.0",  # noqa: S104
+    )
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8000"))
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "0"))  # 0 means one per available CPU core
+    SERVER_LOOP: str = os.getenv("SERVER_LOOP", "auto")  # "auto" picks uvloop when it is installed
+    SERVER_HTTP: str = os.getenv("SERVER_HTTP", "auto")  # "auto" picks httptools when it is installed
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "2048"))
+    SERVER_KEEPALIVE: int = int(os.getenv("SERVER_KEEPALIVE", "5"))  # idle keep-alive connections, seconds
+    SERVER_GRACEFUL_TIMEOUT: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))  # to drain on stop or restart
+    SERVER_PRELOAD: bool = os.getenv("SERVER_PRELOAD", "true").lower() == "true"  # import the app before forking
+
     # CORS
     CORS_ORIGINS: list[str] = ["*"]
 
     # File Storage
     STORAGE_PATH: str = os.getenv("STORAGE_PATH", str(Path.home() / ".flight_delay_system"))
+    STATUS_LOG_FSYNC: str = os.getenv("STATUS_LOG_FSYNC", "interval")  # "always", "interval" or "never"
+    STATUS_LOG_FSYNC_INTERVAL: float = float(os.getenv("STATUS_LOG_FSYNC_INTERVAL", "1"))
+    STATUS_LOG_COMPACT_LINES: int = int(os.getenv("STATUS_LOG_COMPACT_LINES", "10000"))  # appends between compactions
+    STATUS_LOG_KEEP_LAST: int = int(os.getenv("STATUS_LOG_KEEP_LAST", "1000"))  # the rest go to the archive log
+    STATUS_LOG_IDLE_SECONDS: float = float(os.getenv("STATUS_LOG_IDLE_SECONDS", "300"))  # then per-trip state is freed
+    FILE_IO_MAX_WORKERS: int = int(os.getenv("FILE_IO_MAX_WORKERS", "4"))
+    FILE_IO_BATCH_WINDOW: float = float(os.getenv("FILE_IO_BATCH_WINDOW", "0"))
 
     # Credentials (these would come from env variables in production)
     WEATHER_API_KEY: Optional[str] = os.getenv("WEATHER_API_KEY", "demo_key")
     FLIGHT_API_KEY: Optional[str] = os.getenv("FLIGHT_API_KEY", "demo_key")
     NOTIFICATION_API_KEY: Optional[str] = os.getenv("NOTIFICATION_API_KEY", "demo_key")
+    OPENWEATHER_API_KEY: Optional[str] = os.getenv("OPENWEATHER_API_KEY")
+    FLIGHTAWARE_API_KEY: Optional[str] = os.getenv("FLIGHTAWARE_API_KEY")
+    TWILIO_ACCOUNT_SID: Optional[str] = os.getenv("TWILIO_ACCOUNT_SID")
+    TWILIO_AUTH_TOKEN: Optional[str] = os.getenv("TWILIO_AUTH_TOKEN")
+
+    # Outbound HTTP connection pool
+    HTTP_POOL_LIMIT: int = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+    HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+    HTTP_DNS_CACHE_TTL: int = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_TOTAL_TIMEOUT: float = float(os.getenv("HTTP_TOTAL_TIMEOUT", "15"))
+
+    # Upstream API resilience: per-attempt timeout, retries with jittered backoff, circuit breaker
+    UPSTREAM_TIMEOUT: float = float(os.getenv("UPSTREAM_TIMEOUT", "5"))
+    UPSTREAM_RETRIES: int = int(os.getenv("UPSTREAM_RETRIES", "2"))
+    UPSTREAM_BACKOFF_BASE: float = float(os.getenv("UPSTREAM_BACKOFF_BASE", "0.2"))
+    UPSTREAM_BACKOFF_MAX: float = float(os.getenv("UPSTREAM_BACKOFF_MAX", "2"))
+    UPSTREAM_RETRY_BUDGET: float = float(os.getenv("UPSTREAM_RETRY_BUDGET", "0.2"))  # retries per request
+    UPSTREAM_HEDGE_AFTER: float = float(os.getenv("UPSTREAM_HEDGE_AFTER", "0"))  # 0 disables hedged requests
+    UPSTREAM_STALE_TTL: float = float(os.getenv("UPSTREAM_STALE_TTL", "86400"))  # last good responses
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_TIMEOUT: float = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
 
     # Database
     DB_CONNECTION_STRING: Optional[str] = os.getenv("DB_CONNECTION_STRING", "")
 
+    # Weather response caching (seconds)
+    WEATHER_CACHE_TTL: float = float(os.getenv("WEATHER_CACHE_TTL", "300"))
+    FORECAST_CACHE_TTL: float = float(os.getenv("FORECAST_CACHE_TTL", "1800"))
+    WEATHER_CACHE_MAXSIZE: int = int(os.getenv("WEATHER_CACHE_MAXSIZE", "1024"))
+
     # Monitoring
     ENABLE_MONITORING: bool = True
     LOGGING_LEVEL: str = os.getenv("LOGGING_LEVEL", "INFO")
 
+    # Logging pipeline: records go through a bounded queue to a background writer thread
+    LOG_ASYNC: bool = os.getenv("LOG_ASYNC", "true").lower() == "true"
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # a full queue drops records
+    LOG_SAMPLE_RATES: str = os.getenv("LOG_SAMPLE_RATES", "")  # e.g. "FlightDelayScanner=0.1,WeatherChecker=0.5"
+    LOG_SAMPLE_DEFAULT: float = float(os.getenv("LOG_SAMPLE_DEFAULT", "1"))  # INFO/DEBUG agent records kept
+    LOG_ERROR_WINDOW: float = float(os.getenv("LOG_ERROR_WINDOW", "60"))  # 0 disables error aggregation
+    LOG_ERROR_BURST: int = int(os.getenv("LOG_ERROR_BURST", "5"))  # repeats logged per window
+
+    # Tracing: recent spans kept in memory for /debug/traces, optionally exported as OTLP/JSON
+    TRACE_ENABLED: bool = os.getenv("TRACE_ENABLED", "true").lower() == "true"
+    TRACE_BUFFER_SIZE: int = int(os.getenv("TRACE_BUFFER_SIZE", "4096"))
+    TRACE_EXPORT_PATH: Optional[str] = os.getenv("TRACE_EXPORT_PATH")  # JSONL file, one batch per line
+    TRACE_EXPORT_URL: Optional[str] = os.getenv("TRACE_EXPORT_URL")  # e.g. http://localhost:4318/v1/traces
+    TRACE_EXPORT_INTERVAL: float = float(os.getenv("TRACE_EXPORT_INTERVAL", "5"))
+
+    # Trip update push channels (WebSocket / SSE)
+    EVENT_QUEUE_SIZE: int = int(os.getenv("EVENT_QUEUE_SIZE", "100"))  # per connection; full means slow consumer
+    SSE_HEARTBEAT_SECONDS: float = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+    # Batch flight status endpoint
+    FLIGHT_STATUS_BATCH_MAX: int = int(os.getenv("FLIGHT_STATUS_BATCH_MAX", "5000"))
+    FLIGHT_STATUS_BATCH_CHUNK: int = int(os.getenv("FLIGHT_STATUS_BATCH_CHUNK", "250"))
+
+    # Per-task timeout for the crew's task graph (seconds)
+    CREW_TASK_TIMEOUT: float = float(os.getenv("CREW_TASK_TIMEOUT", "30"))
+
+    # Memoized agent methods; set AGENT_CACHE_DISK_PATH to share results across workers
+    AGENT_CACHE_ENABLED: bool = os.getenv("AGENT_CACHE_ENABLED", "true").lower() == "true"
+    AGENT_CACHE_TTL: float = float(os.getenv("AGENT_CACHE_TTL", "300"))
+    AGENT_CACHE_MAXSIZE: int = int(os.getenv("AGENT_CACHE_MAXSIZE", "1024"))
+    AGENT_CACHE_DISK_PATH: Optional[str] = os.getenv("AGENT_CACHE_DISK_PATH")
+
+    # Semantic cache for LLM completions in BaseAgent.execute
+    SEMANTIC_CACHE_ENABLED: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))
+    SEMANTIC_CACHE_MAXSIZE: int = int(os.getenv("SEMANTIC_CACHE_MAXSIZE", "10000"))
+    SEMANTIC_CACHE_TTL: float = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+
+    # Governor for LLM calls: defaults for agents whose config leaves a budget unset (0 = unlimited)
+    AGENT_MAX_RPM: int = int(os.getenv("AGENT_MAX_RPM", "0"))
+    AGENT_MAX_TPM: int = int(os.getenv("AGENT_MAX_TPM", "0"))
+    AGENT_MAX_IN_FLIGHT: int = int(os.getenv("AGENT_MAX_IN_FLIGHT", "0"))
+    LLM_MAX_IN_FLIGHT: int = int(os.getenv("LLM_MAX_IN_FLIGHT", "32"))  # across all agents
+
+    # Chat intent router: optional JSONL of {"text", "intent"} examples for the fallback classifier
+    INTENT_TRAINING_DATA: Optional[str] = os.getenv("INTENT_TRAINING_DATA")
+    INTENT_CLASSIFIER_MIN_SCORE: float = float(os.getenv("INTENT_CLASSIFIER_MIN_SCORE", "0.2"))
+
+    # Flight monitor scheduler
+    MONITOR_WORKERS: int = int(os.getenv("MONITOR_WORKERS", "16"))
+    MONITOR_QUEUE_SIZE: int = int(os.getenv("MONITOR_QUEUE_SIZE", "32"))  # batches waiting for a worker
+    MONITOR_BATCH_SIZE: int = int(os.getenv("MONITOR_BATCH_SIZE", "100"))
+    MONITOR_TICK_SECONDS: float = float(os.getenv("MONITOR_TICK_SECONDS", "1"))
+    MONITOR_COMPLETION_GRACE: float = float(os.getenv("MONITOR_COMPLETION_GRACE", "7200"))
+
     # Memory settings
     MEMORY_COLLECTION_NAME: str = "flight_delay_interactions"
     MEMORY_PERSIST_DIRECTORY: str = os.getenv("MEMORY_PERSIST_DIR", str(Path.home() / ".flight_delay_memory"))
+    MEMORY_MAX_ENTRIES: int = int(os.getenv("MEMORY_MAX_ENTRIES", "100000"))
+    MEMORY_MAX_BYTES: int = int(os.getenv("MEMORY_MAX_BYTES", str(256 * 1024 * 1024)))
+    MEMORY_TTL_SECONDS: float = float(os.getenv("MEMORY_TTL_SECONDS", "86400"))  # 0 disables expiry
+    MEMORY_EVICTION_POLICY: str = os.getenv("MEMORY_EVICTION_POLICY", "lru")  # "lru" or "age"
+    MEMORY_COMPACTION_INTERVAL: float = float(os.getenv("MEMORY_COMPACTION_INTERVAL", "60"))
+    MEMORY_VECTOR_SEARCH: bool = os.getenv("MEMORY_VECTOR_SEARCH", "false").lower() == "true"
+    EMBEDDING_DIM: int = int(os.getenv("EMBEDDING_DIM", "256"))
+    VECTOR_IVF_THRESHOLD: int = int(os.getenv("VECTOR_IVF_THRESHOLD", "50000"))
+    VECTOR_IVF_N_PROBE: int = int(os.getenv("VECTOR_IVF_N_PROBE", "8"))
+    MEMORY_BACKEND: str = os.getenv("MEMORY_BACKEND", "memory")  # "memory" or "sqlite"
+    MEMORY_SQLITE_BATCH_SIZE: int = int(os.getenv("MEMORY_SQLITE_BATCH_SIZE", "256"))
+    MEMORY_SQLITE_FLUSH_INTERVAL: float = float(os.getenv("MEMORY_SQLITE_FLUSH_INTERVAL", "0.005"))
 
     class Config:
         case_sensitive = True
         env_file = ".env"
 
 
-# Create a global instance
+# Create a global instance. Directories are created by the components that write
+# to them (FileSystem, SQLiteMemory) when they are used, not at import time.
 settings = Settings()
-
-# If we're in development mode, create storage directories if they don't exist
-if settings.ENV == "development":
-    os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-    os.makedirs(settings.MEMORY_PERSIST_DIRECTORY, exist_ok=True)
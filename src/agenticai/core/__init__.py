@@ -1,4 +1,53 @@
+from .cache import TTLCache, time_bucket
 from .crew import FlightDelayCrew
+from .dag import GraphRun, GraphTask, TaskGraph, TaskGraphError
+from .events import EventBus, Subscription
+from .governor import Governor, TokenBucket
+from .log_pipeline import LazyJSON, LogPipeline
+from .memo import AgentMemo, DiskCache, cache_policy, memoize
+from .metrics import MetricsRegistry
 from .monitoring import Monitoring
+from .resilience import CircuitBreaker, CircuitOpenError, RetryBudget, Upstream, UpstreamError
+from .router import IntentRouter, RouteDecision, TfidfClassifier
+from .scheduler import FlightMonitor, MonitorScheduler
+from .singleflight import SingleFlight
+from .tracing import FileSpanExporter, HTTPSpanExporter, Span, Tracer, get_tracer, traced
 
-__all__ = ["FlightDelayCrew", "Monitoring"]
+__all__ = [
+    "AgentMemo",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DiskCache",
+    "EventBus",
+    "FileSpanExporter",
+    "FlightDelayCrew",
+    "FlightMonitor",
+    "Governor",
+    "GraphRun",
+    "GraphTask",
+    "HTTPSpanExporter",
+    "IntentRouter",
+    "LazyJSON",
+    "LogPipeline",
+    "MetricsRegistry",
+    "MonitorScheduler",
+    "Monitoring",
+    "RetryBudget",
+    "RouteDecision",
+    "SingleFlight",
+    "Span",
+    "Subscription",
+    "TTLCache",
+    "TaskGraph",
+    "TaskGraphError",
+    "TfidfClassifier",
+    "TokenBucket",
+    "Tracer",
+    "Upstream",
+    "UpstreamError",
+    "cache_policy",
+    "get_tracer",
+    "memoize",
+    "time_bucket",
+    "traced",
+]
@@ -0,0 +1,127 @@
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Hashable
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from .singleflight import SingleFlight
+
+_MISSING = object()
+
+
+def time_bucket(width: float, when: Optional[str] = None) -> int:
+    """Map an ISO timestamp (or now) onto a bucket of `width` seconds.
+
+    Used as part of a cache key so that lookups for the same place within
+    the same window share one entry.
+    """
+    timestamp = None
+    if when:
+        try:
+            timestamp = datetime.fromisoformat(when.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            timestamp = None
+    if timestamp is None:
+        timestamp = time.time()
+    return int(timestamp // width)
+
+
+class TTLCache:
+    """Async-friendly cache with per-entry TTL and a bounded LRU size.
+
+    Concurrent misses for the same key are coalesced: the first caller runs
+    the factory and everybody else awaits its result.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: int = 1024,
+        name: str = "cache",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the cache."""
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.name = name
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._flight = SingleFlight(name)
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh cached value, or `default`."""
+        value = self._lookup(key)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_set(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, computing it once on a miss."""
+        value = self._lookup(key)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        if self._flight.in_flight(key):
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        return await self._flight.do(key, lambda: self._load(key, factory))
+
+    async def _load(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        value = await factory()
+        self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+    def _lookup(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
@@ -1,12 +1,29 @@
-from typing import Any, Dict, List
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Optional, cast
 
 # Replace crewai import with our mock
 # from crewai import Crew, Task
-from ..agents.base import BaseAgent
+from ..config.settings import settings
+from .dag import GraphTask, TaskGraph
+from .tracing import traced
+
+if TYPE_CHECKING:
+    # agents.base imports core for memoization
+    from ..agents.alternative_route_suggester import AlternativeRouteSuggesterAgent
+    from ..agents.base import BaseAgent
+    from ..agents.flight_delay_scanner import FlightDelayScannerAgent
+    from ..agents.reservation_adjuster import ReservationAdjusterAgent
+    from ..agents.stakeholder_notifier import StakeholderNotifierAgent
+    from ..agents.weather_checker import WeatherCheckerAgent
+
+logger = logging.getLogger(__name__)
+
 
 # Create a mock Task class
 class Task:
     """Mock Task class to replace the crewAI one."""
+
     def __init__(self, description, agent, expected_output=None, context=None, async_execution=False):
         self.description = description
         self.agent = agent
@@ -14,9 +31,11 @@ class Task:
         self.context = context or {}
         self.async_execution = async_execution
 
+
 # Create a mock Crew class
 class Crew:
     """Mock Crew class to replace the crewAI one."""
+
     def __init__(self, agents, tasks, verbose=False, memory=True, process=None, callbacks=None):
         self.agents = agents
         self.tasks = tasks
@@ -24,18 +43,26 @@ class Crew:
         self.memory = memory
         self.process = process
         self.callbacks = callbacks
-        
+
     async def kickoff(self):
         """Mock kickoff method."""
         return {"status": "completed", "message": "Crew executed tasks successfully"}
 
 
 class FlightDelayCrew:
-    """CrewAI orchestration for flight delay response system."""
+    """CrewAI orchestration for flight delay response system.
 
-    def __init__(self, agents: List[BaseAgent]):
+    `handle_flight_delay` runs the agents as a task graph: weather and
+    delay analysis run in parallel, alternative routes and reservation
+    adjustments follow once both are known, and notifications go out last.
+    Only the delay analysis is required; if any other step fails or times
+    out, the response carries its error and the rest still completes.
+    """
+
+    def __init__(self, agents: list["BaseAgent"]):
         self.agents = agents
         self.crew = self._create_crew()
+        self.graph = self._create_graph()
 
     def _create_crew(self) -> Crew:
         """Create a CrewAI crew with all agents and their tasks."""
@@ -48,19 +75,153 @@ class FlightDelayCrew:
 
         return Crew(agents=[agent.agent for agent in self.agents], tasks=tasks, verbose=True)
 
-    async def handle_flight_delay(self, flight_info: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_graph(self) -> TaskGraph:
+        """Wire the agents into a dependency graph; agents missing from the crew are left out."""
+        agents = {agent.config.name: agent for agent in self.agents}
+        timeout = settings.CREW_TASK_TIMEOUT
+        tasks = self._analysis_tasks(agents, timeout)
+        tasks += self._follow_up_tasks(agents, [task.name for task in tasks], timeout)
+        return TaskGraph(tasks)
+
+    def _analysis_tasks(self, agents: dict[str, "BaseAgent"], timeout: float) -> list[GraphTask]:
+        """Weather and delay analysis, which run side by side."""
+        tasks = []
+
+        weather_checker = cast("Optional[WeatherCheckerAgent]", agents.get("WeatherChecker"))
+        if weather_checker:
+
+            async def check_weather(ctx: dict[str, Any]) -> dict[str, Any]:
+                flight = ctx["flight_info"]
+                departure = flight.get("scheduled_departure", "")
+                origin, destination = await asyncio.gather(
+                    weather_checker.check_weather(flight.get("origin", ""), departure),
+                    weather_checker.check_weather(flight.get("destination", ""), departure),
+                )
+                return {"origin": origin, "destination": destination}
+
+            tasks.append(GraphTask("weather", check_weather, timeout=timeout, required=False))
+
+        scanner = cast("Optional[FlightDelayScannerAgent]", agents.get("FlightDelayScanner"))
+        if scanner:
+
+            async def analyze_delay(ctx: dict[str, Any]) -> dict[str, Any]:
+                flight = ctx["flight_info"]
+                args = scanner.analysis_args(
+                    flight.get("flight_number", ""),
+                    flight.get("origin", ""),
+                    flight.get("destination", ""),
+                    flight.get("scheduled_departure", ""),
+                )
+                return await scanner.analyze_delay(**args)
+
+            tasks.append(GraphTask("delay_analysis", analyze_delay, timeout=timeout))
+
+        return tasks
+
+    def _follow_up_tasks(self, agents: dict[str, "BaseAgent"], analysis: list[str], timeout: float) -> list[GraphTask]:
+        """Alternatives and reservation changes once the analysis is in, then notifications."""
+        tasks = []
+
+        route_suggester = cast("Optional[AlternativeRouteSuggesterAgent]", agents.get("AlternativeRouteSuggester"))
+        if route_suggester:
+
+            async def suggest_alternatives(ctx: dict[str, Any]) -> dict[str, Any]:
+                flight = ctx["flight_info"]
+                return await route_suggester.suggest_alternatives(flight, flight.get("destination", ""))
+
+            tasks.append(
+                GraphTask("alternatives", suggest_alternatives, depends_on=analysis, timeout=timeout, required=False)
+            )
+
+        reservation_adjuster = cast("Optional[ReservationAdjusterAgent]", agents.get("ReservationAdjuster"))
+        if reservation_adjuster:
+
+            async def adjust_reservations(ctx: dict[str, Any]) -> dict[str, Any]:
+                return await reservation_adjuster.adjust_reservations(
+                    ctx["booking_data"], self._delay_info(ctx), ctx.get("new_arrival_time")
+                )
+
+            tasks.append(
+                GraphTask("reservations", adjust_reservations, depends_on=analysis, timeout=timeout, required=False)
+            )
+
+        notifier = cast("Optional[StakeholderNotifierAgent]", agents.get("StakeholderNotifier"))
+        if notifier:
+
+            async def notify_stakeholders(ctx: dict[str, Any]) -> dict[str, Any]:
+                delay_info = self._delay_info(ctx)
+                return await notifier.notify_stakeholders(
+                    ctx["calendar_event"],
+                    ctx["contacts"],
+                    ctx.get("new_arrival_time") or "To be determined",
+                    delay_info["delay_reason"],
+                )
+
+            follow_up = [task.name for task in tasks]
+            tasks.append(
+                GraphTask(
+                    "notifications",
+                    notify_stakeholders,
+                    depends_on=follow_up or analysis,
+                    timeout=timeout,
+                    required=False,
+                )
+            )
+
+        return tasks
+
+    @staticmethod
+    def _delay_info(ctx: dict[str, Any]) -> dict[str, Any]:
+        """Delay details for downstream agents, from the delay analysis when it ran."""
+        flight = ctx["flight_info"]
+        analysis = ctx.get("delay_analysis") or {}
+        return {
+            "flight_number": flight.get("flight_number"),
+            "original_arrival": flight.get("scheduled_arrival"),
+            "delay_reason": analysis.get("delay_reason", "Unknown"),
+            "predicted_delay_minutes": analysis.get("predicted_delay_minutes"),
+        }
+
+    @traced()
+    async def handle_flight_delay(
+        self,
+        flight_info: dict[str, Any],
+        booking_data: Optional[dict[str, Any]] = None,
+        contacts: Optional[list[dict[str, Any]]] = None,
+        calendar_event: Optional[dict[str, Any]] = None,
+        new_arrival_time: Optional[str] = None,
+    ) -> dict[str, Any]:
         """Handle a flight delay situation using all agents."""
-        # Since we're using mocks, just return simulated data
+        graph_run = await self.graph.run({
+            "flight_info": flight_info,
+            "booking_data": booking_data or {},
+            "contacts": contacts or [],
+            "calendar_event": calendar_event or {},
+            "new_arrival_time": new_arrival_time,
+        })
+        results = graph_run.results
+        timings = graph_run.timings()
+        logger.debug(f"Crew run for {flight_info.get('flight_number')}: {timings}")
+
+        analysis = results.get("delay_analysis") or {}
+        recommendations = [analysis["recommendation"]] if analysis.get("recommendation") else []
+        alternatives = results.get("alternatives") or {}
+        if alternatives.get("recommendation"):
+            recommendations.append(alternatives["recommendation"])
+
         return {
-            "status": "DELAYED",
+            "status": analysis.get("delay_status", "UNKNOWN"),
             "flight": flight_info.get("flight_number"),
             "origin": flight_info.get("origin"),
             "destination": flight_info.get("destination"),
-            "delay_reason": "Weather conditions at destination",
-            "estimated_delay": "2 hours",
-            "recommendations": [
-                "Notify hotel about late arrival",
-                "Check alternative routes if critical",
-                "Update calendar events"
-            ]
+            "delay_reason": analysis.get("delay_reason"),
+            "estimated_delay": f"{analysis.get('predicted_delay_minutes', 0)} minutes",
+            "recommendations": recommendations,
+            "weather": results.get("weather"),
+            "delay_analysis": analysis,
+            "alternatives": results.get("alternatives"),
+            "reservations": results.get("reservations"),
+            "notifications": results.get("notifications"),
+            "errors": {name: str(error) for name, error in graph_run.errors.items()},
+            "timings": timings,
         }
@@ -0,0 +1,167 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from .tracing import get_tracer
+
+
+class TaskGraphError(Exception):
+    """A required task in a graph run failed or timed out."""
+
+    def __init__(self, task_name: str, error: BaseException):
+        super().__init__(f"Task {task_name!r} failed: {error!r}")
+        self.task_name = task_name
+        self.error = error
+
+
+@dataclass
+class GraphTask:
+    """One node of a task graph.
+
+    `func` receives the run context: the run inputs plus the result of each
+    dependency under the dependency's name. If an optional task fails, the
+    run continues and its dependents see None as its result.
+    """
+
+    name: str
+    func: Callable[[dict[str, Any]], Awaitable[Any]]
+    depends_on: Sequence[str] = ()
+    timeout: Optional[float] = None
+    required: bool = True
+
+
+@dataclass
+class GraphRun:
+    """Results, errors and timings of one graph run (times in seconds from the start)."""
+
+    results: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, BaseException] = field(default_factory=dict)
+    started: dict[str, float] = field(default_factory=dict)
+    finished: dict[str, float] = field(default_factory=dict)
+    total: float = 0.0
+    critical_path: list[str] = field(default_factory=list)
+
+    def timings(self) -> dict[str, Any]:
+        """Per-task timing breakdown in milliseconds, with the critical path."""
+        return {
+            "total_ms": round(self.total * 1000, 3),
+            "critical_path": self.critical_path,
+            "tasks": {
+                name: {
+                    "start_ms": round(start * 1000, 3),
+                    "duration_ms": round((self.finished.get(name, self.total) - start) * 1000, 3),
+                    "status": "error" if name in self.errors else "ok" if name in self.finished else "cancelled",
+                }
+                for name, start in self.started.items()
+            },
+        }
+
+
+class TaskGraph:
+    """Run async tasks as soon as their dependencies finish.
+
+    Independent tasks run concurrently. Each task can have its own timeout.
+    When a required task fails, every task still running is cancelled and
+    the run raises `TaskGraphError`. Cancelling the run cancels all of its
+    tasks. The graph itself is immutable and can be run concurrently.
+    """
+
+    def __init__(self, tasks: Sequence[GraphTask]):
+        """Validate the tasks and their dependencies."""
+        self.tasks = {task.name: task for task in tasks}
+        if len(self.tasks) != len(tasks):
+            raise ValueError("Task names must be unique")
+        for task in tasks:
+            unknown = set(task.depends_on) - self.tasks.keys()
+            if unknown:
+                raise ValueError(f"Task {task.name!r} depends on unknown tasks: {sorted(unknown)}")
+        self.order = self._topological_order()
+
+    async def run(self, inputs: Optional[dict[str, Any]] = None) -> GraphRun:
+        """Execute the graph and return its results and timings."""
+        inputs = inputs or {}
+        graph_run = GraphRun()
+        pending = list(self.order)
+        running: dict[asyncio.Future, GraphTask] = {}
+        start = time.perf_counter()
+
+        def start_ready() -> None:
+            for task in list(pending):
+                if all(dep in graph_run.finished for dep in task.depends_on):
+                    pending.remove(task)
+                    context = dict(inputs)
+                    context.update({dep: graph_run.results.get(dep) for dep in task.depends_on})
+                    graph_run.started[task.name] = time.perf_counter() - start
+                    running[asyncio.ensure_future(self._run_task(task, context))] = task
+
+        try:
+            start_ready()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    graph_run.finished[task.name] = time.perf_counter() - start
+                    error = future.exception()
+                    if error is None:
+                        graph_run.results[task.name] = future.result()
+                        continue
+                    graph_run.errors[task.name] = error
+                    if task.required:
+                        raise TaskGraphError(task.name, error) from error
+                start_ready()
+        finally:
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            graph_run.total = time.perf_counter() - start
+            graph_run.critical_path = self._critical_path(graph_run)
+
+        return graph_run
+
+    @staticmethod
+    async def _run_task(task: GraphTask, context: dict[str, Any]) -> Any:
+        with get_tracer().span(f"task.{task.name}"):
+            if task.timeout is None:
+                return await task.func(context)
+            try:
+                return await asyncio.wait_for(task.func(context), task.timeout)
+            except asyncio.TimeoutError:
+                raise asyncio.TimeoutError(f"{task.name} timed out after {task.timeout}s") from None
+
+    def _critical_path(self, graph_run: GraphRun) -> list[str]:
+        """Walk back from the last task to finish through the dependency that finished last."""
+        if not graph_run.finished:
+            return []
+        name = max(graph_run.finished, key=graph_run.finished.__getitem__)
+        path = [name]
+        while True:
+            deps = [dep for dep in self.tasks[name].depends_on if dep in graph_run.finished]
+            if not deps:
+                break
+            name = max(deps, key=graph_run.finished.__getitem__)
+            path.append(name)
+        return path[::-1]
+
+    def _topological_order(self) -> list[GraphTask]:
+        order: list[GraphTask] = []
+        visiting: set[str] = set()
+        visited: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through task {name!r}")
+            visiting.add(name)
+            for dep in self.tasks[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+            order.append(self.tasks[name])
+
+        for name in self.tasks:
+            visit(name)
+        return order
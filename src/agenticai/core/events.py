@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from collections.abc import Hashable
+from typing import Any, Optional
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_CLOSED = object()
+
+
+class Subscription:
+    """One subscriber's bounded queue of events for a topic."""
+
+    def __init__(self, bus: "EventBus", topic: Hashable, maxsize: int):
+        """Initialize the subscription; use `EventBus.subscribe` instead."""
+        self.bus = bus
+        self.topic = topic
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    async def get(self) -> Optional[dict[str, Any]]:
+        """Wait for the next event; returns None once the subscription is closed."""
+        if self.closed and self._queue.empty():
+            return None
+        event = await self._queue.get()
+        return None if event is _CLOSED else event
+
+    def close(self, reason: str = "closed") -> None:
+        """Unsubscribe and wake up a pending `get()`."""
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        self.bus._unsubscribe(self)
+        # Pending events are dropped; the wake-up marker must fit
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(_CLOSED)
+
+    def _offer(self, event: dict[str, Any]) -> bool:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+
+class EventBus:
+    """In-process publish/subscribe fan-out keyed by topic (e.g. a trip id).
+
+    Publishing never blocks: every subscriber has a bounded queue, and a
+    subscriber whose queue is full is a slow consumer and gets closed with
+    reason "slow_consumer" rather than holding up the publisher or growing
+    without bound. Publish and subscribe from the event loop thread.
+    """
+
+    def __init__(self, queue_size: Optional[int] = None):
+        """Initialize the bus; unset options fall back to settings."""
+        self.queue_size = queue_size or settings.EVENT_QUEUE_SIZE
+        self._subscribers: dict[Hashable, set[Subscription]] = {}
+
+        self.published = 0
+        self.delivered = 0
+        self.dropped_subscribers = 0
+
+    def subscribe(self, topic: Hashable) -> Subscription:
+        """Subscribe to a topic; close the subscription when done."""
+        subscription = Subscription(self, topic, self.queue_size)
+        self._subscribers.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def publish(self, topic: Hashable, event: dict[str, Any]) -> int:
+        """Deliver an event to every subscriber of a topic; returns how many got it."""
+        self.published += 1
+        subscribers = self._subscribers.get(topic)
+        if not subscribers:
+            return 0
+
+        delivered = 0
+        for subscription in list(subscribers):
+            if subscription._offer(event):
+                delivered += 1
+            else:
+                self.dropped_subscribers += 1
+                logger.warning(f"Dropping slow subscriber on {topic!r}")
+                subscription.close("slow_consumer")
+        self.delivered += delivered
+        return delivered
+
+    def subscriber_count(self, topic: Optional[Hashable] = None) -> int:
+        """Number of subscribers for a topic, or across all topics."""
+        if topic is not None:
+            return len(self._subscribers.get(topic, ()))
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def stats(self) -> dict[str, Any]:
+        """Return fan-out counters."""
+        return {
+            "topics": len(self._subscribers),
+            "subscribers": self.subscriber_count(),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_subscribers": self.dropped_subscribers,
+        }
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.topic)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.topic]
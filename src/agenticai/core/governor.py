@@ -0,0 +1,279 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from .monitoring import Monitoring
+
+WAIT_WINDOW = 1024
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """Refills `per_minute` tokens a minute, holding at most a minute's worth.
+
+    The balance may go negative when a caller spends more than it reserved
+    (e.g. actual LLM tokens above the estimate); later requests then wait
+    until the debt is paid back.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        """Initialize a full bucket."""
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def delay(self, n: float) -> float:
+        """Seconds until `n` tokens are available (0 if they are now)."""
+        missing = min(n, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def take(self, n: float) -> None:
+        """Spend `n` tokens."""
+        self._refill()
+        self._tokens -= n
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+@dataclass
+class AgentLimits:
+    """One agent's budgets (None means unlimited) and counters."""
+
+    priority: int
+    max_in_flight: Optional[int]
+    rpm: Optional[TokenBucket]
+    tpm: Optional[TokenBucket]
+    in_flight: int = 0
+    queued: int = 0
+    admitted: int = 0
+    tokens: int = 0
+    waits: deque = field(default_factory=lambda: deque(maxlen=WAIT_WINDOW))
+
+
+@dataclass
+class Permit:
+    """An admitted call; report the tokens actually used so the TPM budget stays accurate."""
+
+    agent: str
+    tokens: int
+    waited: float
+    _governor: "Governor"
+
+    def record_tokens(self, actual: int) -> None:
+        """Charge the difference between actual and reserved tokens."""
+        self._governor._charge(self, actual)
+
+
+@dataclass
+class _Waiter:
+    agent: str
+    tokens: int
+    enqueued: float
+    future: asyncio.Future
+
+
+class Governor:
+    """Shared admission control for upstream and LLM calls.
+
+    Callers wait in `slot()` until a global in-flight slot is free and
+    their agent is under its in-flight, requests-per-minute and
+    tokens-per-minute budgets. Waiters are admitted in priority order
+    (lower first) and first come, first served within a priority; a waiter
+    blocked by its own agent's budget does not hold up other agents. When
+    a budget is the only thing in the way, a timer retries admission once
+    the bucket has refilled.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        monitoring: Optional[Monitoring] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the governor; `max_in_flight` caps calls across all agents."""
+        self.max_in_flight = max_in_flight
+        self.monitoring = monitoring
+        self._clock = clock
+        self.limits: dict[str, AgentLimits] = {}
+        self._queues: dict[int, deque[_Waiter]] = {}
+        self._in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_due = 0.0
+
+    def configure(
+        self,
+        agent: str,
+        max_rpm: Optional[int] = None,
+        max_tpm: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        priority: int = 5,
+    ) -> None:
+        """Set an agent's budgets; unconfigured agents are only bound by the global limit."""
+        self.limits[agent] = AgentLimits(
+            priority=priority,
+            max_in_flight=max_in_flight or None,
+            rpm=TokenBucket(max_rpm, self._clock) if max_rpm else None,
+            tpm=TokenBucket(max_tpm, self._clock) if max_tpm else None,
+        )
+
+    @asynccontextmanager
+    async def slot(self, agent: str, tokens: int = 0, priority: Optional[int] = None) -> AsyncIterator[Permit]:
+        """Wait for admission, hold a slot for the duration of the block, then release it."""
+        limits = self.limits.get(agent) or self._default_limits(agent)
+        waiter = _Waiter(agent, tokens, self._clock(), asyncio.get_running_loop().create_future())
+        self._queues.setdefault(limits.priority if priority is None else priority, deque()).append(waiter)
+        limits.queued += 1
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if not waiter.future.cancelled():
+                self._release(agent)  # admitted just as we were cancelled
+            else:
+                self._discard(waiter)
+            raise
+
+        waited = self._clock() - waiter.enqueued
+        limits.waits.append(waited)
+        if self.monitoring is not None:
+            self.monitoring.record_timing(f"governor_wait.{agent}", waited)
+        try:
+            yield Permit(agent, tokens, waited, self)
+        finally:
+            self._release(agent)
+
+    def queue_depth(self) -> int:
+        """Number of calls waiting for admission."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth, in-flight calls and wait times, overall and per agent."""
+        agents = {}
+        for name, limits in self.limits.items():
+            waits = sorted(limits.waits)
+            agents[name] = {
+                "priority": limits.priority,
+                "queued": limits.queued,
+                "in_flight": limits.in_flight,
+                "admitted": limits.admitted,
+                "tokens": limits.tokens,
+                "wait_p50_ms": round(waits[len(waits) // 2] * 1000, 3) if waits else 0.0,
+                "wait_p95_ms": round(waits[int(len(waits) * 0.95)] * 1000, 3) if waits else 0.0,
+                "wait_max_ms": round(waits[-1] * 1000, 3) if waits else 0.0,
+            }
+        return {
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": self.queue_depth(),
+            "agents": agents,
+        }
+
+    def _default_limits(self, agent: str) -> AgentLimits:
+        self.configure(agent)
+        return self.limits[agent]
+
+    def _dispatch(self) -> None:
+        """Admit every waiter that fits, highest priority first."""
+        retry_in: Optional[float] = None
+        for priority in sorted(self._queues):
+            queue = self._queues[priority]
+            blocked: set[str] = set()  # keep each agent's waiters in order
+            for waiter in list(queue):
+                if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+                    return
+                if waiter.agent in blocked:
+                    continue
+                delay = self._admission_delay(waiter)
+                if delay is None or delay > 0:
+                    blocked.add(waiter.agent)
+                    if delay:
+                        retry_in = delay if retry_in is None else min(retry_in, delay)
+                    continue
+                queue.remove(waiter)
+                self._admit(waiter)
+            if not queue:
+                del self._queues[priority]
+
+        if retry_in is not None:
+            self._schedule_retry(retry_in)
+
+    def _admission_delay(self, waiter: _Waiter) -> Optional[float]:
+        """0 if the waiter can go now, seconds until a budget allows it, or None if waiting on a slot."""
+        limits = self.limits[waiter.agent]
+        if limits.max_in_flight is not None and limits.in_flight >= limits.max_in_flight:
+            return None
+        delay = 0.0
+        if limits.rpm is not None:
+            delay = max(delay, limits.rpm.delay(1))
+        if limits.tpm is not None and waiter.tokens:
+            delay = max(delay, limits.tpm.delay(waiter.tokens))
+        return delay
+
+    def _admit(self, waiter: _Waiter) -> None:
+        limits = self.limits[waiter.agent]
+        if limits.rpm is not None:
+            limits.rpm.take(1)
+        if limits.tpm is not None:
+            limits.tpm.take(waiter.tokens)
+        limits.queued -= 1
+        limits.in_flight += 1
+        limits.admitted += 1
+        limits.tokens += waiter.tokens
+        self._in_flight += 1
+        waiter.future.set_result(None)
+
+    def _release(self, agent: str) -> None:
+        self.limits[agent].in_flight -= 1
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _discard(self, waiter: _Waiter) -> None:
+        self.limits[waiter.agent].queued -= 1
+        for priority, queue in list(self._queues.items()):
+            if waiter in queue:
+                queue.remove(waiter)
+                if not queue:
+                    del self._queues[priority]
+                break
+        self._dispatch()
+
+    def _charge(self, permit: Permit, actual: int) -> None:
+        limits = self.limits[permit.agent]
+        extra = actual - permit.tokens
+        if limits.tpm is not None:
+            limits.tpm.take(extra)
+        limits.tokens += extra
+        permit.tokens = actual
+
+    def _schedule_retry(self, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        due = loop.time() + delay
+        if self._timer is not None and not self._timer.cancelled() and self._timer_due <= due:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_due = due
+        self._timer = loop.call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
@@ -0,0 +1,260 @@
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from collections.abc import Hashable, Mapping
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class LazyJSON:
+    """Defers `json.dumps` of a value until a log record is actually formatted.
+
+    Pass it as a log argument (`logger.debug("Result: %s", LazyJSON(result))`)
+    so records filtered out by level never pay for serialization.
+    """
+
+    __slots__ = ("limit", "value")
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        """Wrap `value`; the rendered text is cut to `limit` characters if given."""
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        try:
+            text = json.dumps(self.value, default=str)
+        except (TypeError, ValueError):
+            text = str(self.value)
+        if self.limit is not None and len(text) > self.limit:
+            return text[: self.limit] + "..."
+        return text
+
+
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    """Per-agent sample rates from `"Agent=0.1,Other=0.5"`."""
+    rates = {}
+    for item in spec.split(","):
+        name, sep, rate = item.partition("=")
+        if sep and name.strip():
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class AgentSampler(logging.Filter):
+    """Keeps a fraction of the INFO and DEBUG records logged for each agent.
+
+    Records carry their agent in `extra={"agent": ...}`; the rate for an
+    agent comes from `rates`, else `default`. Warnings and errors, and
+    records without an agent, always pass.
+    """
+
+    def __init__(self, rates: Optional[Mapping[str, float]] = None, default: float = 1.0, rng: Any = random):
+        """Initialize the sampler."""
+        super().__init__()
+        self.rates = dict(rates or {})
+        self.default = default
+        self._rng = rng
+
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        agent = getattr(record, "agent", None)
+        if agent is None or record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(agent, self.default)
+        if rate >= 1.0 or self._rng.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class ErrorAggregator(logging.Filter):
+    """Rate-limits repeated warnings and errors.
+
+    Records are grouped by logger, agent and error type when the record
+    carries them, else by their unformatted message. Each group lets
+    `burst` records through per `window` seconds and counts the rest; the
+    first record after the window notes how many were suppressed.
+    """
+
+    def __init__(self, window: float = 60.0, burst: int = 5, clock: Any = time.monotonic):
+        """Initialize the aggregator."""
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._clock = clock
+        self._groups: dict[Hashable, list] = {}  # key -> [window start, passed, suppressed]
+        self._lock = threading.Lock()
+
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.window <= 0:
+            return True
+        agent = getattr(record, "agent", None)
+        key: Hashable
+        if agent is not None:
+            key = (record.name, agent, getattr(record, "error_type", None))
+        else:
+            key = (record.name, record.msg if isinstance(record.msg, str) else type(record.msg))
+        now = self._clock()
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None or now - group[0] >= self.window:
+                repeats = group[2] if group is not None else 0
+                self._groups[key] = [now, 1, 0]
+                if len(self._groups) > 4096:
+                    self._prune(now)
+            elif group[1] < self.burst:
+                group[1] += 1
+                return True
+            else:
+                group[2] += 1
+                self.suppressed += 1
+                return False
+        if repeats:
+            record.msg = f"{record.getMessage()} (+{repeats} similar suppressed in the last {self.window:g}s)"
+            record.args = None
+        return True
+
+    def pending(self) -> int:
+        """Records suppressed in the current windows and not yet reported."""
+        with self._lock:
+            return sum(group[2] for group in self._groups.values())
+
+    def _prune(self, now: float) -> None:
+        for key in [k for k, g in self._groups.items() if now - g[0] >= self.window and not g[2]]:
+            del self._groups[key]
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Enqueues without blocking, counting the records a full queue turns away."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now so mutable ones can't change under the writer,
+        # but leave timestamps, levels and layout to the writer thread's formatter
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Listener(QueueListener):
+    queue: queue.Queue
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(None)  # QueueListener's sentinel; wait for room: the queue may be full when stopping
+
+
+class LogPipeline:
+    """Moves log formatting and I/O off the calling thread.
+
+    `install()` replaces the root logger's handlers with a handler that
+    applies per-agent sampling and error aggregation, then puts records on
+    a bounded queue. A background thread drains the queue into the
+    original handlers. A full queue drops records rather than blocking
+    the event loop; `stats()` reports what was enqueued, dropped, sampled
+    out and suppressed.
+    """
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        sample_rates: Optional[Mapping[str, float]] = None,
+        sample_default: Optional[float] = None,
+        error_window: Optional[float] = None,
+        error_burst: Optional[int] = None,
+    ):
+        """Initialize the pipeline; unset options fall back to settings."""
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size or settings.LOG_QUEUE_SIZE)
+        self.sampler = AgentSampler(
+            sample_rates if sample_rates is not None else parse_sample_rates(settings.LOG_SAMPLE_RATES),
+            sample_default if sample_default is not None else settings.LOG_SAMPLE_DEFAULT,
+        )
+        self.aggregator = ErrorAggregator(
+            window=error_window if error_window is not None else settings.LOG_ERROR_WINDOW,
+            burst=error_burst if error_burst is not None else settings.LOG_ERROR_BURST,
+        )
+        self.handler = _NonBlockingQueueHandler(self.queue)
+        self.handler.addFilter(self.sampler)
+        self.handler.addFilter(self.aggregator)
+        self._listener: Optional[_Listener] = None
+        self._replaced: list[logging.Handler] = []
+        self._root: Optional[logging.Logger] = None
+
+    @property
+    def installed(self) -> bool:
+        return self._listener is not None
+
+    def install(self, root: Optional[logging.Logger] = None) -> None:
+        """Route `root` (the root logger by default) through the queue."""
+        if self.installed:
+            return
+        root = root or logging.getLogger()
+        self._replaced = list(root.handlers)
+        handlers = self._replaced
+        if not handlers:
+            stream = logging.StreamHandler()
+            stream.setFormatter(logging.Formatter(LOG_FORMAT))
+            handlers = [stream]
+        for handler in self._replaced:
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        self._root = root
+        self._listener = _Listener(self.queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+
+    def uninstall(self) -> None:
+        """Write out the queued records and restore the original handlers."""
+        listener, root = self._listener, self._root
+        if listener is None or root is None:
+            return
+        listener.stop()  # drains the queue before returning
+        self._listener = None
+        root.removeHandler(self.handler)
+        for handler in self._replaced:
+            root.addHandler(handler)
+        suppressed = self.aggregator.pending()
+        if suppressed or self.handler.dropped:
+            logger.warning(
+                "Log pipeline stopped: %d records dropped on a full queue, %d repeated errors suppressed",
+                self.handler.dropped,
+                suppressed,
+            )
+        self._replaced = []
+        self._root = None
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth and record counters."""
+        return {
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "enqueued": self.handler.enqueued,
+            "dropped": self.handler.dropped,
+            "sampled_out": self.sampler.sampled_out,
+            "suppressed": self.aggregator.suppressed,
+        }
@@ -0,0 +1,293 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar, Union, cast
+
+from ..config.settings import settings
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+_MISSING = object()
+
+CACHE_MODES = ("use", "refresh", "bypass")
+
+# "use": read and write the cache; "refresh": recompute and overwrite; "bypass": don't touch it
+_cache_mode: contextvars.ContextVar[str] = contextvars.ContextVar("agent_cache_mode", default="use")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memo (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+"""
+
+
+@contextmanager
+def cache_policy(mode: str) -> Iterator[None]:
+    """Set how memoized agent methods use their caches within this context (e.g. one request)."""
+    if mode not in CACHE_MODES:
+        raise ValueError(f"Unknown cache mode {mode!r}; expected one of {CACHE_MODES}")
+    token = _cache_mode.set(mode)
+    try:
+        yield
+    finally:
+        _cache_mode.reset(token)
+
+
+def cache_mode() -> str:
+    """The cache policy in effect for the current context."""
+    return _cache_mode.get()
+
+
+def _freeze(value: Any) -> Any:
+    """Make an argument usable in a cache key."""
+    if isinstance(value, (dict, list, tuple, set)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+
+@dataclass(frozen=True)
+class MemoSpec:
+    """How one agent method is memoized.
+
+    `fields` are the argument names that make up the key, each with an
+    optional normalizer (e.g. `str.upper`); an empty mapping keys on every
+    argument.
+    """
+
+    name: str
+    signature: inspect.Signature
+    fields: Mapping[str, Optional[Callable[[Any], Any]]]
+    ttl: float
+    maxsize: int
+    disk: bool
+
+    def key(self, agent: Any, args: tuple, kwargs: dict) -> tuple:
+        """Build the cache key for a call."""
+        bound = self.signature.bind(agent, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        arguments.pop(next(iter(self.signature.parameters)))  # the agent itself
+        fields = self.fields or dict.fromkeys(arguments)
+        return tuple(_freeze(normalize(arguments[f]) if normalize else arguments[f]) for f, normalize in fields.items())
+
+
+def memoize(
+    key: Union[Sequence[str], Mapping[str, Optional[Callable[[Any], Any]]]] = (),
+    ttl: Optional[float] = None,
+    maxsize: Optional[int] = None,
+    disk: bool = False,
+) -> Callable[[F], F]:
+    """Declare an async agent method as memoized.
+
+    `key` names the arguments the result depends on, optionally mapped to a
+    normalizer. Results are kept in a per-agent LRU with a TTL and, with
+    `disk=True`, in the shared on-disk tier when the agent has one. Cached
+    results are shared between callers and must be treated as read-only.
+
+        @memoize(key={"flight_number": str.upper, "date": None}, ttl=300)
+        async def analyze_delay(self, flight_number, date): ...
+    """
+    fields = dict(key) if isinstance(key, Mapping) else dict.fromkeys(key)
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+        unknown = set(fields) - set(signature.parameters)
+        if unknown:
+            raise ValueError(f"{func.__qualname__} has no arguments named {sorted(unknown)}")
+        spec = MemoSpec(
+            name=func.__name__,
+            signature=signature,
+            fields=fields,
+            ttl=ttl if ttl is not None else settings.AGENT_CACHE_TTL,
+            maxsize=maxsize or settings.AGENT_CACHE_MAXSIZE,
+            disk=disk,
+        )
+
+        @functools.wraps(func)
+        async def wrapper(agent: Any, *args: Any, **kwargs: Any) -> Any:
+            return await agent.memo.call(spec, func, agent, args, kwargs)
+
+        # The wrapper keeps the method's type for callers, which has no memo_spec attribute
+        setattr(wrapper, "memo_spec", spec)  # noqa: B010
+        return cast(F, wrapper)
+
+    return decorator
+
+
+class DiskCache:
+    """Shared on-disk tier for memoized results, stored as JSON in SQLite.
+
+    The database runs in WAL mode so several worker processes can share
+    it. Calls block; run them off the event loop.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the cache; the database file is created on first use."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def get(self, namespace: str, key: str) -> Any:
+        """Return a fresh value, or the module's missing marker."""
+        with self._lock:
+            row = (
+                self
+                ._connection()
+                .execute("SELECT expires_at, value FROM memo WHERE namespace = ? AND key = ?", (namespace, key))
+                .fetchone()
+            )
+        if row is None or row[0] <= time.time():
+            return _MISSING
+        return json.loads(row[1])
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        """Store a JSON-serializable value."""
+        document = json.dumps(value)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO memo (namespace, key, expires_at, value) VALUES (?, ?, ?, ?)",
+                (namespace, key, time.time() + ttl, document),
+            )
+            conn.commit()
+
+    def delete(self, namespace: str, key: Optional[str] = None) -> None:
+        """Drop one entry, or every entry in a namespace."""
+        with self._lock:
+            conn = self._connection()
+            if key is None:
+                conn.execute("DELETE FROM memo WHERE namespace = ?", (namespace,))
+            else:
+                conn.execute("DELETE FROM memo WHERE namespace = ? AND key = ?", (namespace, key))
+            conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed."""
+        with self._lock:
+            conn = self._connection()
+            removed = conn.execute("DELETE FROM memo WHERE expires_at <= ?", (time.time(),)).rowcount
+            conn.commit()
+        return removed
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+
+class AgentMemo:
+    """One agent's memoized method caches and their hit counters."""
+
+    def __init__(self, agent_name: str, store: Optional[DiskCache] = None, enabled: Optional[bool] = None):
+        """Initialize the caches; unset options fall back to settings."""
+        self.agent_name = agent_name
+        self.store = store
+        self.enabled = settings.AGENT_CACHE_ENABLED if enabled is None else enabled
+        self.caches: dict[str, TTLCache] = {}
+
+        self.disk_hits = 0
+        self.refreshed = 0
+        self.bypassed = 0
+
+    async def call(self, spec: MemoSpec, func: Callable, agent: Any, args: tuple, kwargs: dict) -> Any:
+        """Run a memoized method through the caches according to the current cache policy."""
+        mode = _cache_mode.get()
+        if not self.enabled or mode == "bypass":
+            self.bypassed += 1
+            return await func(agent, *args, **kwargs)
+
+        key = spec.key(agent, args, kwargs)
+        cache = self._cache(spec)
+        if mode == "refresh":
+            self.refreshed += 1
+            value = await self._load(spec, key, lambda: func(agent, *args, **kwargs), read_disk=False)
+            cache.set(key, value)
+            return value
+        return await cache.get_or_set(key, lambda: self._load(spec, key, lambda: func(agent, *args, **kwargs)))
+
+    async def invalidate(self, spec: MemoSpec, key: Optional[tuple] = None) -> None:
+        """Drop one cached result, or all results of a method, from both tiers."""
+        cache = self.caches.get(spec.name)
+        if cache is not None:
+            if key is None:
+                cache.clear()
+            else:
+                cache.invalidate(key)
+        if spec.disk and self.store is not None:
+            disk_key = None if key is None else self._disk_key(key)
+            await asyncio.to_thread(self.store.delete, self._namespace(spec), disk_key)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit-rate counters per memoized method and for the agent overall."""
+        methods = {name: cache.stats() for name, cache in self.caches.items()}
+        hits = sum(s["hits"] + s["coalesced"] for s in methods.values())
+        lookups = hits + sum(s["misses"] for s in methods.values())
+        return {
+            "agent": self.agent_name,
+            "enabled": self.enabled,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "disk_hits": self.disk_hits,
+            "refreshed": self.refreshed,
+            "bypassed": self.bypassed,
+            "methods": methods,
+        }
+
+    def _cache(self, spec: MemoSpec) -> TTLCache:
+        cache = self.caches.get(spec.name)
+        if cache is None:
+            cache = self.caches[spec.name] = TTLCache(
+                ttl=spec.ttl, maxsize=spec.maxsize, name=f"{self.agent_name}.{spec.name}"
+            )
+        return cache
+
+    async def _load(self, spec: MemoSpec, key: tuple, compute: Callable, read_disk: bool = True) -> Any:
+        """Fill an in-process miss from the disk tier, or by running the method."""
+        store = self.store if spec.disk else None
+        if store is not None and read_disk:
+            value = await asyncio.to_thread(store.get, self._namespace(spec), self._disk_key(key))
+            if value is not _MISSING:
+                self.disk_hits += 1
+                return value
+
+        value = await compute()
+        if store is not None:
+            try:
+                await asyncio.to_thread(store.set, self._namespace(spec), self._disk_key(key), value, spec.ttl)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Not caching {self.agent_name}.{spec.name} on disk: {e}")
+        return value
+
+    def _namespace(self, spec: MemoSpec) -> str:
+        return f"{self.agent_name}.{spec.name}"
+
+    @staticmethod
+    def _disk_key(key: tuple) -> str:
+        return json.dumps(key, default=str)
@@ -0,0 +1,264 @@
+import math
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from typing import Any, Callable, Optional, TypeVar
+
+
+def exponential_buckets(start: float, factor: float, count: int) -> tuple[float, ...]:
+    """`count` histogram bucket bounds growing geometrically from `start`."""
+    return tuple(start * factor**i for i in range(count))
+
+
+# 0.5 ms to ~90 s in steps of sqrt(2): relative error of a quantile estimate stays under ~41%
+LATENCY_BUCKETS = exponential_buckets(0.0005, math.sqrt(2), 36)
+
+M = TypeVar("M", bound="_Metric")
+
+
+def _format_value(value: float) -> str:
+    if type(value) is int:
+        return str(value)
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last slot is the +Inf bucket
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q` quantile (0 if empty)."""
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip((*self.bounds, math.inf), self.counts):
+            seen += n
+            if n and seen >= rank:
+                return bound
+        return 0.0
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, Any] = {}
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def labels(self, *values: Any) -> Any:
+        """The series for these label values; hold on to it to skip the lookup on hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        for values, child in self._children.items():
+            yield self.name, _format_labels(self.labelnames, values), child.value
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.value += amount
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+
+class Gauge(_Metric):
+    """A value that goes up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        self._default.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.value -= amount
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed buckets, with their sum."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, description: str, labelnames: Sequence[str] = (), buckets: Optional[Sequence[float]] = None
+    ):
+        self.buckets = tuple(sorted(buckets or LATENCY_BUCKETS))
+        super().__init__(name, description, labelnames)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        # Format the bounds and each series' labels once rather than per bucket line
+        bounds = [f'le="{_format_value(bound)}"}}' for bound in (*self.buckets, math.inf)]
+        bucket = f"{self.name}_bucket"
+        for values, child in self._children.items():
+            labels = _format_labels(self.labelnames, values)
+            prefix = labels[:-1] + "," if labels else "{"
+            cumulative = 0
+            for le, n in zip(bounds, child.counts):
+                cumulative += n
+                yield bucket, prefix + le, cumulative
+            yield f"{self.name}_sum", labels, child.sum
+            yield f"{self.name}_count", labels, cumulative
+
+
+class MetricsRegistry:
+    """Named counters, gauges and histograms, rendered in the Prometheus text format.
+
+    Recording is a dict lookup for the label values plus an in-place add,
+    with no locks: metrics are meant to be updated from the event loop
+    thread. Stats that components already keep (queue depths, cache hit
+    counters) are not copied on every change; `register_stats` reads them
+    when the metrics are rendered.
+    """
+
+    def __init__(self, namespace: str = "agenticai"):
+        """Initialize an empty registry; metric names are prefixed with `namespace`."""
+        self.namespace = namespace
+        self._metrics: dict[str, _Metric] = {}
+        self._stats: list[tuple[str, Callable[[], dict[str, Any]], Optional[str], frozenset]] = []
+
+    def counter(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, description, labelnames)
+
+    def gauge(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, description, labelnames)
+
+    def histogram(
+        self, name: str, description: str, labelnames: Sequence[str] = (), buckets: Optional[Sequence[float]] = None
+    ) -> Histogram:
+        """Get or create a histogram (latency buckets by default)."""
+        return self._get_or_create(Histogram, name, description, labelnames, buckets=buckets)
+
+    def register_stats(
+        self,
+        subsystem: str,
+        stats: Callable[[], dict[str, Any]],
+        label: Optional[str] = None,
+        counters: Sequence[str] = (),
+    ) -> None:
+        """Export a component's `stats()` as metrics named `<namespace>_<subsystem>_<key>`.
+
+        Numeric values become gauges, or counters for the keys in
+        `counters`. With `label`, `stats()` returns one stats dict per
+        label value (e.g. per agent) instead.
+        """
+        self._stats.append((subsystem, stats, label, frozenset(counters)))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric._samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        for subsystem, stats, label, counters in self._stats:
+            lines.extend(self._render_stats(subsystem, stats(), label, counters))
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, cls: type[M], name: str, description: str, labelnames: Sequence[str], **kwargs: Any) -> M:
+        full_name = f"{self.namespace}_{name}" if self.namespace else name
+        metric = self._metrics.get(full_name)
+        if metric is None:
+            metric = self._metrics[full_name] = cls(full_name, description, labelnames, **kwargs)
+        elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {full_name} is already registered as a different {metric.kind}")
+        return metric
+
+    def _render_stats(
+        self, subsystem: str, stats: dict[str, Any], label: Optional[str], counters: frozenset
+    ) -> Iterator[str]:
+        series = stats.items() if label else [(None, stats)]
+        samples: dict[str, list[str]] = {}
+        for value_label, values in series:
+            labels = _format_labels((label,), (value_label,)) if label else ""
+            for key, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                samples.setdefault(key, []).append(f"{labels} {_format_value(value)}")
+        prefix = f"{self.namespace}_{subsystem}" if self.namespace else subsystem
+        for key, rendered in samples.items():
+            is_counter = key in counters
+            name = f"{prefix}_{key}_total" if is_counter else f"{prefix}_{key}"
+            yield f"# TYPE {name} {'counter' if is_counter else 'gauge'}"
+            for sample in rendered:
+                yield f"{name}{sample}"
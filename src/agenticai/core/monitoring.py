@@ -1,80 +1,157 @@
 import logging
 import time
-from typing import Any, Dict, Optional
+from collections import deque
+from typing import Any, Optional
 
 from ..config.settings import settings
+from .log_pipeline import LazyJSON
+from .metrics import MetricsRegistry
+from .tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
 
 class Monitoring:
-    """Simple monitoring system."""
+    """Simple monitoring system.
+
+    Besides log lines, executions, errors and latencies are recorded in
+    `metrics`, which the API serves at /metrics in the Prometheus format.
+    Traces are spans recorded by the process-wide tracer. Log lines are
+    built lazily and tagged with their agent, so the log pipeline can
+    sample them per agent and aggregate repeated errors.
+    """
+
+    # Timings kept per name for percentile summaries
+    TIMING_WINDOW = 1024
 
     def __init__(self):
         """Initialize the monitoring system."""
         self.enabled = settings.ENABLE_MONITORING
         self.client = None
+        self.timings: dict[str, deque[float]] = {}
+        self.tracer = get_tracer()
+        self._traces: dict[str, Any] = {}
+
+        self.metrics = MetricsRegistry()
+        self.executions = self.metrics.counter("agent_executions_total", "Completed agent tasks.", ("agent", "task"))
+        self.errors = self.metrics.counter(
+            "agent_errors_total", "Failed agent tasks by exception type.", ("agent", "task", "error")
+        )
+        self.task_latency = self.metrics.histogram(
+            "agent_task_duration_seconds", "Agent task latency.", ("agent", "task", "outcome")
+        )
+        self.timing_latency = self.metrics.histogram(
+            "timing_seconds", "Latency samples recorded with record_timing.", ("name",)
+        )
+        self.requests = self.metrics.counter(
+            "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+        )
+        self.request_latency = self.metrics.histogram(
+            "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")
+        )
 
         if self.enabled:
             logger.info("Monitoring enabled")
 
     def log_agent_execution(
-        self, agent_name: str, task: str, result: Any, metadata: Optional[Dict[str, Any]] = None
+        self,
+        agent_name: str,
+        task: str,
+        result: Any,
+        metadata: Optional[dict[str, Any]] = None,
+        duration: Optional[float] = None,
     ) -> None:
-        """Log an agent execution."""
+        """Log an agent execution, counting it and recording `duration` (seconds) if given."""
         if not self.enabled:
-            logger.debug(f"Monitoring disabled, not logging agent execution: {agent_name}")
+            logger.debug("Monitoring disabled, not logging agent execution: %s", agent_name)
             return
 
-        try:
-            # Convert result to string if it's not a primitive type
-            if isinstance(result, (dict, list)):
-                import json
+        self.executions.labels(agent_name, task).inc()
+        if duration is not None:
+            self.task_latency.labels(agent_name, task, "ok").observe(duration)
 
-                result_str = json.dumps(result)
-            else:
-                result_str = str(result)
-
-            # Prepare metadata
+        # Records carry the agent so the log pipeline can sample them per agent; the
+        # result is only serialized if a DEBUG line will actually be written
+        logger.info("Agent execution: %s - %s", agent_name, task, extra={"agent": agent_name, "task": task})
+        if logger.isEnabledFor(logging.DEBUG):
             meta = {"agent": agent_name, "task": task, "timestamp": time.time()}
             if metadata:
                 meta.update(metadata)
-
-            # Log to console in development
-            logger.info(f"Agent execution: {agent_name} - {task}")
-            logger.debug(f"Result: {result_str[:200]}...")
-            logger.debug(f"Metadata: {meta}")
-
-        except Exception as e:
-            logger.error(f"Failed to log agent execution: {e}")
+            extra = {"agent": agent_name, "task": task}
+            logger.debug("Result: %s", LazyJSON(result, limit=200), extra=extra)
+            logger.debug("Metadata: %s", meta, extra=extra)
 
     def log_error(
-        self, agent_name: str, task: str, error: Exception, metadata: Optional[Dict[str, Any]] = None
+        self,
+        agent_name: str,
+        task: str,
+        error: Exception,
+        metadata: Optional[dict[str, Any]] = None,
+        duration: Optional[float] = None,
     ) -> None:
-        """Log an error."""
+        """Log an error, counting it and recording `duration` (seconds) if given."""
         if not self.enabled:
-            logger.debug(f"Monitoring disabled, not logging error: {agent_name}")
+            logger.debug("Monitoring disabled, not logging error: %s", agent_name)
             return
 
-        try:
-            # Prepare metadata
-            meta = {"agent": agent_name, "task": task, "error_type": type(error).__name__, "timestamp": time.time()}
+        error_type = type(error).__name__
+        self.errors.labels(agent_name, task, error_type).inc()
+        if duration is not None:
+            self.task_latency.labels(agent_name, task, "error").observe(duration)
+
+        extra = {"agent": agent_name, "task": task, "error_type": error_type}
+        logger.error("Error in agent %s - %s: %s", agent_name, task, error, extra=extra)
+        if logger.isEnabledFor(logging.DEBUG):
+            meta = {"agent": agent_name, "task": task, "error_type": error_type, "timestamp": time.time()}
             if metadata:
                 meta.update(metadata)
-
-            # Log to console
-            logger.error(f"Error in agent {agent_name} - {task}: {error}")
-            logger.debug(f"Error metadata: {meta}")
-
-        except Exception as e:
-            logger.error(f"Failed to log error: {e}")
+            logger.debug("Error metadata: %s", meta, extra=extra)
+
+    def record_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        """Count an HTTP request and record its latency."""
+        self.requests.labels(method, route, status).inc()
+        self.request_latency.labels(method, route).observe(seconds)
+
+    def record_timing(self, name: str, seconds: float) -> None:
+        """Record a latency sample (e.g. time to first byte) under a name."""
+        samples = self.timings.get(name)
+        if samples is None:
+            samples = self.timings[name] = deque(maxlen=self.TIMING_WINDOW)
+        samples.append(seconds)
+        self.timing_latency.labels(name).observe(seconds)
+
+    def timing_stats(self) -> dict[str, dict[str, float]]:
+        """Summarize the recent samples of each timing in milliseconds."""
+        stats = {}
+        for name, samples in self.timings.items():
+            ordered = sorted(samples)
+            if not ordered:
+                continue
+            stats[name] = {
+                "count": len(ordered),
+                "p50_ms": ordered[len(ordered) // 2] * 1000,
+                "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+                "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        return stats
 
     def start_trace(self, trace_id: str, name: str) -> None:
-        """Start a trace for a sequence of agent operations."""
-        if self.enabled:
-            logger.info(f"Starting trace {trace_id}: {name}")
+        """Start a trace for a sequence of agent operations.
+
+        Opens a root span (or a child of the current span) that spans and
+        agent calls made until `end_trace` nest under.
+        """
+        if not self.enabled or not self.tracer.enabled:
+            return
+        logger.info(f"Starting trace {trace_id}: {name}")
+        self._traces[trace_id] = self.tracer.start_span(name, attributes={"trace.label": trace_id})
 
     def end_trace(self, trace_id: str) -> None:
         """End a trace for a sequence of agent operations."""
-        if self.enabled:
-            logger.info(f"Ending trace {trace_id}")
+        started = self._traces.pop(trace_id, None)
+        if started is None:
+            return
+        span, token = started
+        self.tracer.end_span(span, token)
+        logger.info(f"Ending trace {trace_id} after {span.duration_ms:.1f} ms")
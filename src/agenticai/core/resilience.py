@@ -0,0 +1,327 @@
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Hashable, Mapping
+from typing import Any, Callable, Optional
+
+from ..config.settings import settings
+from .cache import TTLCache
+from .tracing import CLIENT, Span, get_tracer
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamError(Exception):
+    """An upstream API call failed.
+
+    `retryable` is set for failures worth trying again (timeouts, dropped
+    connections, 429 and 5xx responses); other 4xx responses are final.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None, retryable: bool = True):
+        """Initialize the error."""
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+
+
+class CircuitOpenError(UpstreamError):
+    """The circuit breaker is open, so the call was not attempted."""
+
+    def __init__(self, name: str, retry_after: float):
+        """Initialize the error."""
+        super().__init__(f"Circuit for {name} is open; retry in {retry_after:.1f}s", retryable=False)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fails fast after consecutive upstream failures.
+
+    Closed: calls go through and failures are counted. After
+    `failure_threshold` consecutive failures the circuit opens and calls
+    are rejected for `reset_timeout` seconds. It is then half-open: one
+    probe call is let through, and its outcome closes or reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a closed breaker; unset options fall back to settings."""
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout if reset_timeout is not None else settings.CIRCUIT_RESET_TIMEOUT
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+        return self._state
+
+    def before_call(self) -> None:
+        """Raise `CircuitOpenError` unless a call may go through now."""
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        retry_after = max(0.0, self._opened_at + self.reset_timeout - self._clock())
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold or on a failed probe."""
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.opened += 1
+                logger.warning(f"Circuit for {self.name} opened after {self._failures} consecutive failures")
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+        self._probing = False
+
+    def release(self) -> None:
+        """Forget a call that ended without an outcome (e.g. it was cancelled)."""
+        self._probing = False
+
+    def stats(self) -> dict[str, Any]:
+        """Return the state and counters."""
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class RetryBudget:
+    """Caps retries (and hedges) at a fraction of requests.
+
+    Each request deposits `ratio` of a token and each retry spends one, on
+    top of a reserve of `reserve` tokens, so a failing upstream sees at
+    most about `1 + ratio` times its normal load instead of a multiple of it.
+    """
+
+    def __init__(self, ratio: Optional[float] = None, reserve: float = 10.0):
+        """Initialize a full budget."""
+        self.ratio = ratio if ratio is not None else settings.UPSTREAM_RETRY_BUDGET
+        self.reserve = reserve
+        self._balance = reserve
+
+        self.exhausted = 0
+
+    def record_request(self) -> None:
+        """Deposit a request's share of retries."""
+        self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget, if there is one left."""
+        if self._balance < 1:
+            self.exhausted += 1
+            return False
+        self._balance -= 1
+        return True
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: Optional[random.Random] = None) -> float:
+    """Exponential backoff with full jitter for the given retry (0 for the first)."""
+    uniform = rng.uniform if rng is not None else random.uniform
+    return uniform(0, min(cap, base * 2**attempt))
+
+
+class Upstream:
+    """Timeouts, retries, circuit breaking, hedging and stale fallback for one upstream API.
+
+    Each attempt gets its endpoint's timeout. Retryable failures are
+    retried with jittered exponential backoff while the retry budget
+    allows. With `hedge_after` set, an attempt still running after that
+    many seconds gets a duplicate request and the first success wins,
+    which trims the latency tail of idempotent reads. Successful results
+    are kept for `stale_ttl` seconds and served when the breaker is open
+    or retries run out, so callers get slightly old data instead of an
+    error while the upstream recovers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: Optional[float] = None,
+        timeouts: Optional[Mapping[str, float]] = None,
+        retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        hedge_after: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        budget: Optional[RetryBudget] = None,
+        stale_ttl: Optional[float] = None,
+        stale_maxsize: int = 1024,
+        rng: Optional[random.Random] = None,
+    ):
+        """Initialize the policy; unset options fall back to settings."""
+        self.name = name
+        self.timeout = timeout if timeout is not None else settings.UPSTREAM_TIMEOUT
+        self.timeouts = dict(timeouts or {})
+        self.retries = retries if retries is not None else settings.UPSTREAM_RETRIES
+        self.backoff_base = backoff_base if backoff_base is not None else settings.UPSTREAM_BACKOFF_BASE
+        self.backoff_max = backoff_max if backoff_max is not None else settings.UPSTREAM_BACKOFF_MAX
+        hedge_after = hedge_after if hedge_after is not None else settings.UPSTREAM_HEDGE_AFTER
+        self.hedge_after = hedge_after or None
+        self.breaker = breaker or CircuitBreaker(name)
+        self.budget = budget or RetryBudget()
+        self.stale = TTLCache(
+            ttl=stale_ttl if stale_ttl is not None else settings.UPSTREAM_STALE_TTL,
+            maxsize=stale_maxsize,
+            name=f"{name}.stale",
+        )
+        self._rng = rng or random.Random()  # noqa: S311 - backoff jitter, not security
+
+        self.calls = 0
+        self.failures = 0
+        self.retried = 0
+        self.timeouts_hit = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.stale_served = 0
+
+    def timeout_for(self, endpoint: str) -> float:
+        """The per-attempt timeout for an endpoint."""
+        return self.timeouts.get(endpoint, self.timeout)
+
+    async def call(
+        self, endpoint: str, fetch: Callable[[], Awaitable[Any]], stale_key: Optional[Hashable] = None
+    ) -> Any:
+        """Run `fetch` under the policy.
+
+        `stale_key` identifies the result for the stale fallback; without
+        one, failures are always raised.
+        """
+        self.calls += 1
+        self.budget.record_request()
+        attempt = 0
+        with get_tracer().span(f"{self.name}.{endpoint}", CLIENT) as span:
+            while True:
+                try:
+                    result = await self._hedged(endpoint, fetch)
+                except UpstreamError as e:
+                    retry = (
+                        e.retryable
+                        and not isinstance(e, CircuitOpenError)
+                        and attempt < self.retries
+                        and self.budget.try_spend()
+                    )
+                    if not retry:
+                        self.failures += 1
+                        if span is not None:
+                            span.set_attribute("upstream.attempts", attempt + 1)
+                        return self._fallback(endpoint, stale_key, e, span)
+                    await asyncio.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max, self._rng))
+                    attempt += 1
+                    self.retried += 1
+                    continue
+                if span is not None:
+                    span.set_attribute("upstream.attempts", attempt + 1)
+                if stale_key is not None:
+                    self.stale.set((endpoint, stale_key), result)
+                return result
+
+    def stats(self) -> dict[str, Any]:
+        """Return call, retry, hedge and fallback counters with the breaker state."""
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "failures": self.failures,
+            "retried": self.retried,
+            "timeouts": self.timeouts_hit,
+            "retry_budget_exhausted": self.budget.exhausted,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "stale_served": self.stale_served,
+            "breaker": self.breaker.stats(),
+        }
+
+    async def _hedged(self, endpoint: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """One attempt, plus a duplicate if it is still running after `hedge_after`."""
+        if self.hedge_after is None:
+            return await self._attempt(endpoint, fetch)
+
+        pending = {asyncio.ensure_future(self._attempt(endpoint, fetch))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_after)
+            if done:
+                return done.pop().result()
+            # Only hedge a healthy upstream, and only within the retry budget
+            if self.breaker.state != CircuitBreaker.CLOSED or not self.budget.try_spend():
+                return await next(iter(pending))
+
+            self.hedged += 1
+            hedge = asyncio.ensure_future(self._attempt(endpoint, fetch))
+            pending.add(hedge)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.hedge_wins += task is hedge
+                        return task.result()
+                if not pending:
+                    return done.pop().result()  # both attempts failed: raises the last error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _attempt(self, endpoint: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        self.breaker.before_call()
+        timeout = self.timeout_for(endpoint)
+        try:
+            result = await asyncio.wait_for(fetch(), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts_hit += 1
+            self.breaker.record_failure()
+            raise UpstreamError(f"{self.name} {endpoint} timed out after {timeout}s") from None
+        except UpstreamError as e:
+            if e.retryable:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()  # the upstream answered; the request was wrong
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _fallback(
+        self, endpoint: str, stale_key: Optional[Hashable], error: UpstreamError, span: Optional[Span]
+    ) -> Any:
+        if stale_key is not None and (error.retryable or isinstance(error, CircuitOpenError)):
+            value = self.stale.get((endpoint, stale_key))
+            if value is not None:
+                self.stale_served += 1
+                if span is not None:
+                    span.set_attribute("upstream.stale", True)
+                logger.debug(f"Serving stale {self.name} {endpoint} data for {stale_key!r}: {error}")
+                return value
+        raise error
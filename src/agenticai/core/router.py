@@ -0,0 +1,231 @@
+import json
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Inflections a keyword may carry; anything longer is a different word ("wind" is not "window")
+_KEYWORD_SUFFIXES = r"(?:s|es|d|ed|ing|y)?"
+
+
+@dataclass
+class Intent:
+    """An intent (usually an agent key) and the keywords that signal it."""
+
+    name: str
+    keywords: Sequence[str]
+    weight: float = 1.0
+
+
+@dataclass
+class RouteDecision:
+    """Where a message was routed and why."""
+
+    intent: str
+    method: str  # "keyword", "classifier" or "default"
+    score: float = 0.0
+    scores: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"intent": self.intent, "method": self.method, "score": self.score, "scores": self.scores}
+
+
+def _features(text: str) -> list[str]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class TfidfClassifier:
+    """Small TF-IDF nearest-centroid text classifier (a linear model) in NumPy.
+
+    Unigrams and bigrams are weighted by TF-IDF and L2-normalised; each
+    class is represented by the normalised mean of its training vectors, and
+    a message is scored against every class with one dot product.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an untrained classifier."""
+        self.vocabulary: dict[str, int] = {}
+        self.idf: Optional[np.ndarray] = None
+        self.labels: list[str] = []
+        self.weights: Optional[np.ndarray] = None  # (classes, vocabulary)
+
+    @property
+    def trained(self) -> bool:
+        return self.weights is not None
+
+    def fit(self, texts: Sequence[str], labels: Sequence[str]) -> "TfidfClassifier":
+        """Train on labelled examples."""
+        import numpy as np  # deferred: routing only needs NumPy once a classifier is trained
+
+        documents = [_features(text) for text in texts]
+        for features in documents:
+            for feature in features:
+                self.vocabulary.setdefault(feature, len(self.vocabulary))
+
+        df = np.zeros(len(self.vocabulary))
+        for features in documents:
+            df[[self.vocabulary[f] for f in set(features)]] += 1
+        idf = self.idf = np.log((1 + len(documents)) / (1 + df)) + 1
+
+        self.labels = sorted(set(labels))
+        label_index = {label: i for i, label in enumerate(self.labels)}
+        centroids = np.zeros((len(self.labels), len(self.vocabulary)))
+        for features, label in zip(documents, labels):
+            centroids[label_index[label]] += self._vectorize(features, idf)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        self.weights = centroids / np.maximum(norms, 1e-12)
+        return self
+
+    def scores(self, text: str) -> dict[str, float]:
+        """Cosine similarity of a message to each class."""
+        idf, weights = self.idf, self.weights
+        if idf is None or weights is None:
+            return {}
+        features = [f for f in _features(text) if f in self.vocabulary]
+        if not features:
+            return dict.fromkeys(self.labels, 0.0)
+        import numpy as np
+
+        indices, counts = np.unique([self.vocabulary[f] for f in features], return_counts=True)
+        values = counts * idf[indices]
+        values /= np.linalg.norm(values)
+        return dict(zip(self.labels, (weights[:, indices] @ values).tolist()))
+
+    def _vectorize(self, features: list[str], idf: "np.ndarray") -> "np.ndarray":
+        import numpy as np
+
+        vector = np.zeros(len(self.vocabulary))
+        for feature in features:
+            vector[self.vocabulary[feature]] += 1
+        vector *= idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @classmethod
+    def from_jsonl(cls, path: str) -> "TfidfClassifier":
+        """Train from a JSON Lines file of {"text": ..., "intent": ...} examples."""
+        texts, labels = [], []
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    example = json.loads(line)
+                    texts.append(example["text"])
+                    labels.append(example["intent"])
+        return cls().fit(texts, labels)
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation factored into a prefix trie.
+
+    `re` tries the alternatives of a flat alternation one by one at every
+    position; sharing prefixes means each character is examined once per
+    trie level instead. Optional suffixes are greedy, so the longest
+    keyword at a position wins.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+
+class IntentRouter:
+    """Route a message to an intent by keyword score, then classifier, then default.
+
+    All registered keywords are compiled into one regex alternation, so a
+    message is scanned once however many intents there are. Keywords match
+    whole words and their common inflections ("delay" matches "delays" and
+    "delayed", "wind" does not match "window"); longer phrases win over
+    their prefixes. Each match adds the intent's weight,
+    and ties go to the intent registered first. Messages without keyword
+    matches fall back to the classifier when it is confident enough.
+    """
+
+    def __init__(
+        self,
+        default: str,
+        classifier: Optional[TfidfClassifier] = None,
+        min_classifier_score: float = 0.2,
+    ):
+        """Initialize the router with the intent used when nothing matches."""
+        self.default = default
+        self.classifier = classifier
+        self.min_classifier_score = min_classifier_score
+        self._intents: list[Intent] = []
+        self._keyword_intents: dict[str, list[Intent]] = {}
+        self._pattern: Optional[re.Pattern] = None
+        self._order: dict[str, int] = {}
+
+    @property
+    def intents(self) -> list[str]:
+        return [intent.name for intent in self._intents]
+
+    def unknown_labels(self) -> list[str]:
+        """Classifier labels that are neither a registered intent nor the default."""
+        if self.classifier is None:
+            return []
+        known = {*self.intents, self.default}
+        return [label for label in self.classifier.labels if label not in known]
+
+    def register(self, name: str, keywords: Iterable[str], weight: float = 1.0) -> None:
+        """Add an intent; registration order breaks score ties."""
+        intent = Intent(name, [k.lower().strip() for k in keywords if k.strip()], weight)
+        self._intents.append(intent)
+        for keyword in intent.keywords:
+            self._keyword_intents.setdefault(keyword, []).append(intent)
+        self._pattern = None
+
+    def route(self, message: str) -> RouteDecision:
+        """Pick the intent for a message."""
+        scores = self.keyword_scores(message)
+        if scores:
+            best = max(scores, key=lambda name: (scores[name], -self._order[name]))
+            return RouteDecision(best, "keyword", scores[best], scores)
+
+        if self.classifier is not None and self.classifier.trained:
+            # Labels from the training data that name no registered intent can't be routed to
+            class_scores = {
+                label: score
+                for label, score in self.classifier.scores(message).items()
+                if label in self._order or label == self.default
+            }
+            if class_scores:
+                best = max(class_scores, key=class_scores.__getitem__)
+                if class_scores[best] >= self.min_classifier_score:
+                    return RouteDecision(best, "classifier", class_scores[best], class_scores)
+
+        return RouteDecision(self.default, "default")
+
+    def keyword_scores(self, message: str) -> dict[str, float]:
+        """Score every intent in one pass over the message."""
+        pattern = self._pattern or self._compile()
+        scores: dict[str, float] = {}
+        for match in pattern.finditer(message.lower()):
+            for intent in self._keyword_intents[match.group(1)]:
+                scores[intent.name] = scores.get(intent.name, 0.0) + intent.weight
+        return scores
+
+    def _compile(self) -> re.Pattern:
+        alternation = _trie_pattern(self._keyword_intents) or r"(?!x)x"
+        self._pattern = re.compile(rf"\b({alternation}){_KEYWORD_SUFFIXES}\b")
+        self._order = {}
+        for i, intent in enumerate(self._intents):
+            self._order.setdefault(intent.name, i)
+        return self._pattern
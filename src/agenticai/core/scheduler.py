@@ -0,0 +1,389 @@
+import asyncio
+import heapq
+import logging
+import random
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from ..config.settings import settings
+from .events import EventBus
+from .monitoring import Monitoring
+
+logger = logging.getLogger(__name__)
+
+# Looks up a batch of unique flights; returns one result (or exception) per flight, in order
+CheckFunction = Callable[[list[dict[str, Any]]], Awaitable[list[Any]]]
+UpdateCallback = Callable[["FlightMonitor", dict[str, Any]], Awaitable[None]]
+FlightKey = tuple[str, str]
+
+
+def parse_departure(value: Optional[str]) -> Optional[float]:
+    """Parse an ISO 8601 departure time into epoch seconds, or None if it can't be parsed."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def flight_key(flight_info: dict[str, Any]) -> FlightKey:
+    """Trips whose flights share this key share one upstream lookup."""
+    return (
+        str(flight_info.get("flight_number", "")).upper(),
+        str(flight_info.get("scheduled_departure", "")),
+    )
+
+
+@dataclass
+class FlightMonitor:
+    """State of one monitored trip."""
+
+    trip_id: str
+    flight_info: dict[str, Any]
+    state: str = "active"  # active, paused, completed or cancelled
+    checks: int = 0
+    last_checked: Optional[float] = None
+    last_status: Optional[str] = None
+    flight: Optional["ScheduledFlight"] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the monitor to a JSON-friendly dictionary."""
+        return {
+            "trip_id": self.trip_id,
+            "flight_number": self.flight_info.get("flight_number"),
+            "state": self.state,
+            "interval_seconds": self.flight.interval if self.flight else None,
+            "next_check": self.flight.next_check if self.flight else None,
+            "checks": self.checks,
+            "last_checked": self.last_checked,
+            "last_status": self.last_status,
+        }
+
+
+@dataclass
+class ScheduledFlight:
+    """A flight with at least one monitor; the unit the scheduler polls."""
+
+    key: FlightKey
+    flight_info: dict[str, Any]
+    departure: Optional[float] = None
+    trip_ids: set[str] = field(default_factory=set)
+    next_check: float = 0.0
+    interval: float = 0.0
+    queued: bool = False
+
+
+class MonitorScheduler:
+    """Periodic flight monitoring for many trips on one event loop.
+
+    Trips are grouped by flight and each flight has one entry in a heap
+    keyed by its next check time, so every trip on a flight shares one
+    upstream lookup. A single ticker pops the due flights and hands them in
+    batches to a fixed pool of workers through a bounded queue. When the
+    workers fall behind, the queue fills up and the ticker waits instead of
+    piling up coroutines (backpressure); checks then run late, which shows
+    up as schedule lag in `stats()`.
+
+    Poll intervals shrink as departure approaches and get some jitter so
+    flights registered together do not stay in lockstep. Monitors complete
+    once their flight departed more than the grace period ago. Monitor state
+    changes are published on the event bus under the trip id.
+    """
+
+    # (seconds until departure at least, poll interval), checked in order
+    INTERVAL_TIERS = (
+        (24 * 3600, 1800.0),
+        (6 * 3600, 600.0),
+        (2 * 3600, 300.0),
+        (0, 60.0),
+    )
+    # Poll interval after departure (while delays may still change) and without a known departure
+    DEPARTED_INTERVAL = 120.0
+    DEFAULT_INTERVAL = 300.0
+    JITTER = 0.1
+
+    def __init__(
+        self,
+        check: CheckFunction,
+        on_update: Optional[UpdateCallback] = None,
+        monitoring: Optional[Monitoring] = None,
+        bus: Optional[EventBus] = None,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        tick: Optional[float] = None,
+        completion_grace: Optional[float] = None,
+        interval_function: Optional[Callable[[ScheduledFlight, float], float]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the scheduler; unset options fall back to settings."""
+        self.check = check
+        self.on_update = on_update
+        self.monitoring = monitoring
+        self.bus = bus
+        self.workers = workers or settings.MONITOR_WORKERS
+        self.queue_size = queue_size or settings.MONITOR_QUEUE_SIZE
+        self.batch_size = batch_size or settings.MONITOR_BATCH_SIZE
+        self.tick = tick or settings.MONITOR_TICK_SECONDS
+        self.completion_grace = completion_grace if completion_grace is not None else settings.MONITOR_COMPLETION_GRACE
+        self.interval_function = interval_function or self.default_interval
+        self.clock = clock
+
+        self._monitors: dict[str, FlightMonitor] = {}
+        self._flights: dict[FlightKey, ScheduledFlight] = {}
+        self._heap: list[tuple[float, int, FlightKey]] = []
+        self._seq = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: list[asyncio.Task] = []
+
+        self.checks = 0
+        self.lookups = 0
+        self.batches = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start the ticker and worker tasks on the running loop."""
+        if self.running:
+            return
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        wakeup = asyncio.Event()
+        self._queue, self._wakeup = queue, wakeup
+        self._tasks = [asyncio.ensure_future(self._ticker(queue, wakeup))]
+        self._tasks += [asyncio.ensure_future(self._worker(queue)) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the ticker and workers; monitors stay registered."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def add(self, trip_id: str, flight_info: dict[str, Any]) -> FlightMonitor:
+        """Start monitoring a trip; its flight is checked right away."""
+        self._remove(trip_id, "cancelled")
+        key = flight_key(flight_info)
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = ScheduledFlight(
+                key=key, flight_info=flight_info, departure=parse_departure(flight_info.get("scheduled_departure"))
+            )
+        flight.trip_ids.add(trip_id)
+
+        monitor = self._monitors[trip_id] = FlightMonitor(trip_id=trip_id, flight_info=flight_info, flight=flight)
+        if not flight.queued:
+            self._schedule(flight, self.clock())
+        self._publish_state(monitor)
+        return monitor
+
+    def get(self, trip_id: str) -> Optional[FlightMonitor]:
+        """Return the monitor for a trip, if it is active or paused."""
+        return self._monitors.get(trip_id)
+
+    def list_monitors(self) -> list[FlightMonitor]:
+        """Return all active and paused monitors."""
+        return list(self._monitors.values())
+
+    def pause(self, trip_id: str) -> Optional[FlightMonitor]:
+        """Stop recording checks for a trip until it is resumed."""
+        monitor = self._monitors.get(trip_id)
+        if monitor is not None and monitor.state != "paused":
+            monitor.state = "paused"
+            self._publish_state(monitor)
+        return monitor
+
+    def resume(self, trip_id: str) -> Optional[FlightMonitor]:
+        """Resume a paused monitor; its flight is checked right away."""
+        monitor = self._monitors.get(trip_id)
+        if monitor is not None and monitor.state == "paused":
+            monitor.state = "active"
+            if monitor.flight is not None and not monitor.flight.queued:
+                self._schedule(monitor.flight, self.clock())
+            self._publish_state(monitor)
+        return monitor
+
+    def cancel(self, trip_id: str) -> Optional[FlightMonitor]:
+        """Stop monitoring a trip for good."""
+        return self._remove(trip_id, "cancelled")
+
+    def default_interval(self, flight: ScheduledFlight, now: float) -> float:
+        """Poll more often as departure approaches."""
+        if flight.departure is None:
+            return self.DEFAULT_INTERVAL
+        remaining = flight.departure - now
+        if remaining < 0:
+            return self.DEPARTED_INTERVAL
+        for threshold, interval in self.INTERVAL_TIERS:
+            if remaining >= threshold:
+                # Never sleep past departure itself
+                return min(interval, max(remaining, self.INTERVAL_TIERS[-1][1]))
+        return self.INTERVAL_TIERS[-1][1]
+
+    def stats(self) -> dict[str, Any]:
+        """Return scheduling counters."""
+        active = sum(1 for m in self._monitors.values() if m.state == "active")
+        return {
+            "monitors": len(self._monitors),
+            "active": active,
+            "paused": len(self._monitors) - active,
+            "flights": len(self._flights),
+            "queued_batches": self._queue.qsize() if self._queue else 0,
+            "in_flight": self.in_flight,
+            "checks": self.checks,
+            "lookups": self.lookups,
+            "batches": self.batches,
+            "errors": self.errors,
+            "avg_lag_seconds": self.lag_total / self.lookups if self.lookups else 0.0,
+            "max_lag_seconds": self.lag_max,
+        }
+
+    def _remove(self, trip_id: str, state: str) -> Optional[FlightMonitor]:
+        monitor = self._monitors.pop(trip_id, None)
+        if monitor is None:
+            return None
+        monitor.state = state
+        flight = monitor.flight
+        if flight is not None:
+            flight.trip_ids.discard(trip_id)
+            if not flight.trip_ids and self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]  # its heap entry is now stale
+        self._publish_state(monitor)
+        return monitor
+
+    def _publish_state(self, monitor: FlightMonitor) -> None:
+        if self.bus is not None:
+            self.bus.publish(
+                monitor.trip_id, {"type": "monitor", "trip_id": monitor.trip_id, "data": monitor.to_dict()}
+            )
+
+    def _schedule(self, flight: ScheduledFlight, due: float) -> None:
+        flight.next_check = due
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, flight.key))
+        if self._wakeup is not None and self._heap[0][1] == self._seq:
+            self._wakeup.set()  # new earliest check; wake the ticker
+
+    def _pop_due(self, now: float) -> list[ScheduledFlight]:
+        """Pop up to `batch_size` due flights, skipping stale heap entries."""
+        due: list[ScheduledFlight] = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+            when, _, key = heapq.heappop(self._heap)
+            flight = self._flights.get(key)
+            # No monitors left, rescheduled since, or already being checked
+            if flight is None or flight.next_check != when or flight.queued:
+                continue
+            if not any(self._monitors[trip_id].state == "active" for trip_id in flight.trip_ids):
+                continue  # every monitor is paused; resume() schedules it again
+            flight.queued = True
+            lag = now - when
+            self.lag_total += lag
+            self.lag_max = max(self.lag_max, lag)
+            due.append(flight)
+        return due
+
+    async def _ticker(self, queue: asyncio.Queue, wakeup: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            now = self.clock()
+            due = self._pop_due(now)
+            if due:
+                # Blocks while the workers are saturated
+                await queue.put(due)
+                continue
+
+            timeout = self.tick
+            if self._heap:
+                timeout = min(timeout, max(self._heap[0][0] - now, 0.0))
+            wakeup.clear()
+            # A timer rather than wait_for(): wait_for can swallow a cancellation that
+            # lands as the timeout fires, which left stop() waiting on the ticker forever
+            timer = loop.call_later(timeout, wakeup.set)
+            try:
+                await wakeup.wait()
+            finally:
+                timer.cancel()
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            flights = await queue.get()
+            try:
+                await self._run_batch(flights)
+            except Exception:
+                logger.exception("Monitor batch failed")
+            finally:
+                queue.task_done()
+
+    async def _run_batch(self, flights: list[ScheduledFlight]) -> None:
+        self.batches += 1
+        self.lookups += len(flights)
+        self.in_flight += len(flights)
+        try:
+            results = await self.check([flight.flight_info for flight in flights])
+        except Exception as e:
+            results = [e] * len(flights)
+        finally:
+            self.in_flight -= len(flights)
+
+        now = self.clock()
+        for flight, result in zip(flights, results):
+            flight.queued = False
+            departed = flight.departure is not None and now >= flight.departure + self.completion_grace
+            for trip_id in list(flight.trip_ids):
+                monitor = self._monitors.get(trip_id)
+                if monitor is not None and monitor.state == "active":
+                    await self._record(monitor, result, now, departed)
+
+            if self._flights.get(flight.key) is not flight:
+                continue  # every monitor was cancelled meanwhile
+            if departed:
+                for trip_id in list(flight.trip_ids):
+                    self._remove(trip_id, "completed")  # paused monitors go too
+            else:
+                flight.interval = self.interval_function(flight, now)
+                jitter = random.uniform(1 - self.JITTER, 1 + self.JITTER)  # noqa: S311 - spreads polls, not security
+                self._schedule(flight, now + flight.interval * jitter)
+
+    async def _record(self, monitor: FlightMonitor, result: Any, now: float, departed: bool) -> None:
+        """Publish a check result for one trip."""
+        self.checks += 1
+        monitor.checks += 1
+        monitor.last_checked = now
+
+        if isinstance(result, Exception):
+            self.errors += 1
+            if self.monitoring is not None:
+                self.monitoring.log_error(
+                    agent_name="FlightMonitor",
+                    task="monitor_flight",
+                    error=result,
+                    metadata={"trip_id": monitor.trip_id},
+                )
+            status = {"status": "ERROR", "message": str(result)}
+        else:
+            status = {"status": "MONITORING", "data": result}
+        monitor.last_status = status["status"]
+        await self._publish(monitor, status)
+
+        if departed:
+            monitor.last_status = "COMPLETED"
+            await self._publish(monitor, {"status": "COMPLETED", "message": "Flight monitoring completed"})
+
+    async def _publish(self, monitor: FlightMonitor, status: dict[str, Any]) -> None:
+        if self.on_update is None:
+            return
+        status.setdefault("timestamp", datetime.now().isoformat())
+        try:
+            await self.on_update(monitor, status)
+        except Exception:
+            logger.exception(f"Failed to record update for monitor {monitor.trip_id}")
@@ -0,0 +1,51 @@
+import asyncio
+from collections.abc import Awaitable, Hashable
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight coroutine.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task and get the same result (or exception).
+    The task is shielded, so a caller that is cancelled (e.g. a disconnected
+    client) does not cancel the work for everybody else.
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        """Initialize the group."""
+        self.name = name
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+        self.executions = 0
+        self.deduplicated = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for `key` is currently running."""
+        return key in self._inflight
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run `factory()` for `key`, or join the call already in flight."""
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.deduplicated += 1
+        result: T = await asyncio.shield(task)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Return execution and deduplication counters."""
+        callers = self.executions + self.deduplicated
+        return {
+            "name": self.name,
+            "in_flight": len(self._inflight),
+            "executions": self.executions,
+            "deduplicated": self.deduplicated,
+            "dedup_ratio": self.deduplicated / callers if callers else 0.0,
+        }
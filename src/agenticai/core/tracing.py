@@ -0,0 +1,360 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Callable, Optional, TypeVar, cast
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+SERVICE_NAME = "agenticai"
+
+# OTLP span kinds
+INTERNAL = 1
+SERVER = 2
+CLIENT = 3
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation in a trace.
+
+    `root` marks the first span of a trace in this process, including one
+    continuing a caller's trace from a `traceparent` header.
+    """
+
+    __slots__ = (
+        "attributes",
+        "end_ns",
+        "error",
+        "kind",
+        "name",
+        "parent_id",
+        "root",
+        "span_id",
+        "start_ns",
+        "trace_id",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        kind: int = INTERNAL,
+        attributes: Optional[dict[str, Any]] = None,
+        root: bool = False,
+    ):
+        """Start the span now."""
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+        self.root = root
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_otlp(self) -> dict[str, Any]:
+        """The span as an OTLP/JSON `Span` message."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple[str, str]]:
+    """(trace id, parent span id) from a W3C `traceparent` header, if it is valid."""
+    parts = (header or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2]
+
+
+def current_span() -> Optional[Span]:
+    """The span active in the current context, if any."""
+    return _current_span.get()
+
+
+class Tracer:
+    """Records spans nested through `contextvars` into a bounded ring buffer.
+
+    The current span follows the context across `await`, into tasks
+    created while it is active, and into threads started with
+    `asyncio.to_thread` or a copied context. Finished spans stay in a
+    buffer of the last `capacity` spans for `/debug/traces`; with an
+    exporter attached they are also batched out as OTLP/JSON.
+    """
+
+    def __init__(self, capacity: Optional[int] = None, enabled: Optional[bool] = None):
+        """Initialize the tracer; unset options fall back to settings."""
+        self.enabled = settings.TRACE_ENABLED if enabled is None else enabled
+        self.capacity = capacity or settings.TRACE_BUFFER_SIZE
+        self.spans: deque[Span] = deque(maxlen=self.capacity)
+        self._pending: Optional[deque[Span]] = None
+        self._exporter: Optional[Callable[[dict[str, Any]], Any]] = None
+        self._export_task: Optional[asyncio.Task] = None
+
+        self.finished = 0
+        self.exported = 0
+        self.dropped = 0
+
+    def start_span(
+        self,
+        name: str,
+        kind: int = INTERNAL,
+        attributes: Optional[dict[str, Any]] = None,
+        traceparent: Optional[str] = None,
+    ) -> tuple[Span, contextvars.Token]:
+        """Start a span as a child of the current one and make it current.
+
+        Pass the returned token to `end_span`. A valid `traceparent`
+        continues the caller's trace instead of the current span's.
+        """
+        remote = parse_traceparent(traceparent) if traceparent else None
+        parent = _current_span.get()
+        if remote is not None:
+            span = Span(name, remote[0], remote[1], kind, attributes, root=True)
+        elif parent is not None:
+            span = Span(name, parent.trace_id, parent.span_id, kind, attributes)
+        else:
+            span = Span(name, f"{random.getrandbits(128):032x}", None, kind, attributes, root=True)
+        return span, _current_span.set(span)
+
+    def end_span(self, span: Span, token: Optional[contextvars.Token] = None) -> None:
+        """Finish a span, restoring the span that was current before it."""
+        span.end_ns = time.time_ns()
+        if token is not None:
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                _current_span.set(None)  # ended from a different context than it started in
+        self.spans.append(span)
+        self.finished += 1
+        if self._pending is not None:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append(span)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: int = INTERNAL,
+        attributes: Optional[dict[str, Any]] = None,
+        traceparent: Optional[str] = None,
+    ) -> Iterator[Optional[Span]]:
+        """Trace the enclosed block; yields None when tracing is disabled."""
+        if not self.enabled:
+            yield None
+            return
+        span, token = self.start_span(name, kind, attributes, traceparent)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            self.end_span(span, token)
+
+    def traces(self) -> dict[str, list[Span]]:
+        """Buffered spans grouped by trace, in start order."""
+        grouped: dict[str, list[Span]] = {}
+        for span in list(self.spans):
+            grouped.setdefault(span.trace_id, []).append(span)
+        for spans in grouped.values():
+            spans.sort(key=lambda s: s.start_ns)
+        return grouped
+
+    def slowest(self, limit: int = 10, name_prefix: str = "") -> list[list[Span]]:
+        """The slowest recent traces (by their root span), each as its list of spans."""
+        rooted = []
+        for spans in self.traces().values():
+            root = next((s for s in spans if s.root), None)
+            if root is not None and root.name.startswith(name_prefix):
+                rooted.append((root.duration_ms, spans))
+        rooted.sort(key=lambda item: item[0], reverse=True)
+        return [spans for _, spans in rooted[:limit]]
+
+    @staticmethod
+    def to_otlp(spans: list[Span]) -> dict[str, Any]:
+        """Wrap spans in an OTLP/JSON `ExportTraceServiceRequest`."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": SERVICE_NAME}},
+                            {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+                        ]
+                    },
+                    "scopeSpans": [{"scope": {"name": "agenticai.tracing"}, "spans": [s.to_otlp() for s in spans]}],
+                }
+            ]
+        }
+
+    def start_export(self, exporter: Callable[[dict[str, Any]], Any], interval: Optional[float] = None) -> None:
+        """Send finished spans to `exporter` (an async callable taking an OTLP request) in batches."""
+        self._exporter = exporter
+        self._pending = deque(maxlen=self.capacity)
+        self._export_task = asyncio.ensure_future(
+            self._export_loop(interval if interval is not None else settings.TRACE_EXPORT_INTERVAL)
+        )
+
+    async def stop_export(self) -> None:
+        """Stop the export loop after sending the spans still pending."""
+        if self._export_task is not None:
+            self._export_task.cancel()
+            await asyncio.gather(self._export_task, return_exceptions=True)
+            self._export_task = None
+        await self.flush()
+        self._pending = None
+
+    async def flush(self) -> None:
+        """Export the spans finished since the last export."""
+        if not self._pending or self._exporter is None:
+            return
+        batch = list(self._pending)
+        self._pending.clear()
+        try:
+            await self._exporter(self.to_otlp(batch))
+            self.exported += len(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.warning(f"Trace export failed, dropped {len(batch)} spans: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Return span counters."""
+        return {
+            "enabled": self.enabled,
+            "buffered": len(self.spans),
+            "capacity": self.capacity,
+            "finished": self.finished,
+            "exported": self.exported,
+            "dropped": self.dropped,
+        }
+
+    async def _export_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+
+class FileSpanExporter:
+    """Appends each batch as one line of OTLP/JSON, like the collector's file exporter."""
+
+    def __init__(self, path: str):
+        """Initialize the exporter; the file is created on first export."""
+        self.path = path
+
+    async def __call__(self, request: dict[str, Any]) -> None:
+        line = json.dumps(request, separators=(",", ":")) + "\n"
+        await asyncio.to_thread(self._append, line)
+
+    def _append(self, line: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class HTTPSpanExporter:
+    """POSTs each batch as OTLP/JSON to a collector's `/v1/traces` endpoint."""
+
+    def __init__(self, url: str, pool: Any = None):
+        """Initialize the exporter; `pool` defaults to the shared HTTP connection pool."""
+        self.url = url
+        self.pool = pool
+
+    async def __call__(self, request: dict[str, Any]) -> None:
+        from ..resources.http import get_http_pool
+
+        session = (self.pool or get_http_pool()).session()
+        async with session.post(self.url, json=request) as response:
+            if response.status >= 300:
+                raise RuntimeError(f"collector answered {response.status}: {await response.text()}")
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def traced(name: Optional[str] = None, kind: int = INTERNAL) -> Callable[[F], F]:
+    """Trace every call of a function (sync or async) as a span named after it."""
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with get_tracer().span(span_name, kind):
+                    return await func(*args, **kwargs)
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with get_tracer().span(span_name, kind):
+                return func(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
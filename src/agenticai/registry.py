@@ -0,0 +1,298 @@
+import asyncio
+import functools
+import logging
+import time
+from collections.abc import Awaitable
+from typing import Any, Callable, Optional, Union
+
+from .agents import (
+    AlternativeRouteSuggesterAgent,
+    BaseAgent,
+    FlightDelayScannerAgent,
+    ReservationAdjusterAgent,
+    StakeholderNotifierAgent,
+    TravelOrganizerAgent,
+    WeatherCheckerAgent,
+)
+from .config.settings import settings
+from .core import (
+    DiskCache,
+    EventBus,
+    FileSpanExporter,
+    FlightDelayCrew,
+    FlightMonitor,
+    Governor,
+    HTTPSpanExporter,
+    IntentRouter,
+    LogPipeline,
+    Monitoring,
+    MonitorScheduler,
+    TfidfClassifier,
+    get_tracer,
+)
+from .resources import AsyncFileSystem, FileSystem, Memory, SemanticCache, SQLiteMemory, close_http_pool
+
+logger = logging.getLogger(__name__)
+
+
+@functools.cache
+def _load_intent_classifier(path: str) -> TfidfClassifier:
+    """Train the intent classifier once per process (or once before workers fork)."""
+    return TfidfClassifier.from_jsonl(path)
+
+
+class AgentRegistry:
+    """Process-lifetime container for agents, shared resources and the crew.
+
+    Everything is built once in `startup()` and reused by every request. The
+    agents hold no per-request state and the resources are only touched from
+    the event loop, so a single instance can be shared across concurrent
+    requests on a worker.
+    """
+
+    def __init__(
+        self,
+        memory: Optional[Union[Memory, SQLiteMemory]] = None,
+        file_system: Optional[Union[FileSystem, AsyncFileSystem]] = None,
+        monitoring: Optional[Monitoring] = None,
+    ):
+        """Initialize the registry, optionally with pre-built resources."""
+        self._memory = memory
+        self._file_system = file_system
+        self._monitoring = monitoring
+
+        self.agents: dict[str, BaseAgent] = {}
+        self.resources: dict[str, Any] = {}
+        self.crew: Optional[FlightDelayCrew] = None
+        self.scheduler: Optional[MonitorScheduler] = None
+        self.router: Optional[IntentRouter] = None
+        self.warmup_seconds: Optional[float] = None
+        self.log_pipeline: Optional[LogPipeline] = None
+        self._shutdown_callbacks: list[Callable[[], Awaitable[None]]] = []
+
+    @staticmethod
+    def preload() -> None:
+        """Load read-only reference data ahead of `startup()`.
+
+        The server launcher calls this before forking workers, so they
+        share the data copy-on-write instead of each loading its own.
+        """
+        if settings.INTENT_TRAINING_DATA:
+            _load_intent_classifier(settings.INTENT_TRAINING_DATA)
+
+    @property
+    def started(self) -> bool:
+        """Whether `startup()` has completed."""
+        return self.crew is not None
+
+    async def startup(self) -> None:
+        """Build resources, agents and the crew, recording the warm-up time."""
+        if self.started:
+            return
+
+        start = time.perf_counter()
+
+        # Registered first so it stops last, after everything that logs on the way down
+        if settings.LOG_ASYNC:
+            log_pipeline = LogPipeline()
+            log_pipeline.install()
+            self.log_pipeline = log_pipeline
+            self.add_shutdown_callback(lambda: asyncio.to_thread(log_pipeline.uninstall))
+
+        event_bus = EventBus()
+        self.resources = {
+            "memory": self._memory or self._build_memory(),
+            "file_system": self._build_file_system(event_bus),
+            "monitoring": self._monitoring or Monitoring(),
+            "event_bus": event_bus,
+        }
+
+        self.agents = {
+            "weather_checker": WeatherCheckerAgent(),
+            "flight_delay_scanner": FlightDelayScannerAgent(),
+            "reservation_adjuster": ReservationAdjusterAgent(),
+            "stakeholder_notifier": StakeholderNotifierAgent(),
+            "alternative_route_suggester": AlternativeRouteSuggesterAgent(),
+            "travel_organizer": TravelOrganizerAgent(),
+        }
+
+        self.crew = FlightDelayCrew(list(self.agents.values()))
+        self.router = self._build_router()
+
+        self.resources["governor"] = self._build_governor()
+
+        if settings.SEMANTIC_CACHE_ENABLED:
+            prompt_cache = SemanticCache()
+            self.resources["prompt_cache"] = prompt_cache
+            for agent in self.agents.values():
+                agent.prompt_cache = prompt_cache
+
+        if settings.AGENT_CACHE_DISK_PATH:
+            agent_cache = DiskCache(settings.AGENT_CACHE_DISK_PATH)
+            for agent in self.agents.values():
+                agent.memo.store = agent_cache
+            self.add_shutdown_callback(lambda: asyncio.to_thread(agent_cache.close))
+
+        memory = self.resources["memory"]
+        if isinstance(memory, SQLiteMemory):
+            self.add_shutdown_callback(memory.aclose)
+        else:
+            memory.start_compaction()
+            self.add_shutdown_callback(memory.stop_compaction)
+
+        self.add_shutdown_callback(self.resources["file_system"].aclose)
+
+        # API wrappers share one process-wide connection pool; release it on exit
+        self.add_shutdown_callback(close_http_pool)
+
+        # Stops before the pool closes, so the last spans can still be sent
+        span_exporter = self._build_span_exporter()
+        if span_exporter is not None:
+            tracer = self.resources["monitoring"].tracer
+            tracer.start_export(span_exporter)
+            self.add_shutdown_callback(tracer.stop_export)
+
+        # Registered last so it stops first, before the file system it writes to closes
+        scheduler = MonitorScheduler(
+            check=self._check_flights,
+            on_update=self._record_monitor_update,
+            monitoring=self.resources["monitoring"],
+            bus=event_bus,
+        )
+        scheduler.start()
+        self.add_shutdown_callback(scheduler.stop)
+        self.scheduler = scheduler
+
+        self._register_metrics(scheduler)
+
+        self.warmup_seconds = time.perf_counter() - start
+        logger.info(
+            f"Registry warm-up complete: {len(self.agents)} agents, "
+            f"{len(self.resources)} resources in {self.warmup_seconds * 1000:.2f} ms"
+        )
+
+    @staticmethod
+    def _build_memory() -> Union[Memory, SQLiteMemory]:
+        """Create the memory backend selected by MEMORY_BACKEND."""
+        if settings.MEMORY_BACKEND == "sqlite":
+            return SQLiteMemory()
+        return Memory()
+
+    @staticmethod
+    def _build_span_exporter() -> Optional[Union[HTTPSpanExporter, FileSpanExporter]]:
+        """Export spans to the collector at TRACE_EXPORT_URL, else to the file at TRACE_EXPORT_PATH."""
+        if settings.TRACE_EXPORT_URL:
+            return HTTPSpanExporter(settings.TRACE_EXPORT_URL)
+        if settings.TRACE_EXPORT_PATH:
+            return FileSpanExporter(settings.TRACE_EXPORT_PATH)
+        return None
+
+    def _build_router(self) -> IntentRouter:
+        """Register each agent's chat keywords; unmatched messages go to the travel organizer."""
+        classifier = None
+        if settings.INTENT_TRAINING_DATA:
+            classifier = _load_intent_classifier(settings.INTENT_TRAINING_DATA)
+        router = IntentRouter(
+            default="travel_organizer",
+            classifier=classifier,
+            min_classifier_score=settings.INTENT_CLASSIFIER_MIN_SCORE,
+        )
+        for name, agent in self.agents.items():
+            if agent.INTENT_KEYWORDS:
+                router.register(name, agent.INTENT_KEYWORDS)
+        unknown = router.unknown_labels()
+        if unknown:
+            logger.warning(f"Ignoring intent training labels with no matching agent: {', '.join(unknown)}")
+        return router
+
+    def _build_governor(self) -> Governor:
+        """Apply each agent's LLM budgets, falling back to the AGENT_MAX_* settings."""
+        governor = Governor(max_in_flight=settings.LLM_MAX_IN_FLIGHT or None, monitoring=self.resources["monitoring"])
+        for agent in self.agents.values():
+            config = agent.config
+            governor.configure(
+                config.name,
+                max_rpm=settings.AGENT_MAX_RPM if config.max_rpm is None else config.max_rpm,
+                max_tpm=settings.AGENT_MAX_TPM if config.max_tpm is None else config.max_tpm,
+                max_in_flight=settings.AGENT_MAX_IN_FLIGHT if config.max_in_flight is None else config.max_in_flight,
+                priority=config.priority,
+            )
+            agent.governor = governor
+        return governor
+
+    def _register_metrics(self, scheduler: MonitorScheduler) -> None:
+        """Export the stats the scheduler, event bus, governor and caches already keep."""
+        metrics = self.resources["monitoring"].metrics
+        metrics.register_stats("scheduler", scheduler.stats, counters=("checks", "lookups", "batches", "errors"))
+        metrics.register_stats(
+            "event_bus", self.resources["event_bus"].stats, counters=("published", "delivered", "dropped_subscribers")
+        )
+        governor = self.resources["governor"]
+        metrics.register_stats("governor", governor.stats)
+        metrics.register_stats(
+            "governor_agent", lambda: governor.stats()["agents"], label="agent", counters=("admitted", "tokens")
+        )
+        agents = self.agents
+        metrics.register_stats(
+            "agent_cache",
+            lambda: {agent.config.name: agent.cache_stats() for agent in agents.values()},
+            label="agent",
+            counters=("disk_hits", "refreshed", "bypassed"),
+        )
+        metrics.register_stats(
+            "tracer", self.resources["monitoring"].tracer.stats, counters=("finished", "exported", "dropped")
+        )
+        if self.log_pipeline is not None:
+            metrics.register_stats(
+                "log", self.log_pipeline.stats, counters=("enqueued", "dropped", "sampled_out", "suppressed")
+            )
+        if "prompt_cache" in self.resources:
+            metrics.register_stats(
+                "prompt_cache",
+                self.resources["prompt_cache"].stats,
+                counters=("exact_hits", "semantic_hits", "misses", "coalesced", "evictions"),
+            )
+
+    def _build_file_system(self, event_bus: EventBus) -> AsyncFileSystem:
+        """Wrap the file system so request handlers never block on disk I/O."""
+        if isinstance(self._file_system, AsyncFileSystem):
+            if self._file_system.bus is None:
+                self._file_system.bus = event_bus
+            return self._file_system
+        return AsyncFileSystem(self._file_system, bus=event_bus)
+
+    async def _check_flights(self, flights: list[dict[str, Any]]) -> list[Any]:
+        """Scheduler lookup: run the crew for each flight in the batch concurrently."""
+        crew = self.crew
+        if crew is None:
+            raise RuntimeError("Registry is shut down")
+        with get_tracer().span("monitor.check_batch", attributes={"flights": len(flights)}):
+            results: list[Any] = await asyncio.gather(
+                *(crew.handle_flight_delay(f) for f in flights), return_exceptions=True
+            )
+            return results
+
+    async def _record_monitor_update(self, monitor: FlightMonitor, status: dict[str, Any]) -> None:
+        """Scheduler callback: append a monitor's result to its trip status log."""
+        await self.resources["file_system"].add_status_update(trip_id=monitor.trip_id, status=status)
+
+    def add_shutdown_callback(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Register a coroutine function to run on shutdown (last registered runs first)."""
+        self._shutdown_callbacks.append(callback)
+
+    async def shutdown(self) -> None:
+        """Run shutdown callbacks and release everything built in `startup()`."""
+        while self._shutdown_callbacks:
+            callback = self._shutdown_callbacks.pop()
+            try:
+                await callback()
+            except Exception:
+                logger.exception("Registry shutdown callback failed")
+
+        self.agents = {}
+        self.resources = {}
+        self.crew = None
+        self.scheduler = None
+        self.router = None
+        self.log_pipeline = None
+        logger.info("Registry shut down")
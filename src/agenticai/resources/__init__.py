@@ -1,5 +1,51 @@
-from .apis import FlightAPI, NotificationAPI, WeatherAPI
-from .file_system import FileSystem
-from .memory import Memory
+from typing import TYPE_CHECKING
 
-__all__ = ["Memory", "WeatherAPI", "FlightAPI", "NotificationAPI", "FileSystem"]
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .apis import FlightAPI, NotificationAPI, WeatherAPI
+    from .async_file_system import AsyncFileSystem
+    from .file_system import FileSystem
+    from .http import HTTPClientPool, close_http_pool, get_http_pool
+    from .memory import Memory
+    from .semantic_cache import SemanticCache
+    from .sqlite_memory import SQLiteMemory
+    from .vector_index import HashingEmbedder, VectorIndex
+
+__all__ = [
+    "AsyncFileSystem",
+    "FileSystem",
+    "FlightAPI",
+    "HTTPClientPool",
+    "HashingEmbedder",
+    "Memory",
+    "NotificationAPI",
+    "SQLiteMemory",
+    "SemanticCache",
+    "VectorIndex",
+    "WeatherAPI",
+    "close_http_pool",
+    "get_http_pool",
+]
+
+# Imported on first access (PEP 562): the API wrappers pull in aiohttp and the
+# vector index numpy, which most importers of a single resource never need.
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    globals(),
+    {
+        "FlightAPI": ".apis",
+        "NotificationAPI": ".apis",
+        "WeatherAPI": ".apis",
+        "AsyncFileSystem": ".async_file_system",
+        "FileSystem": ".file_system",
+        "HTTPClientPool": ".http",
+        "close_http_pool": ".http",
+        "get_http_pool": ".http",
+        "Memory": ".memory",
+        "SemanticCache": ".semantic_cache",
+        "SQLiteMemory": ".sqlite_memory",
+        "HashingEmbedder": ".vector_index",
+        "VectorIndex": ".vector_index",
+    },
+)
@@ -1,72 +1,142 @@
-from typing import Any, Dict, Optional
+from typing import Any, ClassVar, Dict, Optional
 
 import aiohttp
 
 from ..config.settings import settings
+from ..core.cache import TTLCache, time_bucket
+from ..core.resilience import Upstream, UpstreamError
+from ..core.singleflight import SingleFlight
+from .http import HTTPClientPool, get_http_pool
+
+
+async def _get_json(session: aiohttp.ClientSession, url: str, what: str, **kwargs: Any) -> dict[str, Any]:
+    """GET a JSON document, raising `UpstreamError` on transport errors and non-200 responses."""
+    try:
+        async with session.get(url, **kwargs) as response:
+            if response.status == 200:
+                document: dict[str, Any] = await response.json()
+                return document
+            retryable = response.status == 429 or response.status >= 500
+            raise UpstreamError(
+                f"Failed to get {what} ({response.status}): {await response.text()}",
+                status=response.status,
+                retryable=retryable,
+            )
+    except aiohttp.ClientError as e:
+        raise UpstreamError(f"Failed to get {what}: {e!r}") from e
 
 
 class WeatherAPI:
     """Wrapper for OpenWeather API."""
 
     BASE_URL = "https://api.openweathermap.org/data/2.5"
-
-    def __init__(self, api_key: Optional[str] = None):
+    # Per-attempt timeouts (seconds); other settings come from UPSTREAM_*
+    TIMEOUTS: ClassVar[dict[str, float]] = {"weather": 3.0, "forecast": 5.0}
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        pool: Optional[HTTPClientPool] = None,
+        base_url: Optional[str] = None,
+        upstream: Optional[Upstream] = None,
+    ):
         """Initialize the Weather API wrapper."""
         self.api_key = api_key or settings.OPENWEATHER_API_KEY
         if not self.api_key:
             raise ValueError("OpenWeather API key is required")
+        self.pool = pool or get_http_pool()
+        self.base_url = base_url or self.BASE_URL
+        self.upstream = upstream or Upstream("weather_api", timeouts=self.TIMEOUTS)
+        self.weather_cache = TTLCache(
+            ttl=settings.WEATHER_CACHE_TTL, maxsize=settings.WEATHER_CACHE_MAXSIZE, name="weather_api.weather"
+        )
+        self.forecast_cache = TTLCache(
+            ttl=settings.FORECAST_CACHE_TTL, maxsize=settings.WEATHER_CACHE_MAXSIZE, name="weather_api.forecast"
+        )
 
     async def get_weather(self, city: str) -> Dict[str, Any]:
-        """Get current weather for a city."""
-        params = {"q": city, "appid": self.api_key, "units": "metric"}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.BASE_URL}/weather", params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    raise Exception(f"Failed to get weather: {await response.text()}")
+        """Get current weather for a city (cached for WEATHER_CACHE_TTL seconds)."""
+        key = (city.lower(), time_bucket(self.weather_cache.ttl))
+        return await self.weather_cache.get_or_set(
+            key, lambda: self.upstream.call("weather", lambda: self._fetch_weather(city), stale_key=city.lower())
+        )
 
     async def get_forecast(self, city: str) -> Dict[str, Any]:
-        """Get 5-day forecast for a city."""
+        """Get 5-day forecast for a city (cached for FORECAST_CACHE_TTL seconds)."""
+        key = (city.lower(), time_bucket(self.forecast_cache.ttl))
+        return await self.forecast_cache.get_or_set(
+            key, lambda: self.upstream.call("forecast", lambda: self._fetch_forecast(city), stale_key=city.lower())
+        )
+
+    async def _fetch_weather(self, city: str) -> dict[str, Any]:
+        """Fetch current weather for a city from the API."""
         params = {"q": city, "appid": self.api_key, "units": "metric"}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.BASE_URL}/forecast", params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    raise Exception(f"Failed to get forecast: {await response.text()}")
+        return await _get_json(self.pool.session(), f"{self.base_url}/weather", "weather", params=params)
+
+    async def _fetch_forecast(self, city: str) -> dict[str, Any]:
+        """Fetch the 5-day forecast for a city from the API."""
+        params = {"q": city, "appid": self.api_key, "units": "metric"}
+        return await _get_json(self.pool.session(), f"{self.base_url}/forecast", "forecast", params=params)
 
 
 class FlightAPI:
     """Wrapper for Flight data API."""
 
     BASE_URL = "https://aeroapi.flightaware.com/aeroapi"
-
-    def __init__(self, api_key: Optional[str] = None):
+    # Per-attempt timeouts (seconds); other settings come from UPSTREAM_*
+    TIMEOUTS: ClassVar[dict[str, float]] = {"flight_info": 4.0, "airport_delays": 4.0}
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        pool: Optional[HTTPClientPool] = None,
+        base_url: Optional[str] = None,
+        upstream: Optional[Upstream] = None,
+    ):
         """Initialize the Flight API wrapper."""
         self.api_key = api_key or settings.FLIGHTAWARE_API_KEY
         if not self.api_key:
             raise ValueError("FlightAware API key is required")
+        self.pool = pool or get_http_pool()
+        self.base_url = base_url or self.BASE_URL
+        self.upstream = upstream or Upstream("flight_api", timeouts=self.TIMEOUTS)
+        self.singleflight = SingleFlight("flight_api")
 
     async def get_flight_info(self, flight_number: str) -> Dict[str, Any]:
-        """Get information about a specific flight."""
-        headers = {"x-apikey": self.api_key}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.BASE_URL}/flights/{flight_number}", headers=headers) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    raise Exception(f"Failed to get flight info: {await response.text()}")
+        """Get information about a specific flight.
+
+        Concurrent lookups for the same flight share one upstream request.
+        """
+        key = ("flight_info", flight_number.upper())
+        return await self.singleflight.do(
+            key,
+            lambda: self.upstream.call("flight_info", lambda: self._fetch_flight_info(flight_number), stale_key=key[1]),
+        )
 
     async def get_airport_delays(self, airport_code: str) -> Dict[str, Any]:
-        """Get delay information for an airport."""
+        """Get delay information for an airport.
+
+        Concurrent lookups for the same airport share one upstream request.
+        """
+        key = ("airport_delays", airport_code.upper())
+        return await self.singleflight.do(
+            key,
+            lambda: self.upstream.call(
+                "airport_delays", lambda: self._fetch_airport_delays(airport_code), stale_key=key[1]
+            ),
+        )
+
+    async def _fetch_flight_info(self, flight_number: str) -> dict[str, Any]:
+        """Fetch information about a specific flight from the API."""
+        headers = {"x-apikey": self.api_key}
+        url = f"{self.base_url}/flights/{flight_number}"
+        return await _get_json(self.pool.session(), url, "flight info", headers=headers)
+
+    async def _fetch_airport_delays(self, airport_code: str) -> dict[str, Any]:
+        """Fetch delay information for an airport from the API."""
         headers = {"x-apikey": self.api_key}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.BASE_URL}/airports/{airport_code}/delays", headers=headers) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    raise Exception(f"Failed to get airport delays: {await response.text()}")
+        url = f"{self.base_url}/airports/{airport_code}/delays"
+        return await _get_json(self.pool.session(), url, "airport delays", headers=headers)
 
 
 class NotificationAPI:
@@ -0,0 +1,174 @@
+import asyncio
+import contextvars
+import functools
+from collections import Counter
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Callable, Optional, TypeVar
+
+from ..config.settings import settings
+from ..core.events import EventBus
+from ..core.tracing import get_tracer
+from .file_system import FileSystem
+
+T = TypeVar("T")
+
+
+class AsyncFileSystem:
+    """Non-blocking counterpart of `FileSystem` for use from async code.
+
+    Every call runs the matching `FileSystem` method on a bounded thread
+    pool, so disk I/O never stalls the event loop. Status updates for the
+    same trip are batched: updates added while a write for that trip is
+    queued or in flight are appended together in a single write, in the
+    order they were added. Once written, each update is published on the
+    event bus under its trip id.
+    """
+
+    def __init__(
+        self,
+        file_system: Optional[FileSystem] = None,
+        max_workers: Optional[int] = None,
+        batch_window: Optional[float] = None,
+        bus: Optional[EventBus] = None,
+    ):
+        """Initialize the wrapper; unset options fall back to settings."""
+        self.file_system = file_system or FileSystem()
+        self.bus = bus
+        self.batch_window = batch_window if batch_window is not None else settings.FILE_IO_BATCH_WINDOW
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.FILE_IO_MAX_WORKERS, thread_name_prefix="file-io"
+        )
+
+        self.batches_written = 0
+        self.updates_written = 0
+
+        self._pending: dict[str, list[tuple[dict[str, Any], asyncio.Future[str]]]] = {}
+        self._writers: dict[str, asyncio.Task] = {}
+        self._status_locks: dict[str, asyncio.Lock] = {}
+        self._status_lock_users: Counter[str] = Counter()
+
+    @property
+    def base_dir(self) -> str:
+        return self.file_system.base_dir
+
+    async def create_trip_folder(self, trip_id: str) -> str:
+        """Create a folder structure for a trip."""
+        return await self._run(self.file_system.create_trip_folder, trip_id)
+
+    async def save_document(
+        self, trip_id: str, document_type: str, content: dict[str, Any], filename: Optional[str] = None
+    ) -> str:
+        """Save a document to the trip folder atomically."""
+        return await self._run(self.file_system.save_document, trip_id, document_type, content, filename)
+
+    async def add_status_update(self, trip_id: str, status: dict[str, Any]) -> str:
+        """Append a status update to the trip's status log, batched with concurrent updates."""
+        # Stamp now rather than when the batch is written
+        if "timestamp" not in status:
+            status["timestamp"] = datetime.now().isoformat()
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(trip_id, []).append((status, future))
+        if trip_id not in self._writers:
+            self._writers[trip_id] = asyncio.ensure_future(self._write_status_batches(trip_id))
+        return await future
+
+    async def get_status_updates(self, trip_id: str) -> list[dict[str, Any]]:
+        """Get all status updates for a trip."""
+        return await self._run(self.file_system.get_status_updates, trip_id)
+
+    async def tail_status_updates(self, trip_id: str, n: int = 10) -> list[dict[str, Any]]:
+        """Get the last `n` status updates for a trip."""
+        return await self._run(self.file_system.tail_status_updates, trip_id, n)
+
+    async def compact_status_log(self, trip_id: str, keep_last: Optional[int] = None) -> str:
+        """Rewrite a trip's status log, dropping torn lines."""
+        await self.flush(trip_id)
+        # Batches queued from here on wait for the rewrite instead of appending to the replaced file
+        async with self._status_lock(trip_id):
+            return await self._run(self.file_system.compact_status_log, trip_id, keep_last)
+
+    async def list_documents(self, trip_id: str, document_type: Optional[str] = None) -> list[str]:
+        """List all documents for a trip."""
+        return await self._run(self.file_system.list_documents, trip_id, document_type)
+
+    async def flush(self, trip_id: Optional[str] = None) -> None:
+        """Wait until pending status updates (for one trip, or all) are written."""
+        writers = [self._writers[trip_id]] if trip_id in self._writers else []
+        if trip_id is None:
+            writers = list(self._writers.values())
+        if writers:
+            await asyncio.gather(*writers, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """Write pending status updates and shut the thread pool down."""
+        await self.flush()
+        await asyncio.to_thread(self._executor.shutdown, True)
+
+    def stats(self) -> dict[str, Any]:
+        """Return status batching counters."""
+        return {
+            "pending": sum(len(batch) for batch in self._pending.values()),
+            "batches_written": self.batches_written,
+            "updates_written": self.updates_written,
+            "avg_batch_size": self.updates_written / self.batches_written if self.batches_written else 0.0,
+        }
+
+    @asynccontextmanager
+    async def _status_lock(self, trip_id: str) -> AsyncIterator[None]:
+        """Hold the trip's write lock; it is dropped once nobody holds or waits for it."""
+        lock = self._status_locks.setdefault(trip_id, asyncio.Lock())
+        self._status_lock_users[trip_id] += 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._status_lock_users[trip_id] -= 1
+            if not self._status_lock_users[trip_id]:
+                del self._status_lock_users[trip_id]
+                del self._status_locks[trip_id]
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        with get_tracer().span(f"fs.{func.__name__}"):
+            # Run in a copy of the caller's context so the worker thread sees the current span
+            call = functools.partial(contextvars.copy_context().run, func, *args)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def _write_status_batches(self, trip_id: str) -> None:
+        """Write a trip's queued updates one batch at a time until none are left.
+
+        Only one writer runs per trip, which keeps the log in the order the
+        updates were added. If the writer is cancelled, the updates it was
+        writing or had yet to write are cancelled with it.
+        """
+        batch: list[tuple[dict[str, Any], asyncio.Future[str]]] = []
+        try:
+            while self._pending.get(trip_id):
+                if self.batch_window > 0:
+                    await asyncio.sleep(self.batch_window)
+                else:
+                    await asyncio.sleep(0)  # let updates from the same loop iteration join
+                async with self._status_lock(trip_id):
+                    batch = self._pending.pop(trip_id)
+                    try:
+                        path = await self._run(self.file_system.add_status_updates, trip_id, [s for s, _ in batch])
+                    except Exception as e:
+                        for _, future in batch:
+                            if not future.done():
+                                future.set_exception(e)
+                        continue
+
+                self.batches_written += 1
+                self.updates_written += len(batch)
+                for status, future in batch:
+                    if self.bus is not None:
+                        self.bus.publish(trip_id, {"type": "status", "trip_id": trip_id, "data": status})
+                    if not future.done():
+                        future.set_result(path)
+        finally:
+            self._writers.pop(trip_id, None)
+            for _, future in batch + self._pending.pop(trip_id, []):
+                future.cancel()  # no-op for updates already written
@@ -1,17 +1,88 @@
 import json
 import os
+import tempfile
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Any, Optional
 
+from ..config.settings import settings
+
+STATUS_LOG = "status_log.jsonl"
+LEGACY_STATUS_LOG = "status_log.json"
+STATUS_ARCHIVE = "status_log.archive.jsonl"
+
+# Subdirectory of the trip folder each document type is saved in; other types go in the trip folder itself
+DOCUMENT_SUBDIRS = {
+    "flight": "flight_info",
+    "boarding_pass": "flight_info",
+    "hotel": "hotel_reservations",
+    "accommodation": "hotel_reservations",
+    "car": "car_rentals",
+    "rental": "car_rentals",
+    "status": "status_updates",
+    "update": "status_updates",
+    "alternative": "alternative_options",
+    "option": "alternative_options",
+    "notification": "notifications",
+    "message": "notifications",
+}
+
+
+class _TripLog:
+    """Writer-side state for one trip's status log."""
+
+    __slots__ = ("appended", "last_fsync", "last_used", "lock", "prepared", "users")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.users = 0  # threads holding or waiting for the lock
+        self.last_used = 0.0
+        self.last_fsync = 0.0
+        self.appended = 0  # updates appended since the last compaction
+        self.prepared = False
+
 
 class FileSystem:
-    """File system handler for document management."""
+    """File system handler for document management.
+
+    Status updates go to an append-only JSON Lines log per trip, so adding
+    one is a single O(1) append and concurrent writers cannot overwrite each
+    other. Logs in the old single-JSON-document format are migrated the
+    first time a trip is touched. Once a log has taken `compact_lines`
+    appends the writer compacts it, keeping the latest `keep_last` updates
+    live. Per-trip state is freed when a trip goes idle or is compacted.
+    """
+
+    FSYNC_POLICIES = ("always", "interval", "never")
 
-    def __init__(self, base_dir: str = "./data/travel_docs"):
+    def __init__(
+        self,
+        base_dir: str = "./data/travel_docs",
+        fsync_policy: Optional[str] = None,
+        fsync_interval: Optional[float] = None,
+        compact_lines: Optional[int] = None,
+        keep_last: Optional[int] = None,
+    ):
         """Initialize the file system handler."""
         self.base_dir = base_dir
         os.makedirs(self.base_dir, exist_ok=True)
 
+        self.fsync_policy = fsync_policy or settings.STATUS_LOG_FSYNC
+        if self.fsync_policy not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {self.fsync_policy}")
+        self.fsync_interval = fsync_interval if fsync_interval is not None else settings.STATUS_LOG_FSYNC_INTERVAL
+        self.compact_lines = compact_lines if compact_lines is not None else settings.STATUS_LOG_COMPACT_LINES
+        self.keep_last = keep_last if keep_last is not None else settings.STATUS_LOG_KEEP_LAST
+        self.idle_seconds = settings.STATUS_LOG_IDLE_SECONDS
+        self._migration_lock = threading.Lock()
+        self._trips: dict[str, _TripLog] = {}
+        self._trips_lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
     def create_trip_folder(self, trip_id: str) -> str:
         """Create a folder structure for a trip."""
         trip_dir = os.path.join(self.base_dir, trip_id)
@@ -43,24 +114,8 @@ class FileSystem:
         if not os.path.exists(trip_dir):
             self.create_trip_folder(trip_id)
 
-        # Determine the appropriate subdirectory
-        if document_type in ["flight", "boarding_pass"]:
-            subdir = "flight_info"
-        elif document_type in ["hotel", "accommodation"]:
-            subdir = "hotel_reservations"
-        elif document_type in ["car", "rental"]:
-            subdir = "car_rentals"
-        elif document_type in ["status", "update"]:
-            subdir = "status_updates"
-        elif document_type in ["alternative", "option"]:
-            subdir = "alternative_options"
-        elif document_type in ["notification", "message"]:
-            subdir = "notifications"
-        else:
-            subdir = ""  # Root of trip directory
-
         # Create the target directory path
-        target_dir = os.path.join(trip_dir, subdir)
+        target_dir = os.path.join(trip_dir, DOCUMENT_SUBDIRS.get(document_type, ""))
         os.makedirs(target_dir, exist_ok=True)
 
         # Generate filename if not provided
@@ -75,38 +130,261 @@ class FileSystem:
         # Full path to the file
         file_path = os.path.join(target_dir, filename)
 
-        # Save the content as JSON
-        with open(file_path, "w") as f:
-            json.dump(content, f, indent=2)
+        # Save the content as JSON; readers see either the old or the new file, never a partial one
+        fd, tmp_path = self._temp_file_for(file_path)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(content, f, indent=2)
+                if self.fsync_policy != "never":
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
         return file_path
 
     def add_status_update(self, trip_id: str, status: dict[str, Any]) -> str:
-        """Add a status update to the trip folder."""
-        # Ensure status has a timestamp
-        if "timestamp" not in status:
-            status["timestamp"] = datetime.now().isoformat()
+        """Append a status update to the trip's status log."""
+        return self.add_status_updates(trip_id, [status])
 
-        # Get existing status updates
-        status_updates = self.get_status_updates(trip_id)
-        status_updates.append(status)
+    def add_status_updates(self, trip_id: str, statuses: list[dict[str, Any]]) -> str:
+        """Append several status updates to the trip's status log in one write."""
+        # Ensure every status has a timestamp
+        for status in statuses:
+            if "timestamp" not in status:
+                status["timestamp"] = datetime.now().isoformat()
 
-        # Save the updated status list
-        return self.save_document(
-            trip_id=trip_id, document_type="status", content={"updates": status_updates}, filename="status_log.json"
-        )
+        data = "".join(json.dumps(status) + "\n" for status in statuses)
+
+        # One write() on an O_APPEND file, so concurrent appends do not interleave or clobber each other;
+        # the trip lock keeps them out of a compaction that is replacing the file
+        with self._trip_log(trip_id) as trip:
+            log_path = self._prepare_status_log(trip_id, trip)
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(data)
+                if self._should_fsync(trip):
+                    f.flush()
+                    os.fsync(f.fileno())
+            trip.appended += len(statuses)
+            compact = 0 < self.compact_lines <= trip.appended
+
+        if compact:
+            self.compact_status_log(trip_id, keep_last=self.keep_last)
+        return log_path
 
     def get_status_updates(self, trip_id: str) -> list[dict[str, Any]]:
         """Get all status updates for a trip."""
-        status_file = os.path.join(self.base_dir, trip_id, "status_updates", "status_log.json")
-        if os.path.exists(status_file):
-            with open(status_file) as f:
+        return list(self.iter_status_updates(trip_id))
+
+    def iter_status_updates(self, trip_id: str) -> Iterator[dict[str, Any]]:
+        """Stream status updates for a trip, oldest first, without loading the whole log."""
+        log_path = self._existing_status_log(trip_id)
+        if log_path is None:
+            return
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                update = self._parse_status_line(line)
+                if update is not None:
+                    yield update
+
+    def tail_status_updates(self, trip_id: str, n: int = 10) -> list[dict[str, Any]]:
+        """Get the last `n` status updates, reading only the end of the log."""
+        log_path = self._existing_status_log(trip_id)
+        if log_path is None or n <= 0:
+            return []
+
+        with open(log_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            buffer = b""
+            # Read backwards in blocks until there are more than n line breaks
+            while position > 0 and buffer.count(b"\n") <= n:
+                step = min(8192, position)
+                position -= step
+                f.seek(position)
+                buffer = f.read(step) + buffer
+
+        updates: deque[dict[str, Any]] = deque(maxlen=n)
+        lines = buffer.split(b"\n")
+        if position > 0:
+            lines = lines[1:]  # the first line may be cut off
+        for line in lines:
+            update = self._parse_status_line(line.decode("utf-8", errors="replace"))
+            if update is not None:
+                updates.append(update)
+        return list(updates)
+
+    def compact_status_log(self, trip_id: str, keep_last: Optional[int] = None) -> str:
+        """Rewrite a trip's status log, dropping torn lines.
+
+        With `keep_last`, older updates are moved to an archive log and only
+        the latest `keep_last` stay in the live log. The rewrite goes through
+        a temporary file and an atomic rename. Appends from this process wait
+        for the rename; lines another process appends meanwhile are copied
+        over before it.
+        """
+        with self._trip_log(trip_id, release=True) as trip:
+            log_path = self._prepare_status_log(trip_id, trip)
+            data = self._read_bytes(log_path)
+            lines = data.decode("utf-8", errors="replace").splitlines()
+            updates = [update for update in map(self._parse_status_line, lines) if update is not None]
+
+            if keep_last is not None and len(updates) > keep_last:
+                archived, updates = updates[: len(updates) - keep_last], updates[len(updates) - keep_last :]
+                archive_path = os.path.join(os.path.dirname(log_path), STATUS_ARCHIVE)
+                self._write_lines(archive_path, archived, mode="a")
+
+            fd, tmp_path = self._temp_file_for(log_path)
+            try:
+                with os.fdopen(fd, "wb") as tmp:
+                    tmp.writelines((json.dumps(update) + "\n").encode("utf-8") for update in updates)
+                    tmp.write(self._read_bytes(log_path, len(data)))
+                    tmp.flush()
+                    os.fsync(tmp.fileno())
+                os.replace(tmp_path, log_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            trip.appended = 0
+        return log_path
+
+    @contextmanager
+    def _trip_log(self, trip_id: str, release: bool = False) -> Iterator[_TripLog]:
+        """Hold the trip's writer lock.
+
+        The state is dropped once nobody uses it and it has been idle for
+        `idle_seconds`, or right away with `release` (after a compaction).
+        """
+        with self._trips_lock:
+            trip = self._trips.get(trip_id)
+            if trip is None:
+                trip = self._trips[trip_id] = _TripLog()
+            trip.users += 1
+        try:
+            with trip.lock:
+                yield trip
+        finally:
+            with self._trips_lock:
+                trip.users -= 1
+                trip.last_used = now = time.monotonic()
+                if release and not trip.users and self._trips.get(trip_id) is trip:
+                    del self._trips[trip_id]
+                if now - self._last_sweep >= self.idle_seconds:
+                    self._last_sweep = now
+                    self._drop_idle_trips(now)
+
+    def _drop_idle_trips(self, now: float) -> None:
+        """Forget trips nobody has written to lately; callers hold `_trips_lock`."""
+        idle = [
+            trip_id
+            for trip_id, trip in self._trips.items()
+            if not trip.users and now - trip.last_used >= self.idle_seconds
+        ]
+        for trip_id in idle:
+            del self._trips[trip_id]
+
+    @staticmethod
+    def _temp_file_for(path: str) -> tuple[int, str]:
+        """A uniquely named temporary file next to `path`, so the final rename stays atomic."""
+        return tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+
+    def _status_dir(self, trip_id: str) -> str:
+        return os.path.join(self.base_dir, trip_id, "status_updates")
+
+    def _prepare_status_log(self, trip_id: str, trip: _TripLog) -> str:
+        """Make sure the trip's status log exists in the append-only format."""
+        log_path = os.path.join(self._status_dir(trip_id), STATUS_LOG)
+        if trip.prepared:
+            return log_path
+
+        trip_dir = os.path.join(self.base_dir, trip_id)
+        if not os.path.exists(trip_dir):
+            self.create_trip_folder(trip_id)
+        os.makedirs(self._status_dir(trip_id), exist_ok=True)
+        self._migrate_legacy_status_log(trip_id)
+        trip.prepared = True
+        return log_path
+
+    def _existing_status_log(self, trip_id: str) -> Optional[str]:
+        """Path of the trip's status log if there is one, migrating the legacy format."""
+        status_dir = self._status_dir(trip_id)
+        trip = self._trips.get(trip_id)
+        if trip is None or not trip.prepared:
+            if not os.path.isdir(status_dir):
+                return None
+            self._migrate_legacy_status_log(trip_id)
+        log_path = os.path.join(status_dir, STATUS_LOG)
+        return log_path if os.path.exists(log_path) else None
+
+    def _migrate_legacy_status_log(self, trip_id: str) -> None:
+        """Convert a `status_log.json` document into the JSON Lines log."""
+        legacy_path = os.path.join(self._status_dir(trip_id), LEGACY_STATUS_LOG)
+        if not os.path.exists(legacy_path):
+            return
+
+        with self._migration_lock:
+            if not os.path.exists(legacy_path):
+                return  # migrated by another thread meanwhile
+
+            log_path = os.path.join(self._status_dir(trip_id), STATUS_LOG)
+            if not os.path.exists(log_path):
+                try:
+                    with open(legacy_path) as f:
+                        updates = json.load(f).get("updates", [])
+                except (json.JSONDecodeError, AttributeError):
+                    updates = []
+                fd, tmp_path = self._temp_file_for(log_path)
+                os.close(fd)
                 try:
-                    data = json.load(f)
-                    return data.get("updates", [])
-                except json.JSONDecodeError:
-                    return []
-        return []
+                    self._write_lines(tmp_path, updates, mode="w")
+                    os.replace(tmp_path, log_path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+
+            # Either just migrated or migrated before a crash; the JSONL log is authoritative
+            os.remove(legacy_path)
+
+    def _should_fsync(self, trip: _TripLog) -> bool:
+        if self.fsync_policy == "always":
+            return True
+        if self.fsync_policy == "never":
+            return False
+        now = time.monotonic()
+        if now - trip.last_fsync >= self.fsync_interval:
+            trip.last_fsync = now
+            return True
+        return False
+
+    @staticmethod
+    def _read_bytes(path: str, offset: int = 0) -> bytes:
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                return f.read()
+        except FileNotFoundError:
+            return b""
+
+    @staticmethod
+    def _write_lines(path: str, updates: list[dict[str, Any]], mode: str) -> None:
+        with open(path, mode, encoding="utf-8") as f:
+            f.writelines(json.dumps(update) + "\n" for update in updates)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _parse_status_line(line: str) -> Optional[dict[str, Any]]:
+        """Parse one log line; torn or blank lines are skipped."""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            update = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        return update if isinstance(update, dict) else None
 
     def list_documents(self, trip_id: str, document_type: Optional[str] = None) -> list[str]:
         """List all documents for a trip."""
@@ -126,7 +404,8 @@ class FileSystem:
         def get_document_files() -> list[str]:
             try:
                 return [
-                    f for f in os.listdir(trip_dir)
+                    f
+                    for f in os.listdir(trip_dir)
                     if os.path.isfile(os.path.join(trip_dir, f)) and not f.startswith(".")
                 ]
             except Exception:
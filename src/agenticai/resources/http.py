@@ -0,0 +1,93 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from ..config.settings import settings
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClientPool:
+    """Process-wide pooled aiohttp session shared by the API wrappers.
+
+    One `aiohttp.ClientSession` (and therefore one connector) is reused for
+    every upstream call, so keep-alive connections and cached DNS lookups
+    survive between requests instead of paying a TCP+TLS handshake each time.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        dns_cache_ttl: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None,
+    ):
+        """Initialize the pool; unset options fall back to settings."""
+        self.limit = limit if limit is not None else settings.HTTP_POOL_LIMIT
+        self.limit_per_host = limit_per_host if limit_per_host is not None else settings.HTTP_POOL_LIMIT_PER_HOST
+        self.keepalive_timeout = keepalive_timeout if keepalive_timeout is not None else settings.HTTP_KEEPALIVE_TIMEOUT
+        self.dns_cache_ttl = dns_cache_ttl if dns_cache_ttl is not None else settings.HTTP_DNS_CACHE_TTL
+        self.connect_timeout = connect_timeout if connect_timeout is not None else settings.HTTP_CONNECT_TIMEOUT
+        self.total_timeout = total_timeout if total_timeout is not None else settings.HTTP_TOTAL_TIMEOUT
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def closed(self) -> bool:
+        """Whether there is no open session."""
+        return self._session is None or self._session.closed
+
+    def session(self) -> "aiohttp.ClientSession":
+        """Return the shared session, creating it on first use in the running loop."""
+        import aiohttp  # deferred so importing the package does not load it
+
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._loop is loop:
+            return self._session
+
+        if self._session is not None and not self._session.closed:
+            # A session cannot be used from another event loop; drop the stale one
+            logger.warning("HTTP pool session belongs to a different event loop, creating a new one")
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+        timeout = aiohttp.ClientTimeout(total=self.total_timeout, connect=self.connect_timeout)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        self._loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP connection pool closed")
+        self._session = None
+        self._loop = None
+
+
+_pool: Optional[HTTPClientPool] = None
+
+
+def get_http_pool() -> HTTPClientPool:
+    """Get the process-wide HTTP connection pool."""
+    global _pool
+    if _pool is None:
+        _pool = HTTPClientPool()
+    return _pool
+
+
+async def close_http_pool() -> None:
+    """Close the process-wide HTTP connection pool, if one was created."""
+    if _pool is not None:
+        await _pool.close()
@@ -1,24 +1,123 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
 import json
+import logging
+import math
+import re
+import sys
 import time
-from typing import Any, Optional
+from array import array
+from collections import Counter, OrderedDict
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, Optional
+
+from ..config.settings import settings
+
+if TYPE_CHECKING:
+    from .vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokenize(text: str) -> list[str]:
+    """Split text into lower-cased alphanumeric terms."""
+    return _TOKEN_RE.findall(text.lower())
 
 
 class Memory:
     """Memory system for storing agent interactions and results.
     Uses a simple in-memory dictionary instead of ChromaDB to avoid SQLite issues.
+
+    Documents are numbered in insertion order, which is also timestamp order,
+    so "most recent" queries walk the indexes backwards instead of sorting.
+    Keyword retrieval goes through an inverted index ranked with BM25, and
+    the `agent`, `task` and `memory_key` metadata fields have hash indexes.
+
+    The store is bounded by an entry count and a byte budget. Entries past
+    their TTL are dropped lazily on the next read or write, and over-capacity
+    entries are evicted least-recently-used first (or oldest first with the
+    "age" policy). Removed entries leave tombstones in the indexes until
+    `compact()` rebuilds them, which the background compaction task does
+    once enough have built up.
     """
 
-    def __init__(self, collection_name: str = "flight_delay_system"):
-        """Initialize the simple memory system."""
+    INDEXED_FIELDS = ("agent", "task", "memory_key")
+
+    # BM25 parameters
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    # Terms in more than this share of documents (e.g. JSON keys present in
+    # every entry) are skipped when the query has rarer terms to rank on
+    COMMON_TERM_RATIO = 0.5
+    # Rebuild the indexes once tombstones exceed this share of indexed documents
+    COMPACTION_RATIO = 0.25
+
+    def __init__(
+        self,
+        collection_name: str = "flight_delay_system",
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        eviction_policy: Optional[str] = None,
+        vector_index: Optional["VectorIndex"] = None,
+    ):
+        """Initialize the simple memory system; unset limits fall back to settings."""
         self.collection_name = collection_name
-        self.documents = {}  # id -> document
-        self.metadatas = {}  # id -> metadata
+        self.documents: dict[str, str] = {}  # id -> document
+        self.metadatas: dict[str, dict[str, Any]] = {}  # id -> metadata
+
+        self.max_entries = max_entries if max_entries is not None else settings.MEMORY_MAX_ENTRIES
+        self.max_bytes = max_bytes if max_bytes is not None else settings.MEMORY_MAX_BYTES
+        self.ttl = ttl if ttl is not None else settings.MEMORY_TTL_SECONDS
+        self.eviction_policy = eviction_policy or settings.MEMORY_EVICTION_POLICY
+        if self.eviction_policy not in ("lru", "age"):
+            raise ValueError(f"Unknown eviction policy: {self.eviction_policy}")
+
+        self.resident_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.compactions = 0
+
+        self._ids = itertools.count(1)
+        self._sizes: dict[str, int] = {}  # id -> approximate bytes
+        self._access: OrderedDict[str, None] = OrderedDict()  # eviction order, first is evicted first
+        self._expiry_heap: list[tuple[float, str]] = []  # (expires at, id)
+        self._expires_at: dict[str, float] = {}
+        self._tombstones = 0
+        self._compaction_task: Optional[asyncio.Task] = None
+
+        # Optional embedding index for retrieve_similar(); NumPy is only imported when it is enabled
+        if vector_index is None and settings.MEMORY_VECTOR_SEARCH:
+            from .vector_index import VectorIndex
+
+            vector_index = VectorIndex()
+        self.vector_index = vector_index
+
+        self._doc_ids: list[Optional[str]] = []  # doc number -> id
+        self._doc_nos: dict[str, int] = {}  # id -> doc number
+        self._doc_lengths = array("I")  # doc number -> token count
+        self._total_length = 0
+        # term -> (doc numbers, term frequencies), both in insertion order
+        self._postings: dict[str, tuple[array, array]] = {}
+        # field -> value -> doc numbers in insertion order
+        self._metadata_index: dict[str, dict[str, array]] = {field: {} for field in self.INDEXED_FIELDS}
         print("Using simple in-memory storage instead of ChromaDB")
 
     def store(
-        self, agent_name: str, task: str, result: dict[str, Any], metadata: Optional[dict[str, Any]] = None
+        self,
+        agent_name: str,
+        task: str,
+        result: dict[str, Any],
+        metadata: Optional[dict[str, Any]] = None,
+        ttl: Optional[float] = None,
     ) -> str:
-        """Store an agent interaction in memory."""
+        """Store an agent interaction in memory, expiring after `ttl` seconds (0 keeps it)."""
+        self._purge_expired()
+
         if metadata is None:
             metadata = {}
 
@@ -29,80 +128,275 @@ class Memory:
         string_metadata["timestamp"] = str(time.time())
 
         # Generate a unique ID
-        doc_id = f"{agent_name}_{int(time.time())}_{len(self.documents) + 1}"
+        doc_id = f"{agent_name}_{int(time.time())}_{next(self._ids)}"
 
         # Store in memory
-        self.documents[doc_id] = json.dumps(result)
+        document = json.dumps(result)
+        self.documents[doc_id] = document
         self.metadatas[doc_id] = string_metadata
+        self._index(doc_id, document, string_metadata)
+        if self.vector_index is not None:
+            self.vector_index.add([doc_id], [document])
+
+        size = sys.getsizeof(document) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in string_metadata.items())
+        self._sizes[doc_id] = size
+        self.resident_bytes += size
+        self._access[doc_id] = None
+
+        ttl = self.ttl if ttl is None else ttl
+        if ttl > 0:
+            expires_at = time.monotonic() + ttl
+            self._expires_at[doc_id] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, doc_id))
+
+        self._enforce_capacity(keep=doc_id)
 
         return doc_id
 
     def retrieve(self, query: str, n_results: int = 5) -> list[dict[str, Any]]:
         """Retrieve relevant memories based on a query.
-        Note: Without ChromaDB, we don't have semantic search, so we just do basic keyword matching.
+        Documents are ranked by keyword relevance (BM25); see `retrieve_similar` for semantic search.
         """
-        # Very simple keyword search
-        matching_ids = []
-
-        for doc_id, doc_text in self.documents.items():
-            # Check if query appears in the document
-            if query.lower() in doc_text.lower():
-                matching_ids.append((doc_id, 1.0))  # Score 1.0 for matches
-
-        # Sort by recency if no matches (fallback)
-        if not matching_ids:
-            # Sort documents by timestamp in metadata
-            sorted_ids = sorted(
-                self.metadatas.keys(), key=lambda doc_key: float(self.metadatas[doc_key].get("timestamp", "0")), reverse=True
-            )
-            matching_ids = [(doc_key, 0.5) for doc_key in sorted_ids[:n_results]]
-
-        # Get top N results
-        top_ids = [doc_key for doc_key, _ in matching_ids[:n_results]]
-
-        # Format results
-        documents = []
-        for doc_id in top_ids:
-            try:
-                parsed_doc = json.loads(self.documents[doc_id])
-                parsed_doc["metadata"] = self.metadatas[doc_id]
-                documents.append(parsed_doc)
-            except json.JSONDecodeError:
-                # Skip documents that can't be parsed
-                continue
+        self._purge_expired()
+        scores = self._score(set(_tokenize(query)))
 
-        return documents
+        if scores:
+            # Highest score first, newer documents win ties
+            top = heapq.nlargest(n_results, scores.items(), key=lambda item: (item[1], item[0]))
+            top_ids = [doc_id for doc_no, _ in top if (doc_id := self._doc_ids[doc_no]) is not None]
+        else:
+            # Fall back to the most recent documents
+            top_ids = self._most_recent(range(len(self._doc_ids) - 1, -1, -1), {}, n_results)
+
+        return self._format(top_ids)
+
+    def retrieve_similar(self, query: str, n_results: int = 5) -> list[dict[str, Any]]:
+        """Retrieve memories by embedding similarity, falling back to keyword search without a vector index."""
+        if self.vector_index is None:
+            return self.retrieve(query, n_results)
+
+        self._purge_expired()
+        matches = self.vector_index.search([query], k=n_results)[0]
+        return self._format([doc_id for doc_id, _ in matches])
 
     def retrieve_by_agent(self, agent_name: str, n_results: int = 10) -> list[dict[str, Any]]:
         """Retrieve memories related to a specific agent."""
         return self._get_documents_by_metadata({"agent": agent_name}, n_results)
 
     def _get_documents_by_metadata(self, metadata_filter: dict[str, str], n_results: int = 10) -> list[dict[str, Any]]:
-        """Get documents matching specific metadata filters."""
-        matching_ids = []
+        """Get the most recent documents matching specific metadata filters."""
+        self._purge_expired()
+        indexed = [(k, v) for k, v in metadata_filter.items() if k in self._metadata_index]
+
+        if indexed:
+            # Walk the smallest matching index; the rest of the filter is checked per document
+            postings = []
+            for k, v in indexed:
+                posting = self._metadata_index[k].get(v)
+                if posting is None:
+                    return []
+                postings.append(posting)
+            candidates: Iterable[int] = reversed(min(postings, key=len))
+        else:
+            candidates = range(len(self._doc_ids) - 1, -1, -1)
+
+        return self._format(self._most_recent(candidates, metadata_filter, n_results))
+
+    def delete(self, doc_id: str) -> bool:
+        """Remove a document; returns whether it existed."""
+        if doc_id not in self.documents:
+            return False
+        self._remove(doc_id)
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """Return size, capacity and eviction counters."""
+        return {
+            "entries": len(self.documents),
+            "resident_bytes": self.resident_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "tombstones": self._tombstones,
+            "compactions": self.compactions,
+        }
+
+    def compact(self) -> None:
+        """Drop expired entries and rebuild the indexes without tombstones."""
+        self._purge_expired()
+        if not self._tombstones:
+            return
+
+        live = [doc_no for doc_no, doc_id in enumerate(self._doc_ids) if doc_id is not None]
+        renumber = array("l", [-1]) * len(self._doc_ids)
+        for new_no, old_no in enumerate(live):
+            renumber[old_no] = new_no
+
+        live_ids = [doc_id for doc_id in self._doc_ids if doc_id is not None]
+        self._doc_ids = list(live_ids)
+        self._doc_nos = {doc_id: doc_no for doc_no, doc_id in enumerate(live_ids)}
+        self._doc_lengths = array("I", (self._doc_lengths[doc_no] for doc_no in live))
+
+        postings = {}
+        for term, (doc_nos, freqs) in self._postings.items():
+            new_doc_nos, new_freqs = array("I"), array("H")
+            for doc_no, tf in zip(doc_nos, freqs):
+                new_no = renumber[doc_no]
+                if new_no >= 0:
+                    new_doc_nos.append(new_no)
+                    new_freqs.append(tf)
+            if new_doc_nos:
+                postings[term] = (new_doc_nos, new_freqs)
+        self._postings = postings
+
+        for field, index in self._metadata_index.items():
+            rebuilt = {}
+            for value, doc_nos in index.items():
+                new_doc_nos = array("I", (renumber[doc_no] for doc_no in doc_nos if renumber[doc_no] >= 0))
+                if new_doc_nos:
+                    rebuilt[value] = new_doc_nos
+            self._metadata_index[field] = rebuilt
+
+        self._tombstones = 0
+        self.compactions += 1
 
-        # Filter documents by metadata
-        for doc_id, metadata in self.metadatas.items():
-            matches = True
-            for k, v in metadata_filter.items():
-                if metadata.get(k) != v:
-                    matches = False
-                    break
+    def maybe_compact(self) -> bool:
+        """Compact if tombstones exceed COMPACTION_RATIO of indexed documents."""
+        self._purge_expired()
+        if self._tombstones and self._tombstones >= len(self._doc_ids) * self.COMPACTION_RATIO:
+            start = time.perf_counter()
+            self.compact()
+            logger.info(f"Memory compacted to {len(self.documents)} entries in {time.perf_counter() - start:.3f}s")
+            return True
+        return False
 
-            if matches:
-                matching_ids.append(doc_id)
+    def start_compaction(self, interval: Optional[float] = None) -> asyncio.Task:
+        """Start the background compaction task in the running event loop."""
+        if self._compaction_task is None or self._compaction_task.done():
+            interval = interval if interval is not None else settings.MEMORY_COMPACTION_INTERVAL
+            self._compaction_task = asyncio.create_task(self._compaction_loop(interval))
+        return self._compaction_task
 
-        # Sort by timestamp
-        matching_ids = sorted(
-            matching_ids, key=lambda doc_key: float(self.metadatas[doc_key].get("timestamp", "0")), reverse=True
-        )
+    async def stop_compaction(self) -> None:
+        """Stop the background compaction task."""
+        task, self._compaction_task = self._compaction_task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
 
-        # Get top N results
-        top_ids = matching_ids[:n_results]
+    async def _compaction_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.maybe_compact()
+            except Exception:
+                logger.exception("Memory compaction failed")
+
+    def _purge_expired(self) -> None:
+        """Drop every entry whose TTL has passed."""
+        heap = self._expiry_heap
+        now = time.monotonic()
+        while heap and heap[0][0] <= now:
+            expires_at, doc_id = heapq.heappop(heap)
+            if self._expires_at.get(doc_id) == expires_at:
+                self._remove(doc_id)
+                self.expirations += 1
+
+    def _enforce_capacity(self, keep: str) -> None:
+        """Evict entries until the store fits its entry and byte limits."""
+        while len(self.documents) > 1 and (
+            len(self.documents) > self.max_entries or self.resident_bytes > self.max_bytes
+        ):
+            victim = next(iter(self._access))
+            if victim == keep:
+                # Never evict the entry that is being stored
+                self._access.move_to_end(keep)
+                victim = next(iter(self._access))
+            self._remove(victim)
+            self.evictions += 1
+
+    def _remove(self, doc_id: str) -> None:
+        """Delete a document and leave a tombstone in the indexes."""
+        del self.documents[doc_id]
+        del self.metadatas[doc_id]
+        del self._access[doc_id]
+        self._expires_at.pop(doc_id, None)
+        self.resident_bytes -= self._sizes.pop(doc_id)
+        if self.vector_index is not None:
+            self.vector_index.remove(doc_id)
+
+        doc_no = self._doc_nos.pop(doc_id)
+        self._doc_ids[doc_no] = None
+        self._total_length -= self._doc_lengths[doc_no]
+        self._tombstones += 1
+
+    def _index(self, doc_id: str, document: str, metadata: dict[str, str]) -> None:
+        """Add a stored document to the keyword and metadata indexes."""
+        doc_no = len(self._doc_ids)
+        self._doc_ids.append(doc_id)
+        self._doc_nos[doc_id] = doc_no
+
+        term_counts = Counter(_tokenize(document))
+        for term, count in term_counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("H"))
+            postings[0].append(doc_no)
+            postings[1].append(min(count, 0xFFFF))
+
+        length = sum(term_counts.values())
+        self._doc_lengths.append(length)
+        self._total_length += length
+
+        for field, index in self._metadata_index.items():
+            value = metadata.get(field)
+            if value is not None:
+                index.setdefault(value, array("I")).append(doc_no)
+
+    def _score(self, terms: set[str]) -> dict[int, float]:
+        """Score documents containing any of `terms` with BM25."""
+        n_docs = len(self.documents)
+        postings = sorted((self._postings[t] for t in terms if t in self._postings), key=lambda p: len(p[0]))
+        if not n_docs or not postings:
+            return {}
+
+        selective = [p for p in postings if len(p[0]) <= n_docs * self.COMMON_TERM_RATIO] or postings
+        avg_length = self._total_length / n_docs or 1.0
+        k1, b = self.BM25_K1, self.BM25_B
+
+        scores: dict[int, float] = {}
+        for doc_nos, freqs in selective:
+            df = len(doc_nos)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_no, tf in zip(doc_nos, freqs):
+                if self._doc_ids[doc_no] is None:
+                    continue
+                norm = k1 * (1 - b + b * self._doc_lengths[doc_no] / avg_length)
+                scores[doc_no] = scores.get(doc_no, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+        return scores
+
+    def _most_recent(self, candidates: Iterable[int], metadata_filter: dict[str, str], n_results: int) -> list[str]:
+        """Take up to `n_results` live ids matching the filter from newest-first doc numbers."""
+        doc_ids: list[str] = []
+        for doc_no in candidates:
+            if len(doc_ids) >= n_results:
+                break
+            doc_id = self._doc_ids[doc_no]
+            if doc_id is None:
+                continue
+            metadata = self.metadatas[doc_id]
+            if all(metadata.get(k) == v for k, v in metadata_filter.items()):
+                doc_ids.append(doc_id)
+        return doc_ids
 
-        # Format results
+    def _format(self, doc_ids: list[str]) -> list[dict[str, Any]]:
+        """Parse stored documents and attach their metadata."""
         documents = []
-        for doc_id in top_ids:
+        for doc_id in doc_ids:
+            if self.eviction_policy == "lru":
+                self._access.move_to_end(doc_id)
             try:
                 parsed_doc = json.loads(self.documents[doc_id])
                 parsed_doc["metadata"] = self.metadatas[doc_id]
@@ -0,0 +1,228 @@
+import functools
+import itertools
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from ..config.settings import settings
+from ..core.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .vector_index import EmbeddingFunction
+
+# "- Label: value" lines, as in the agents' task prompts; the value is data, the label is template
+_FIELD_RE = re.compile(r"([ \t]*-?[ \t]*[A-Za-z][\w ()/'-]{0,40}?):[ \t]*(\S.*?)[ \t]*")
+_LIST_NUMBER_RE = re.compile(r"[ \t]*\d+[.)][ \t]+")
+# Only tried at word starts that can open an entity, which keeps the alternation off most positions
+_ENTITY_RE = re.compile(
+    r"\b(?=[A-Z0-9$]|[\w.+-]+@)(?:"
+    r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?"  # ISO dates and times
+    r"|[\w.+-]+@[\w-]+\.[\w.]+"  # email addresses
+    r"|[A-Z]{2}\d{1,4}\b|[A-Z]{3}\b"  # flight numbers and airport codes
+    r"|[A-Z][a-z]+(?: [A-Z][a-z]+)+\b"  # multi-word proper names
+    r"|\$?\d+(?:[.,:]\d+)*%?"  # numbers, amounts and times
+    r")"
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_prompt(prompt: str) -> tuple[str, tuple[tuple[str, str], ...]]:
+    """Split a prompt into its template and the slot values filled into it.
+
+    Field values ("- Traveler: Jane Doe") and entities in the prose (dates,
+    codes, numbers, names) become `<value>` placeholders in the lowercased,
+    whitespace-collapsed template. Slots are returned as sorted
+    (label, value) pairs, so reordering the fields keeps them equal.
+    Results are memoized, since the same prompt is normalized on lookup,
+    store and in-flight deduplication.
+    """
+    slots = []
+
+    def entity(match: re.Match) -> str:
+        slots.append(("", match.group(0).lower()))
+        return "<value>"
+
+    lines = []
+    for line in prompt.splitlines():
+        field = _FIELD_RE.fullmatch(line)
+        if field:
+            label = " ".join(field.group(1).lstrip(" \t-").lower().split())
+            slots.append((label, " ".join(field.group(2).lower().split())))
+            lines.append(f"{field.group(1)}: <value>")
+            continue
+        number = _LIST_NUMBER_RE.match(line)
+        if number:
+            line = line[number.end() :]
+        lines.append(_ENTITY_RE.sub(entity, line))
+    return " ".join(" ".join(lines).lower().split()), tuple(sorted(slots))
+
+
+@dataclass
+class PromptCacheHit:
+    """A cached completion and how closely its prompt matched."""
+
+    completion: Any
+    similarity: float
+    exact: bool
+
+
+@dataclass
+class _Entry:
+    key: tuple
+    group: tuple
+    completion: Any
+    expires_at: float
+
+
+class SemanticCache:
+    """Bounded cache of LLM completions that also answers near-duplicate prompts.
+
+    A prompt is normalized into a template plus slot values. A lookup is an
+    exact hit when both match a stored prompt. Otherwise the stored prompts
+    with the same slot values are compared by cosine similarity of their
+    template embeddings, and the best one at or above `threshold` is a hit,
+    so rephrased or reformatted instructions reuse a completion but a
+    prompt about a different flight or traveler never does. Vectors live
+    in a `VectorIndex`; entries expire after `ttl` and the least recently
+    used entry is evicted beyond `maxsize`.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = None,
+        embedding_function: Optional["EmbeddingFunction"] = None,
+        dim: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the cache; unset options fall back to settings."""
+        self.threshold = threshold if threshold is not None else settings.SEMANTIC_CACHE_THRESHOLD
+        self.maxsize = maxsize or settings.SEMANTIC_CACHE_MAXSIZE
+        self.ttl = ttl if ttl is not None else settings.SEMANTIC_CACHE_TTL
+        from .vector_index import VectorIndex  # deferred with numpy until a cache is built
+
+        self.index = VectorIndex(embedding_function=embedding_function, dim=dim)
+        self._clock = clock
+        self._ids = (str(i) for i in itertools.count())
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._exact: dict[tuple, str] = {}
+        self._groups: dict[tuple, set[str]] = {}
+        self._flight = SingleFlight("semantic_cache")
+        self._last_embedding: Optional[tuple[str, np.ndarray]] = None
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, prompt: str, namespace: str = "") -> Optional[PromptCacheHit]:
+        """Return a cached completion for this prompt or a near-duplicate of it, if any."""
+        template, slots = normalize_prompt(prompt)
+        entry_id = self._exact.get((namespace, template, slots))
+        if entry_id is not None and self._fresh(entry_id):
+            self.exact_hits += 1
+            self._entries.move_to_end(entry_id)
+            return PromptCacheHit(self._entries[entry_id].completion, 1.0, True)
+
+        candidates = [i for i in list(self._groups.get((namespace, slots), ())) if self._fresh(i)]
+        if candidates:
+            similarities = self.index.similarities(self._embed(template), candidates)
+            best = int(similarities.argmax())
+            if similarities[best] >= self.threshold:
+                self.semantic_hits += 1
+                self._entries.move_to_end(candidates[best])
+                return PromptCacheHit(self._entries[candidates[best]].completion, float(similarities[best]), False)
+
+        self.misses += 1
+        return None
+
+    def store(self, prompt: str, completion: Any, namespace: str = "") -> None:
+        """Cache the completion for a prompt, evicting the least recently used entry when full."""
+        template, slots = normalize_prompt(prompt)
+        key = (namespace, template, slots)
+        expires_at = self._clock() + self.ttl
+        entry_id = self._exact.get(key)
+        if entry_id is not None:
+            self._entries[entry_id].completion = completion
+            self._entries[entry_id].expires_at = expires_at
+            self._entries.move_to_end(entry_id)
+            return
+
+        entry_id = next(self._ids)
+        group = (namespace, slots)
+        self._entries[entry_id] = _Entry(key, group, completion, expires_at)
+        self._exact[key] = entry_id
+        self._groups.setdefault(group, set()).add(entry_id)
+        self.index.add_vectors([entry_id], self._embed(template)[None, :])
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def get_or_complete(self, prompt: str, complete: Callable[[str], Awaitable[Any]], namespace: str = "") -> Any:
+        """Return a cached completion, or call `complete` once for concurrent identical prompts."""
+        hit = self.lookup(prompt, namespace)
+        if hit is not None:
+            return hit.completion
+
+        key = (namespace, *normalize_prompt(prompt))
+        if self._flight.in_flight(key):
+            self.coalesced += 1
+
+        async def load() -> Any:
+            completion = await complete(prompt)
+            self.store(prompt, completion, namespace)
+            return completion
+
+        return await self._flight.do(key, load)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        for entry_id in list(self._entries):
+            self._remove(entry_id)
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        hits = self.exact_hits + self.semantic_hits
+        lookups = hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "threshold": self.threshold,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def _embed(self, template: str) -> "np.ndarray":
+        # A miss is usually followed by a store of the same prompt; embed it once
+        if self._last_embedding is None or self._last_embedding[0] != template:
+            self._last_embedding = (template, self.index.embedding_function([template])[0])
+        return self._last_embedding[1]
+
+    def _fresh(self, entry_id: str) -> bool:
+        if self._entries[entry_id].expires_at > self._clock():
+            return True
+        self._remove(entry_id)
+        return False
+
+    def _remove(self, entry_id: str) -> None:
+        entry = self._entries.pop(entry_id)
+        del self._exact[entry.key]
+        group = self._groups[entry.group]
+        group.discard(entry_id)
+        if not group:
+            del self._groups[entry.group]
+        self.index.remove(entry_id)
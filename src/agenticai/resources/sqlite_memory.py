@@ -0,0 +1,317 @@
+import asyncio
+import json
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Optional
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc_id TEXT NOT NULL UNIQUE,
+    collection TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    task TEXT NOT NULL,
+    memory_key TEXT,
+    timestamp REAL NOT NULL,
+    document TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_memories_timestamp ON memories (collection, timestamp);
+CREATE INDEX IF NOT EXISTS idx_memories_agent ON memories (collection, agent, timestamp);
+CREATE INDEX IF NOT EXISTS idx_memories_task ON memories (collection, task, timestamp);
+CREATE INDEX IF NOT EXISTS idx_memories_memory_key ON memories (collection, memory_key, timestamp);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(document, content='memories', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+    INSERT INTO memories_fts (rowid, document) VALUES (new.id, new.document);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+    INSERT INTO memories_fts (memories_fts, rowid, document) VALUES ('delete', old.id, old.document);
+END;
+"""
+
+_INSERT = """
+INSERT INTO memories (doc_id, collection, agent, task, memory_key, timestamp, document, metadata)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Metadata fields stored in their own indexed columns
+_COLUMNS = ("agent", "task", "memory_key")
+
+
+class SQLiteMemory:
+    """Persistent memory backend on SQLite with the same API as `Memory`.
+
+    The database runs in WAL mode, so readers never block the writer and
+    several uvicorn worker processes can share one file. `store()` only
+    enqueues the row; a writer thread commits queued rows in batches (group
+    commit), keeping disk I/O off the event loop. Reads flush pending writes
+    first so callers always see what they stored. Keyword search uses an
+    FTS5 index ranked with BM25.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = "flight_delay_system",
+        path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        """Initialize the backend; the database file is created on first use."""
+        self.collection_name = collection_name
+        self.path = path or os.path.join(settings.MEMORY_PERSIST_DIRECTORY, f"{settings.MEMORY_COLLECTION_NAME}.db")
+        self.batch_size = batch_size or settings.MEMORY_SQLITE_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else settings.MEMORY_SQLITE_FLUSH_INTERVAL
+
+        self.batches_committed = 0
+        self.rows_committed = 0
+
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._has_fts = True
+        self._closed = False
+
+    def store(
+        self, agent_name: str, task: str, result: dict[str, Any], metadata: Optional[dict[str, Any]] = None
+    ) -> str:
+        """Queue an agent interaction for storage and return its id."""
+        if self._closed:
+            raise RuntimeError("SQLiteMemory is closed")
+        self._ensure_started()
+
+        if metadata is None:
+            metadata = {}
+
+        # Create string-based metadata
+        string_metadata = {k: str(v) for k, v in metadata.items()}
+        string_metadata["agent"] = agent_name
+        string_metadata["task"] = task
+        timestamp = time.time()
+        string_metadata["timestamp"] = str(timestamp)
+
+        # Ids must stay unique across worker processes sharing the database
+        doc_id = f"{agent_name}_{int(timestamp)}_{uuid.uuid4().hex[:12]}"
+
+        self._queue.put((
+            doc_id,
+            self.collection_name,
+            agent_name,
+            task,
+            string_metadata.get("memory_key"),
+            timestamp,
+            json.dumps(result),
+            json.dumps(string_metadata),
+        ))
+        return doc_id
+
+    def retrieve(self, query: str, n_results: int = 5) -> list[dict[str, Any]]:
+        """Retrieve relevant memories based on a query, ranked by BM25."""
+        self.flush()
+        terms = _TOKEN_RE.findall(query.lower())
+        rows = []
+
+        if terms and self._has_fts:
+            match = " OR ".join(f'"{term}"' for term in terms)
+            rows = self._read(
+                """
+                SELECT m.document, m.metadata FROM memories_fts
+                JOIN memories m ON m.id = memories_fts.rowid
+                WHERE memories_fts MATCH ? AND m.collection = ?
+                ORDER BY bm25(memories_fts), m.timestamp DESC LIMIT ?
+                """,
+                (match, self.collection_name, n_results),
+            )
+        elif terms:
+            rows = self._read(
+                "SELECT document, metadata FROM memories WHERE collection = ? AND document LIKE ? "
+                "ORDER BY timestamp DESC LIMIT ?",
+                (self.collection_name, f"%{query}%", n_results),
+            )
+
+        if not rows:
+            # Fall back to the most recent documents
+            rows = self._read(
+                "SELECT document, metadata FROM memories WHERE collection = ? ORDER BY timestamp DESC LIMIT ?",
+                (self.collection_name, n_results),
+            )
+        return self._format(rows)
+
+    async def aretrieve(self, query: str, n_results: int = 5) -> list[dict[str, Any]]:
+        """`retrieve` without blocking the event loop on the flush and the query."""
+        return await asyncio.to_thread(self.retrieve, query, n_results)
+
+    def retrieve_by_agent(self, agent_name: str, n_results: int = 10) -> list[dict[str, Any]]:
+        """Retrieve memories related to a specific agent."""
+        return self._get_documents_by_metadata({"agent": agent_name}, n_results)
+
+    async def aretrieve_by_agent(self, agent_name: str, n_results: int = 10) -> list[dict[str, Any]]:
+        """`retrieve_by_agent` without blocking the event loop."""
+        return await self._aget_documents_by_metadata({"agent": agent_name}, n_results)
+
+    def _get_documents_by_metadata(self, metadata_filter: dict[str, str], n_results: int = 10) -> list[dict[str, Any]]:
+        """Get the most recent documents matching specific metadata filters."""
+        self.flush()
+        clauses = ["collection = ?"]
+        params: list[Any] = [self.collection_name]
+        for key, value in metadata_filter.items():
+            if key in _COLUMNS:
+                clauses.append(f"{key} = ?")
+                params.append(value)
+            else:
+                clauses.append("json_extract(metadata, ?) = ?")
+                params.extend((f'$."{key}"', value))
+        params.append(n_results)
+
+        rows = self._read(
+            f"SELECT document, metadata FROM memories WHERE {' AND '.join(clauses)} ORDER BY timestamp DESC LIMIT ?",  # noqa: S608
+            tuple(params),
+        )
+        return self._format(rows)
+
+    async def _aget_documents_by_metadata(
+        self, metadata_filter: dict[str, str], n_results: int = 10
+    ) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self._get_documents_by_metadata, metadata_filter, n_results)
+
+    def flush(self) -> None:
+        """Block until every queued write has been committed."""
+        writer = self._writer
+        if writer is None or self._pid != os.getpid() or not writer.is_alive():
+            # Nothing left to drain the queue once the writer has stopped
+            return
+        self._queue.join()
+
+    def close(self) -> None:
+        """Commit pending writes, stop the writer thread and close connections."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._writer is not None and self._pid == os.getpid():
+            self._queue.put(None)
+            self._writer.join()
+        self._writer = None
+        for conn in self._connections:
+            conn.close()
+        self._connections.clear()
+
+    async def aclose(self) -> None:
+        """Close without blocking the event loop while the last batch commits."""
+        await asyncio.to_thread(self.close)
+
+    def stats(self) -> dict[str, Any]:
+        """Return write batching counters."""
+        return {
+            "path": self.path,
+            "pending": self._queue.qsize(),
+            "batches_committed": self.batches_committed,
+            "rows_committed": self.rows_committed,
+            "avg_batch_size": self.rows_committed / self.batches_committed if self.batches_committed else 0.0,
+        }
+
+    def _ensure_started(self) -> None:
+        """Create the schema and writer thread once per process."""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            if self._closed:
+                raise RuntimeError("SQLiteMemory is closed")
+            # Connections and threads do not survive fork; start fresh in this process
+            self._queue = queue.Queue()
+            self._local = threading.local()
+            self._connections = []
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = self._connect()
+            conn.executescript(_SCHEMA)
+            try:
+                conn.executescript(_FTS_SCHEMA)
+            except sqlite3.OperationalError as e:
+                logger.warning(f"SQLite FTS5 unavailable, falling back to LIKE search: {e}")
+                self._has_fts = False
+
+            self._writer = threading.Thread(
+                target=self._write_loop, args=(conn,), name="sqlite-memory-writer", daemon=True
+            )
+            self._pid = pid
+            self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        self._connections.append(conn)
+        return conn
+
+    def _read(self, sql: str, params: tuple) -> list[tuple[str, str]]:
+        self._ensure_started()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn.execute(sql, params).fetchall()
+
+    def _write_loop(self, conn: sqlite3.Connection) -> None:
+        """Drain the queue, committing everything available as one transaction."""
+        stop = False
+        while not stop:
+            items = [self._queue.get()]
+            # Linger briefly so concurrent stores share a commit
+            deadline = time.monotonic() + self.flush_interval
+            while items[-1] is not None and len(items) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    items.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = items[-1] is None
+            rows = [item for item in items if item is not None]
+            if rows:
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.executemany(_INSERT, rows)
+                    conn.execute("COMMIT")
+                    self.batches_committed += 1
+                    self.rows_committed += len(rows)
+                except sqlite3.Error:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    logger.exception(f"Failed to commit {len(rows)} memories")
+            for _ in items:
+                self._queue.task_done()
+
+    @staticmethod
+    def _format(rows: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        """Parse stored documents and attach their metadata."""
+        documents = []
+        for document, metadata in rows:
+            try:
+                parsed_doc = json.loads(document)
+                parsed_doc["metadata"] = json.loads(metadata)
+                documents.append(parsed_doc)
+            except json.JSONDecodeError:
+                # Skip documents that can't be parsed
+                continue
+        return documents
@@ -0,0 +1,205 @@
+import math
+import re
+import zlib
+from collections.abc import Sequence
+from typing import Callable, Optional
+
+import numpy as np
+
+from ..config.settings import settings
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+EmbeddingFunction = Callable[[Sequence[str]], np.ndarray]
+
+
+class HashingEmbedder:
+    """Deterministic offline embedder using signed feature hashing.
+
+    Word unigrams and bigrams are hashed (with a process-independent CRC32)
+    into `dim` buckets and the result is L2-normalised, so cosine
+    similarity is a plain dot product. No model download is needed.
+    """
+
+    def __init__(self, dim: int = 256):
+        """Initialize the embedder."""
+        self.dim = dim
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed a batch of texts into a (len(texts), dim) float32 matrix."""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN_RE.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                h = zlib.crc32(feature.encode())
+                vectors[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+class VectorIndex:
+    """Cosine-similarity index over a contiguous float32 matrix.
+
+    Small collections are searched exactly with one matrix product per
+    query batch. Once the collection reaches `ivf_threshold` vectors an
+    inverted-file (IVF) index is built with spherical k-means, and queries
+    only score the vectors in the `n_probe` nearest lists. Removed vectors
+    are masked out and dropped when the matrix is compacted.
+    """
+
+    # Compact once masked-out rows exceed this share of the matrix
+    COMPACTION_RATIO = 0.25
+    # Rebuild the IVF lists once this share of rows was added after the last build
+    REBUILD_RATIO = 0.2
+
+    def __init__(
+        self,
+        embedding_function: Optional[EmbeddingFunction] = None,
+        dim: Optional[int] = None,
+        ivf_threshold: Optional[int] = None,
+        n_lists: Optional[int] = None,
+        n_probe: Optional[int] = None,
+        kmeans_iterations: int = 10,
+    ):
+        """Initialize the index; unset options fall back to settings."""
+        self.dim = dim or settings.EMBEDDING_DIM
+        self.embedding_function = embedding_function or HashingEmbedder(self.dim)
+        self.ivf_threshold = ivf_threshold if ivf_threshold is not None else settings.VECTOR_IVF_THRESHOLD
+        self.n_lists = n_lists
+        self.n_probe = n_probe or settings.VECTOR_IVF_N_PROBE
+        self.kmeans_iterations = kmeans_iterations
+
+        self._vectors = np.zeros((1024, self.dim), dtype=np.float32)
+        self._live = np.zeros(1024, dtype=bool)
+        self._size = 0  # rows in use, including removed ones
+        self._ids: list[Optional[str]] = []
+        self._rows: dict[str, int] = {}
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: list[np.ndarray] = []
+        self._unlisted_start = 0  # rows from here on were added after the IVF build
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, ids: Sequence[str], texts: Sequence[str]) -> None:
+        """Embed and add documents."""
+        self.add_vectors(ids, self.embedding_function(texts))
+
+    def add_vectors(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """Add pre-computed, L2-normalised vectors."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        for doc_id in ids:
+            if doc_id in self._rows:
+                self.remove(doc_id)
+
+        needed = self._size + len(ids)
+        if needed > len(self._vectors):
+            capacity = max(needed, 2 * len(self._vectors))
+            self._vectors = np.resize(self._vectors, (capacity, self.dim))
+            self._live = np.resize(self._live, capacity)
+            self._live[self._size :] = False
+
+        rows = slice(self._size, needed)
+        self._vectors[rows] = vectors
+        self._live[rows] = True
+        for offset, doc_id in enumerate(ids):
+            self._rows[doc_id] = self._size + offset
+        self._ids.extend(ids)
+        self._size = needed
+
+    def remove(self, doc_id: str) -> bool:
+        """Mask out a vector; returns whether it was present."""
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return False
+        self._live[row] = False
+        self._ids[row] = None
+        if self._size - len(self._rows) > self._size * self.COMPACTION_RATIO:
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Drop masked-out rows so the matrix is contiguous again."""
+        keep = np.flatnonzero(self._live[: self._size])
+        self._vectors[: len(keep)] = self._vectors[keep]
+        self._live[:] = False
+        self._live[: len(keep)] = True
+        live_ids = [doc_id for row in keep if (doc_id := self._ids[row]) is not None]
+        self._ids = list(live_ids)
+        self._rows = {doc_id: row for row, doc_id in enumerate(live_ids)}
+        self._size = len(keep)
+        self._centroids = None
+
+    def search(self, queries: Sequence[str], k: int = 5, exact: bool = False) -> list[list[tuple[str, float]]]:
+        """Return the top-k (id, cosine similarity) pairs for each query text."""
+        return self.search_vectors(self.embedding_function(queries), k, exact)
+
+    def search_vectors(self, queries: np.ndarray, k: int = 5, exact: bool = False) -> list[list[tuple[str, float]]]:
+        """Return the top-k (id, cosine similarity) pairs for each query vector."""
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        if not self._rows:
+            return [[] for _ in range(len(queries))]
+
+        if exact or len(self._rows) < self.ivf_threshold:
+            return self._search_exact(queries, k)
+
+        centroids = self._ensure_ivf()
+        return [self._search_ivf(query, centroids, k) for query in queries]
+
+    def similarities(self, query: np.ndarray, ids: Sequence[str]) -> np.ndarray:
+        """Cosine similarity of one query vector to each of the given documents."""
+        rows = [self._rows[doc_id] for doc_id in ids]
+        return self._vectors[rows] @ np.asarray(query, dtype=np.float32)
+
+    def _search_exact(self, queries: np.ndarray, k: int) -> list[list[tuple[str, float]]]:
+        """Brute force: one (queries x rows) matrix product for the whole batch."""
+        scores = queries @ self._vectors[: self._size].T
+        scores[:, ~self._live[: self._size]] = -np.inf
+        return [self._top_k(row_scores, np.arange(self._size), k) for row_scores in scores]
+
+    def _search_ivf(self, query: np.ndarray, centroids: np.ndarray, k: int) -> list[tuple[str, float]]:
+        probe = np.argpartition(-(centroids @ query), min(self.n_probe, len(centroids)) - 1)
+        candidates = np.concatenate(
+            [self._lists[c] for c in probe[: self.n_probe]] + [np.arange(self._unlisted_start, self._size)]
+        )
+        candidates = candidates[self._live[candidates]]
+        return self._top_k(self._vectors[candidates] @ query, candidates, k)
+
+    def _top_k(self, scores: np.ndarray, rows: np.ndarray, k: int) -> list[tuple[str, float]]:
+        top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return [(self._ids[rows[i]], float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    def _ensure_ivf(self) -> np.ndarray:
+        """Build the IVF lists, or rebuild them once enough rows were added since; returns the centroids."""
+        if self._centroids is not None and self._size - self._unlisted_start <= self._size * self.REBUILD_RATIO:
+            return self._centroids
+
+        live_rows = np.flatnonzero(self._live[: self._size])
+        data = self._vectors[live_rows]
+        n_lists = self.n_lists or max(1, int(math.sqrt(len(live_rows))))
+        rng = np.random.default_rng(0)
+
+        # Spherical k-means on a sample, then assign every row to its nearest centroid
+        sample = data[rng.choice(len(data), min(len(data), n_lists * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self.kmeans_iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        assignment = np.empty(len(live_rows), dtype=np.int64)
+        for start in range(0, len(live_rows), 65536):
+            assignment[start : start + 65536] = np.argmax(data[start : start + 65536] @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        boundaries = np.searchsorted(assignment[order], np.arange(1, n_lists))
+
+        self._centroids = centroids.astype(np.float32)
+        self._lists = np.split(live_rows[order], boundaries)
+        self._unlisted_start = self._size
+        return self._centroids
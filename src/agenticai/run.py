@@ -16,7 +16,7 @@ if not os.path.exists("tmp"):
 os.environ["TMPDIR"] = os.path.abspath("tmp")
 
 # Then import and run the API
-from agenticai.api import run_server
+from agenticai.run_api import run_server
 
 if __name__ == "__main__":
     run_server()
@@ -1,14 +1,344 @@
+import argparse
+import asyncio
+import contextlib
+import gc
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Any, Optional
+
 import uvicorn
+from uvicorn.importer import import_from_string
 
 from .config.settings import settings
 
+logger = logging.getLogger(__name__)
+
+APP = "agenticai.api:app"
+# Seconds a stopping worker waits, no longer accepting, for connections it just accepted to send their request
+ACCEPTED_GRACE = 0.5
+
+
+def available_cores() -> int:
+    """CPU cores this process may run on (respects container CPU sets)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class _WorkerServer(uvicorn.Server):
+    """Uvicorn server that tells the supervisor once the app has started."""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self._ready_fd = ready_fd
+
+    async def startup(self, sockets: Optional[list[socket.socket]] = None) -> None:
+        await super().startup(sockets)
+        if not self.should_exit:
+            os.write(self._ready_fd, b"1")
+        os.close(self._ready_fd)
+
+    async def shutdown(self, sockets: Optional[list[socket.socket]] = None) -> None:
+        # uvicorn closes connections that have not sent a request yet; one accepted just before
+        # SIGTERM would be reset, while other workers keep serving the shared socket
+        for server in self.servers:
+            server.close()
+        await asyncio.sleep(ACCEPTED_GRACE)
+        await super().shutdown(sockets)
+
+
+class Supervisor:
+    """Pre-forking process manager running the API on several uvicorn workers.
+
+    The supervisor binds the listening socket, imports the app and loads
+    reference data (see `AgentRegistry.preload`), then forks the workers.
+    They all accept on the inherited socket and share the preloaded
+    modules and data copy-on-write; each builds its own registry, event
+    loop and connection pools in the app lifespan.
+
+    Workers that die are replaced. SIGHUP restarts them one at a time: a
+    new worker must finish starting before an old one is sent SIGTERM and
+    given `graceful_timeout` seconds to drain, so capacity never drops.
+    With `preload` the restarted workers run the code the supervisor
+    loaded; without it each worker imports the app itself, so a rolling
+    restart also picks up new code. SIGTERM or SIGINT stops everything.
+    """
+
+    def __init__(
+        self,
+        app: str = APP,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        workers: Optional[int] = None,
+        backlog: Optional[int] = None,
+        keepalive: Optional[int] = None,
+        graceful_timeout: Optional[int] = None,
+        loop: Optional[str] = None,
+        http: Optional[str] = None,
+        preload: Optional[bool] = None,
+    ):
+        """Initialize the supervisor; unset options fall back to settings."""
+        self.app = app
+        self.host = host or settings.SERVER_HOST
+        self.port = port if port is not None else settings.SERVER_PORT
+        self.num_workers = workers or settings.SERVER_WORKERS or available_cores()
+        self.backlog = backlog or settings.SERVER_BACKLOG
+        self.keepalive = keepalive if keepalive is not None else settings.SERVER_KEEPALIVE
+        self.graceful_timeout = graceful_timeout if graceful_timeout is not None else settings.SERVER_GRACEFUL_TIMEOUT
+        self.loop = loop or settings.SERVER_LOOP
+        self.http = http or settings.SERVER_HTTP
+        self.preload = settings.SERVER_PRELOAD if preload is None else preload
+
+        self.workers: set[int] = set()  # serving, or starting up
+        self._booting: dict[int, int] = {}  # pid -> read end of its readiness pipe
+        self._retiring: set[int] = set()
+        self._socket: Optional[socket.socket] = None
+        self._target: Any = app
+        self._stopping = False
+        self._restart_requested = False
+
+        self.spawned = 0
+        self.restarts = 0
+
+    def run(self) -> int:
+        """Serve until stopped; returns the process exit code."""
+        self._socket = self._bind()
+        if self.preload:
+            self._target = self._load()
+        logger.info(
+            f"Serving {self.app} on http://{self.host}:{self.port} with {self.num_workers} workers "
+            f"(loop={self.loop}, http={self.http}, preload={self.preload})"
+        )
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_restart)
+        try:
+            for _ in range(self.num_workers):
+                self._spawn()
+            while not self._stopping:
+                if self._restart_requested:
+                    self._restart_requested = False
+                    self._rolling_restart()
+                if self._poll(0.5):
+                    logger.error("A worker exited before it finished starting; stopping")
+                    return 3
+                while len(self.workers) < self.num_workers and not self._stopping:
+                    logger.warning("Replacing a worker that exited")
+                    self._spawn()
+            return 0
+        finally:
+            self._stop_all()
+            self._socket.close()
+
+    def _bind(self) -> socket.socket:
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(self.backlog)
+        sock.set_inheritable(True)
+        if self.port == 0:
+            self.port = sock.getsockname()[1]
+        return sock
+
+    def _load(self) -> Any:
+        """Import the app and its reference data, then freeze them out of the GC."""
+        from .registry import AgentRegistry
+
+        target = import_from_string(self.app)
+        AgentRegistry.preload()
+        # Keep the collector from writing to (and so copying) the pages of preloaded objects
+        gc.collect()
+        gc.freeze()
+        return target
+
+    def _spawn(self) -> int:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            self._serve(write_fd)  # never returns
+        os.close(write_fd)
+        self.workers.add(pid)
+        self._booting[pid] = read_fd
+        self.spawned += 1
+        return pid
+
+    def _serve(self, ready_fd: int) -> None:
+        """Worker process body."""
+        code = 1
+        try:
+            for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+                signal.signal(sig, signal.SIG_DFL)
+            config = uvicorn.Config(
+                self._target,
+                loop=self.loop,
+                http=self.http,
+                lifespan="on",
+                backlog=self.backlog,
+                timeout_keep_alive=self.keepalive,
+                timeout_graceful_shutdown=self.graceful_timeout,
+            )
+            server = _WorkerServer(config, ready_fd)
+            server.run(sockets=[self._socket] if self._socket is not None else None)
+            code = 0 if server.started else 3
+        except BaseException:
+            logger.exception("Worker crashed")
+        finally:
+            os._exit(code)
+
+    def _poll(self, timeout: float) -> bool:
+        """Wait up to `timeout` for readiness reports and reap exited workers.
+
+        Returns True if a worker exited before becoming ready.
+        """
+        self._wait_for_ready(timeout)
+        return self._reap()
+
+    def _wait_for_ready(self, timeout: float) -> None:
+        """Mark booting workers that report ready within `timeout` as booted."""
+        if not self._booting:
+            time.sleep(timeout)
+            return
+        try:
+            readable, _, _ = select.select(list(self._booting.values()), [], [], timeout)
+        except InterruptedError:
+            readable = []
+        for pid, fd in list(self._booting.items()):
+            if fd in readable and os.read(fd, 1):
+                os.close(fd)
+                del self._booting[pid]
+
+    def _reap(self) -> bool:
+        """Collect exited workers; True if one of them exited before becoming ready."""
+        failed_boot = False
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            self.workers.discard(pid)
+            pipe = self._booting.pop(pid, None)
+            if pipe is not None:
+                os.close(pipe)
+                failed_boot = failed_boot or not self._stopping
+            if pid in self._retiring:
+                self._retiring.discard(pid)
+            elif not self._stopping:
+                logger.warning(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}")
+        return failed_boot
+
+    def _rolling_restart(self) -> None:
+        """Replace the workers one at a time, each only once its replacement is up."""
+        logger.info(f"Rolling restart of {len(self.workers)} workers")
+        for old in list(self.workers):
+            if self._stopping or old not in self.workers:
+                continue
+            new = self._spawn()
+            deadline = time.monotonic() + max(self.graceful_timeout, 10)
+            while new in self._booting and time.monotonic() < deadline and not self._stopping:
+                if self._poll(0.1) and new not in self.workers:
+                    logger.error("Replacement worker failed to start; keeping the remaining old workers")
+                    return
+            if new in self._booting:
+                logger.error("Replacement worker did not start in time; keeping the remaining old workers")
+                self._retire([new])
+                return
+            self._retire([old])
+        self.restarts += 1
+        logger.info("Rolling restart complete")
+
+    def _retire(self, pids: list[int]) -> None:
+        """SIGTERM workers and wait for them to drain, killing those that overrun."""
+        for pid in pids:
+            self._retiring.add(pid)
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self._retiring & set(pids) and time.monotonic() < deadline:
+            self._poll(0.1)
+        for pid in self._retiring & set(pids):
+            logger.warning(f"Worker {pid} did not stop in time; killing it")
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self._retiring.discard(pid)
+            self.workers.discard(pid)
+            fd = self._booting.pop(pid, None)
+            if fd is not None:
+                os.close(fd)
+
+    def _stop_all(self) -> None:
+        self._stopping = True
+        if self.workers:
+            logger.info(f"Stopping {len(self.workers)} workers")
+            self._retire(list(self.workers))
+
+    def _handle_stop(self, signum: int, frame: Any) -> None:
+        self._stopping = True
+
+    def _handle_restart(self, signum: int, frame: Any) -> None:
+        self._restart_requested = True
+
+
+def run_server(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    reload: Optional[bool] = None,
+) -> None:
+    """Run the FastAPI server.
+
+    In development this is a single auto-reloading uvicorn process;
+    otherwise a `Supervisor` runs one worker per core (or SERVER_WORKERS).
+    """
+    host = host or settings.SERVER_HOST
+    port = port if port is not None else settings.SERVER_PORT
+    reload = settings.ENV == "development" and not workers if reload is None else reload
+    if reload:
+        uvicorn.run(APP, host=host, port=port, reload=True)
+        return
+    if not hasattr(os, "fork"):
+        # No fork on this platform: let uvicorn spawn the workers, without preloading
+        uvicorn.run(
+            APP,
+            host=host,
+            port=port,
+            workers=workers or settings.SERVER_WORKERS or available_cores(),
+            loop=settings.SERVER_LOOP,
+            http=settings.SERVER_HTTP,
+            backlog=settings.SERVER_BACKLOG,
+            timeout_keep_alive=settings.SERVER_KEEPALIVE,
+            timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        )
+        return
+    sys.exit(Supervisor(host=host, port=port, workers=workers).run())
+
 
-def run_server():
-    """Run the FastAPI server with uvicorn"""
-    # Use 127.0.0.1 for development (localhost only) and host specified in settings for prod
-    host = "127.0.0.1" if settings.ENV == "development" else settings.get("HOST", "127.0.0.1")
-    uvicorn.run("agenticai.api:app", host=host, port=8000, reload=settings.ENV == "development")
+def main() -> None:
+    """Command-line entry point; unset options fall back to settings."""
+    parser = argparse.ArgumentParser(description="Run the Flight Delay Response System API.")
+    parser.add_argument("--host", help=f"bind address (default {settings.SERVER_HOST})")
+    parser.add_argument("--port", type=int, help=f"bind port (default {settings.SERVER_PORT})")
+    parser.add_argument("--workers", type=int, help="worker processes (default: SERVER_WORKERS, else one per core)")
+    parser.add_argument(
+        "--reload",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="single auto-reloading process (default in development without --workers)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=settings.LOGGING_LEVEL, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    run_server(host=args.host, port=args.port, workers=args.workers, reload=args.reload)
 
 
 if __name__ == "__main__":
-    run_server()
+    main()
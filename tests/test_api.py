@@ -0,0 +1,251 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agenticai import api
+from agenticai.api import app, sse_stream
+from agenticai.core import Monitoring
+from agenticai.core.events import EventBus
+
+FLIGHT = {
+    "flight_number": "AA123",
+    "origin": "JFK",
+    "destination": "LAX",
+    "scheduled_departure": "2024-03-24T10:00:00Z",
+}
+
+
+@pytest.fixture(autouse=True)
+def _isolated_data_dir(tmp_path, monkeypatch):
+    # The registry's FileSystem writes trip documents under ./data
+    monkeypatch.chdir(tmp_path)
+
+
+def test_registry_is_built_once_and_shared():
+    with TestClient(app) as client:
+        registry = app.state.registry
+        assert registry.started
+        assert registry.warmup_seconds is not None
+
+        memory = registry.resources["memory"]
+        for _ in range(3):
+            response = client.post(
+                "/api/chat",
+                json={"messages": [{"role": "user", "content": "what is the status?"}], "flight_data": FLIGHT},
+            )
+            assert response.status_code == 200
+
+        assert app.state.registry is registry
+        assert len(memory.documents) == 3
+        assert client.get("/").json()["warmup_seconds"] == registry.warmup_seconds
+
+    assert not registry.started
+
+
+def test_flight_status_uses_registry_agents():
+    with TestClient(app) as client:
+        response = client.post("/api/flight/status", json=FLIGHT)
+        assert response.status_code == 200
+        assert response.json()["flight_number"] == "AA123"
+
+
+def test_metrics_endpoint_reports_routes_agents_and_components():
+    with TestClient(app) as client:
+        for _ in range(2):
+            assert client.post("/api/flight/status", json=FLIGHT).status_code == 200
+        assert client.get("/no/such/path").status_code == 404
+        response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert 'agenticai_http_requests_total{method="POST",route="/api/flight/status",status="200"} 2' in lines
+    assert 'agenticai_http_requests_total{method="GET",route="unmatched",status="404"} 1' in lines
+    assert 'agenticai_agent_executions_total{agent="FlightDelayScanner",task="analyze_delay"} 2' in lines
+    labels = 'agent="FlightDelayScanner",task="analyze_delay",outcome="ok"'
+    assert f"agenticai_agent_task_duration_seconds_count{{{labels}}} 2" in lines
+    assert any(line.startswith("agenticai_scheduler_monitors ") for line in lines)
+    assert any(
+        line.startswith('agenticai_governor_agent_admitted_total{agent="StakeholderNotifier"}') for line in lines
+    )
+
+
+def test_debug_traces_shows_nested_agent_spans():
+    traceparent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+    with TestClient(app) as client:
+        headers = {"traceparent": traceparent, "Cache-Control": "no-store"}
+        assert client.post("/api/flight/status", json=FLIGHT, headers=headers).status_code == 200
+        traces = client.get("/debug/traces", params={"route": "POST /api/flight/status"}).json()["traces"]
+        otlp = client.get("/debug/traces", params={"route": "POST /api/flight/status", "format": "otlp"}).json()
+
+    trace = next(t for t in traces if t["trace_id"] == "0af7651916cd43dd8448eb211c80319c")
+    root = trace["root"]
+    assert root["attributes"]["http.status_code"] == 200
+    assert [child["name"] for child in root["children"]] == ["FlightDelayScannerAgent.analyze_delay"]
+    assert otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+
+def test_agent_cache_honours_cache_control():
+    with TestClient(app) as client:
+        for headers in ({}, {}, {"Cache-Control": "no-store"}):
+            assert client.post("/api/flight/status", json=FLIGHT, headers=headers).status_code == 200
+        stats = client.get("/api/agents/cache").json()["flight_delay_scanner"]
+        assert stats["methods"]["_analyze_delay"]["hits"] == 1
+        assert stats["bypassed"] == 1
+
+        cleared = client.delete("/api/agents/flight_delay_scanner/cache").json()
+        assert cleared["methods"]["_analyze_delay"]["size"] == 0
+        assert client.delete("/api/agents/flight_delay_scanner/cache?method=nope").status_code == 400
+
+
+def test_status_and_chat_share_the_delay_analysis_cache():
+    with TestClient(app) as client:
+        assert client.post("/api/flight/status", json=FLIGHT).json()["date"] == "2024-03-24"
+        response = client.post(
+            "/api/chat",
+            json={"messages": [{"role": "user", "content": "is my flight delayed?"}], "flight_data": FLIGHT},
+        )
+        assert response.status_code == 200
+        stats = client.get("/api/agents/cache").json()["flight_delay_scanner"]
+        assert stats["methods"]["_analyze_delay"]["hits"] == 1
+
+
+def test_monitor_endpoints():
+    flight = dict(FLIGHT, scheduled_departure="2099-01-01T10:00:00Z")
+    with TestClient(app) as client:
+        trip_id = client.post("/api/flight/monitor", json=flight).json()["trip_id"]
+
+        monitors = client.get("/api/monitors").json()["monitors"]
+        assert [m["trip_id"] for m in monitors] == [trip_id]
+        assert client.post(f"/api/monitors/{trip_id}/pause").json()["state"] == "paused"
+        assert client.post(f"/api/monitors/{trip_id}/resume").json()["state"] == "active"
+        assert client.delete(f"/api/monitors/{trip_id}").json()["state"] == "cancelled"
+        assert client.get(f"/api/monitors/{trip_id}").status_code == 404
+
+
+def test_flight_status_batch_streams_ndjson():
+    flights = [dict(FLIGHT, flight_number=f"AA{i}") for i in range(300)] + [FLIGHT]
+    with TestClient(app) as client:
+        response = client.post("/api/flight/status:batch", json=flights)
+        single = client.post("/api/flight/status", json=FLIGHT).json()
+        # FLIGHT repeats AA123 from an earlier chunk, and the single request reads what the batch cached
+        stats = client.get("/api/agents/cache").json()["flight_delay_scanner"]
+        assert stats["methods"]["_analyze_delay"]["hits"] == 2
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["flight_number"] for r in results] == [f["flight_number"] for f in flights]
+    assert results[-1] == single
+
+
+def parse_sse(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_chat_stream_sends_progress_events():
+    body = {"messages": [{"role": "user", "content": "any alternative flights?"}], "flight_data": FLIGHT}
+    with TestClient(app) as client:
+        reply = client.post("/api/chat", json=body).json()["response"]
+        response = client.post("/api/chat/stream", json=body)
+        ttfb = app.state.registry.resources["monitoring"].timing_stats()["chat_stream_ttfb"]
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    names = [name for name, _ in events]
+    assert names[:3] == ["route", "tool_call", "tool_result"]
+    assert names[-1] == "done"
+    assert events[0][1]["agent"] == "alternative_route_suggester"
+    assert "".join(data["text"] for name, data in events if name == "delta") == reply
+    assert events[-1][1]["response"] == reply
+    assert ttfb["count"] == 1
+
+
+def test_chat_stream_disconnect_cancels_agent_work():
+    cancelled = asyncio.Event()
+
+    async def slow_events():
+        yield "route", {"agent": "weather_checker"}
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        yield "done", {"response": "too late"}
+
+    class DisconnectingRequest:
+        async def receive(self):
+            await asyncio.sleep(0.05)
+            return {"type": "http.disconnect"}
+
+    async def run():
+        stream = sse_stream(DisconnectingRequest(), slow_events(), Monitoring(), 0.0)
+        chunks = [chunk async for chunk in stream]
+        await asyncio.wait_for(cancelled.wait(), 1)
+        return chunks
+
+    chunks = asyncio.run(run())
+    assert len(chunks) == 1 and chunks[0].startswith("event: route")
+
+
+def test_trip_websocket_pushes_monitor_changes():
+    flight = dict(FLIGHT, scheduled_departure="2099-01-01T10:00:00Z")
+    with TestClient(app) as client:
+        trip_id = client.post("/api/flight/monitor", json=flight).json()["trip_id"]
+        with client.websocket_connect(f"/ws/trips/{trip_id}") as websocket:
+            client.post(f"/api/monitors/{trip_id}/pause")
+            event = websocket.receive_json()
+            while event["type"] != "monitor":
+                event = websocket.receive_json()
+
+    assert event["trip_id"] == trip_id
+    assert event["data"]["state"] == "paused"
+
+
+def test_trip_streams_skip_updates_already_replayed_from_history(monkeypatch):
+    boarding = {"status": "boarding", "timestamp": "2099-01-01T09:30:00"}
+    departed = {"status": "departed", "timestamp": "2099-01-01T10:05:00"}
+
+    async def racing_history(resources, trip_id, n):
+        # Both updates are published after the subscription; only the first made it into the log
+        for update in (boarding, departed):
+            resources["event_bus"].publish(trip_id, {"type": "status", "trip_id": trip_id, "data": update})
+        return [boarding]
+
+    monkeypatch.setattr(api, "_trip_history", racing_history)
+    with TestClient(app) as client, client.websocket_connect("/ws/trips/trip1?history=1") as websocket:
+        assert [websocket.receive_json()["data"] for _ in range(2)] == [boarding, departed]
+
+    class ConnectedRequest:
+        async def receive(self):
+            await asyncio.Event().wait()
+
+    async def read_sse():
+        bus = EventBus()
+        response = await api.trip_updates_sse("trip1", ConnectedRequest(), {"event_bus": bus}, history=1)
+        events = []
+        async for chunk in response.body_iterator:
+            events.append(json.loads(chunk.split("data: ", 1)[1])["data"])
+            if len(events) == 2:
+                break
+        await response.body_iterator.aclose()
+        return events, bus
+
+    events, bus = asyncio.run(read_sse())
+    assert events == [boarding, departed]
+    assert not bus._subscribers.get("trip1")
+
+
+def test_trip_sse_unsubscribes_when_history_fails(monkeypatch):
+    async def failing_history(resources, trip_id, n):
+        raise OSError
+
+    monkeypatch.setattr(api, "_trip_history", failing_history)
+    bus = EventBus()
+    with pytest.raises(OSError):
+        asyncio.run(api.trip_updates_sse("trip1", None, {"event_bus": bus}, history=5))
+    assert not bus._subscribers.get("trip1")
@@ -0,0 +1,69 @@
+import asyncio
+
+from agenticai.agents import WeatherCheckerAgent
+from agenticai.core.cache import TTLCache, time_bucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_expiry_and_lru_eviction():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, maxsize=2, clock=clock)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_concurrent_misses_are_coalesced():
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"temp": 20}
+
+    async def run():
+        cache = TTLCache(ttl=60)
+        results = await asyncio.gather(*(cache.get_or_set("JFK", factory) for _ in range(10)))
+        assert all(r == {"temp": 20} for r in results)
+        assert await cache.get_or_set("JFK", factory) == {"temp": 20}
+        return cache
+
+    cache = asyncio.run(run())
+    assert calls == 1
+    assert (cache.misses, cache.coalesced, cache.hits) == (1, 9, 1)
+
+
+def test_time_bucket_groups_nearby_timestamps():
+    assert time_bucket(300, "2024-03-24T10:00:00Z") == time_bucket(300, "2024-03-24T10:04:59+00:00")
+    assert time_bucket(300, "2024-03-24T10:00:00Z") != time_bucket(300, "2024-03-24T10:05:00Z")
+
+
+def test_weather_checker_caches_conditions_per_bucket():
+    agent = WeatherCheckerAgent()
+
+    async def run():
+        first = await agent.check_weather("jfk", "2024-03-24T10:00:00Z")
+        second = await agent.check_weather("JFK", "2024-03-24T10:01:00Z")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["condition"] == second["condition"] == "Clear"
+    assert second["airport"] == "JFK"
+    assert second["timestamp"] == "2024-03-24T10:01:00Z"
+    assert agent.cache.stats()["hits"] == 1
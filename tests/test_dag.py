@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from agenticai.core.dag import GraphTask, TaskGraph, TaskGraphError
+
+
+def sleeper(value, delay=0.05):
+    async def func(ctx):
+        await asyncio.sleep(delay)
+        return value
+
+    return func
+
+
+def test_independent_tasks_run_concurrently_and_feed_dependents():
+    async def combine(ctx):
+        return ctx["a"] + ctx["b"] + ctx["base"]
+
+    graph = TaskGraph([
+        GraphTask("a", sleeper(1)),
+        GraphTask("b", sleeper(2, delay=0.08)),
+        GraphTask("sum", combine, depends_on=["a", "b"]),
+    ])
+    graph_run = asyncio.run(graph.run({"base": 10}))
+
+    assert graph_run.results["sum"] == 13
+    assert graph_run.total < 0.12
+    assert graph_run.critical_path == ["b", "sum"]
+    assert graph_run.timings()["tasks"]["sum"]["status"] == "ok"
+
+
+def test_optional_timeout_is_recorded_and_dependents_still_run():
+    async def downstream(ctx):
+        return ctx["slow"]
+
+    graph = TaskGraph([
+        GraphTask("slow", sleeper(1, delay=1), timeout=0.01, required=False),
+        GraphTask("after", downstream, depends_on=["slow"]),
+    ])
+    graph_run = asyncio.run(graph.run())
+
+    assert isinstance(graph_run.errors["slow"], asyncio.TimeoutError)
+    assert graph_run.results["after"] is None
+
+
+def test_required_failure_cancels_running_tasks():
+    cancelled = []
+
+    async def slow(ctx):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def fail(ctx):
+        raise ValueError("boom")
+
+    graph = TaskGraph([GraphTask("slow", slow), GraphTask("fail", fail)])
+    with pytest.raises(TaskGraphError) as exc_info:
+        asyncio.run(graph.run())
+
+    assert exc_info.value.task_name == "fail"
+    assert cancelled == [True]
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError):
+        TaskGraph([GraphTask("a", sleeper(1), depends_on=["missing"])])
+    with pytest.raises(ValueError):
+        TaskGraph([GraphTask("a", sleeper(1), depends_on=["b"]), GraphTask("b", sleeper(1), depends_on=["a"])])
@@ -0,0 +1,49 @@
+import asyncio
+
+from agenticai.core.events import EventBus
+
+
+def test_publish_fans_out_to_every_subscriber_of_a_topic():
+    async def run():
+        bus = EventBus(queue_size=10)
+        first, second, other = bus.subscribe("trip1"), bus.subscribe("trip1"), bus.subscribe("trip2")
+
+        assert bus.publish("trip1", {"status": "DELAYED"}) == 2
+        assert await first.get() == {"status": "DELAYED"}
+        assert await second.get() == {"status": "DELAYED"}
+        assert other._queue.empty()
+
+        first.close()
+        assert await first.get() is None
+        assert bus.subscriber_count("trip1") == 1
+
+    asyncio.run(run())
+
+
+def test_slow_consumer_is_dropped_without_blocking_others():
+    async def run():
+        bus = EventBus(queue_size=2)
+        slow, fast = bus.subscribe("trip1"), bus.subscribe("trip1")
+
+        for i in range(3):
+            bus.publish("trip1", {"n": i})
+            assert await fast.get() == {"n": i}
+
+        assert slow.closed and slow.close_reason == "slow_consumer"
+        assert await slow.get() is None
+        assert bus.stats()["dropped_subscribers"] == 1
+        assert bus.subscriber_count("trip1") == 1
+
+    asyncio.run(run())
+
+
+def test_close_wakes_a_waiting_subscriber():
+    async def run():
+        bus = EventBus()
+        subscription = bus.subscribe("trip1")
+        waiter = asyncio.ensure_future(subscription.get())
+        await asyncio.sleep(0)
+        subscription.close()
+        assert await asyncio.wait_for(waiter, 1) is None
+
+    asyncio.run(run())
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+from agenticai.resources.async_file_system import AsyncFileSystem
+from agenticai.resources.file_system import FileSystem
+
+
+def test_status_updates_append_and_tail(tmp_path):
+    fs = FileSystem(base_dir=str(tmp_path), fsync_policy="never")
+    for i in range(50):
+        fs.add_status_update("trip1", {"status": f"update {i}"})
+
+    updates = fs.get_status_updates("trip1")
+    assert [u["status"] for u in updates] == [f"update {i}" for i in range(50)]
+    assert all("timestamp" in u for u in updates)
+    assert [u["status"] for u in fs.tail_status_updates("trip1", 3)] == ["update 47", "update 48", "update 49"]
+    assert fs.get_status_updates("missing") == []
+
+
+def test_concurrent_appends_are_not_lost(tmp_path):
+    fs = FileSystem(base_dir=str(tmp_path), fsync_policy="never")
+
+    def writer(n):
+        for i in range(100):
+            fs.add_status_update("trip1", {"status": f"{n}-{i}"})
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(fs.get_status_updates("trip1")) == 800
+
+
+def test_legacy_status_log_is_migrated(tmp_path):
+    status_dir = tmp_path / "trip1" / "status_updates"
+    status_dir.mkdir(parents=True)
+    legacy = {"updates": [{"status": "old", "timestamp": "2024-03-24T10:00:00"}]}
+    (status_dir / "status_log.json").write_text(json.dumps(legacy))
+
+    fs = FileSystem(base_dir=str(tmp_path))
+    assert fs.get_status_updates("trip1") == legacy["updates"]
+
+    fs.add_status_update("trip1", {"status": "new"})
+    assert [u["status"] for u in fs.get_status_updates("trip1")] == ["old", "new"]
+    assert not (status_dir / "status_log.json").exists()
+
+
+def test_compaction_drops_torn_lines_and_archives(tmp_path):
+    fs = FileSystem(base_dir=str(tmp_path), fsync_policy="never")
+    for i in range(5):
+        path = fs.add_status_update("trip1", {"status": f"update {i}"})
+    with open(path, "a") as f:
+        f.write('{"status": "torn')
+
+    fs.compact_status_log("trip1", keep_last=2)
+
+    assert [u["status"] for u in fs.get_status_updates("trip1")] == ["update 3", "update 4"]
+    with open(os.path.join(os.path.dirname(path), "status_log.archive.jsonl")) as f:
+        assert len(f.readlines()) == 3
+
+
+def test_appends_during_compaction_are_not_lost(tmp_path):
+    fs = FileSystem(base_dir=str(tmp_path), fsync_policy="never")
+    path = fs.add_status_update("trip1", {"status": "first"})
+
+    def writer(n):
+        for i in range(100):
+            fs.add_status_update("trip1", {"status": f"{n}-{i}"})
+
+    def compactor():
+        for _ in range(20):
+            fs.compact_status_log("trip1")
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    threads += [threading.Thread(target=compactor) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(fs.get_status_updates("trip1")) == 401
+    assert os.listdir(os.path.dirname(path)) == ["status_log.jsonl"]
+
+
+def test_writer_compacts_past_the_line_threshold(tmp_path):
+    fs = FileSystem(base_dir=str(tmp_path), fsync_policy="never", compact_lines=10, keep_last=3)
+    for i in range(25):
+        path = fs.add_status_update("trip1", {"status": f"update {i}"})
+
+    # Compacted after updates 9 and 19, keeping the last three live each time
+    assert [u["status"] for u in fs.get_status_updates("trip1")] == [f"update {i}" for i in range(17, 25)]
+    with open(os.path.join(os.path.dirname(path), "status_log.archive.jsonl")) as f:
+        assert len(f.readlines()) == 17
+
+
+def test_per_trip_state_is_freed_when_idle_or_compacted(tmp_path):
+    fs = FileSystem(base_dir=str(tmp_path), fsync_policy="never")
+    fs.add_status_update("trip1", {"status": "a"})
+    fs.add_status_update("trip2", {"status": "b"})
+    assert set(fs._trips) == {"trip1", "trip2"}
+
+    fs.compact_status_log("trip1")
+    assert set(fs._trips) == {"trip2"}
+
+    fs.idle_seconds = 0
+    fs.add_status_update("trip3", {"status": "c"})
+    assert fs._trips == {}
+    assert [u["status"] for u in fs.get_status_updates("trip3")] == ["c"]
+
+
+def test_async_file_system_batches_status_updates(tmp_path):
+    async def run():
+        fs = AsyncFileSystem(FileSystem(base_dir=str(tmp_path), fsync_policy="never"))
+        paths = await asyncio.gather(*(fs.add_status_update("trip1", {"status": f"update {i}"}) for i in range(20)))
+        await fs.save_document("trip1", "flight", {"flight_number": "AA123"}, "flight_info.json")
+
+        assert len(set(paths)) == 1
+        assert fs.stats()["batches_written"] < 20
+        assert fs._status_locks == {}
+        assert [u["status"] for u in await fs.get_status_updates("trip1")] == [f"update {i}" for i in range(20)]
+        assert os.listdir(tmp_path / "trip1" / "flight_info") == ["flight_info.json"]
+        await fs.aclose()
+
+    asyncio.run(run())
+
+
+def test_async_updates_added_during_compaction_are_kept(tmp_path):
+    async def run():
+        fs = AsyncFileSystem(FileSystem(base_dir=str(tmp_path), fsync_policy="never"), batch_window=0)
+        await fs.add_status_update("trip1", {"status": "first"})
+
+        compaction = asyncio.ensure_future(fs.compact_status_log("trip1"))
+        await asyncio.sleep(0)  # compaction is flushing or running; start a new writer meanwhile
+        added = [fs.add_status_update("trip1", {"status": f"update {i}"}) for i in range(10)]
+        await asyncio.gather(compaction, *added)
+
+        assert len(await fs.get_status_updates("trip1")) == 11
+        await fs.aclose()
+
+    asyncio.run(run())
+
+
+def test_cancelled_writer_cancels_its_updates(tmp_path):
+    async def run():
+        fs = AsyncFileSystem(FileSystem(base_dir=str(tmp_path), fsync_policy="never"), batch_window=0)
+        update = asyncio.ensure_future(fs.add_status_update("trip1", {"status": "in flight"}))
+        while not fs._writers or "trip1" in fs._pending:
+            await asyncio.sleep(0)  # until the writer has taken the batch
+        fs._writers["trip1"].cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await update
+        assert fs._status_locks == {}
+        await fs.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+from agenticai.core.governor import Governor, TokenBucket
+
+
+def test_token_bucket_refills_and_carries_debt():
+    now = [0.0]
+    bucket = TokenBucket(per_minute=60, clock=lambda: now[0])
+
+    bucket.take(60)
+    assert bucket.delay(1) == 1.0
+    now[0] = 0.5
+    bucket.take(10)  # overspend: 0.5 - 10 tokens
+    assert bucket.delay(1) == 10.5
+    now[0] = 11.0
+    assert bucket.delay(1) == 0.0
+
+
+def test_priority_order_when_slots_are_full():
+    async def run():
+        governor = Governor(max_in_flight=1)
+        governor.configure("TravelOrganizer", priority=9)
+        governor.configure("StakeholderNotifier", priority=1)
+        order = []
+
+        async def call(agent, hold=0.0):
+            async with governor.slot(agent):
+                order.append(agent)
+                await asyncio.sleep(hold)
+
+        first = asyncio.ensure_future(call("TravelOrganizer", hold=0.02))
+        await asyncio.sleep(0)
+        queued = [asyncio.ensure_future(call(agent)) for agent in ("TravelOrganizer", "StakeholderNotifier")]
+        await asyncio.sleep(0)
+        assert governor.stats()["queue_depth"] == 2
+
+        # A cancelled waiter leaves the queue without taking a slot
+        cancelled = asyncio.ensure_future(call("StakeholderNotifier"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(first, *queued)
+        return order, governor.stats()
+
+    order, stats = asyncio.run(run())
+    assert order == ["TravelOrganizer", "StakeholderNotifier", "TravelOrganizer"]
+    assert stats["queue_depth"] == 0 and stats["in_flight"] == 0
+    assert stats["agents"]["StakeholderNotifier"]["admitted"] == 1
+
+
+def test_token_budget_delays_only_its_own_agent():
+    async def run():
+        governor = Governor()
+        governor.configure("Notifier", max_tpm=6000)  # 100 tokens a second
+        async with governor.slot("Notifier", tokens=6000):
+            pass
+
+        start = time.perf_counter()
+        waited = {}
+
+        async def call(agent, tokens):
+            async with governor.slot(agent, tokens=tokens) as permit:
+                waited[agent] = time.perf_counter() - start
+                permit.record_tokens(tokens)
+
+        await asyncio.gather(call("Notifier", 10), call("Other", 10_000))
+        return waited, governor.stats()
+
+    waited, stats = asyncio.run(run())
+    assert waited["Other"] < 0.05
+    assert 0.08 <= waited["Notifier"] < 0.5
+    assert stats["agents"]["Notifier"]["wait_max_ms"] >= 80
@@ -0,0 +1,60 @@
+import asyncio
+
+from agenticai.resources import http
+from agenticai.resources.http import HTTPClientPool, close_http_pool, get_http_pool
+
+
+def test_session_is_reused_within_an_event_loop():
+    pool = HTTPClientPool(limit=10, limit_per_host=5)
+
+    async def run():
+        first = pool.session()
+        assert pool.session() is first
+        assert (first.connector.limit, first.connector.limit_per_host) == (10, 5)
+        await pool.close()
+        return first
+
+    first = asyncio.run(run())
+    assert first.closed
+    assert pool.closed
+
+
+def test_new_session_for_another_loop_or_after_close():
+    pool = HTTPClientPool()
+
+    async def session():
+        return pool.session()
+
+    other_loop = asyncio.new_event_loop()
+    try:
+        stale = other_loop.run_until_complete(session())
+
+        async def run():
+            fresh = pool.session()
+            assert fresh is not stale
+            await fresh.close()
+            reopened = pool.session()
+            assert reopened is not fresh and not reopened.closed
+            await pool.close()
+
+        asyncio.run(run())
+        assert not stale.closed
+        other_loop.run_until_complete(stale.close())
+    finally:
+        other_loop.close()
+
+
+def test_close_http_pool_closes_the_shared_session(monkeypatch):
+    monkeypatch.setattr(http, "_pool", None)
+
+    async def run():
+        pool = get_http_pool()
+        assert get_http_pool() is pool
+        session = pool.session()
+        await close_http_pool()
+        return pool, session
+
+    pool, session = asyncio.run(run())
+    assert session.closed
+    assert pool.closed
+    asyncio.run(close_http_pool())  # closing again is a no-op
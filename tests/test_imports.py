@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+
+def run_python(code: str, **env: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env={**os.environ, **env}
+    )
+    return result.stdout.strip()
+
+
+def test_package_import_is_lazy_and_has_no_side_effects(tmp_path):
+    storage = tmp_path / "storage"
+    memory = tmp_path / "memory"
+    loaded = run_python(
+        "import sys, agenticai, agenticai.agents, agenticai.registry\n"
+        "print(','.join(m for m in ('fastapi', 'uvicorn', 'numpy', 'aiohttp') if m in sys.modules))",
+        ENVIRONMENT="development",
+        STORAGE_PATH=str(storage),
+        MEMORY_PERSIST_DIR=str(memory),
+    )
+    assert loaded == ""
+    assert not storage.exists() and not memory.exists()
+
+    resolved = run_python(
+        "import agenticai\n"
+        "assert set(agenticai.__all__) <= set(dir(agenticai))\n"
+        "print(agenticai.AgentRegistry.__name__, type(agenticai.api_app).__name__, agenticai.run_app.__name__)"
+    )
+    assert resolved == "AgentRegistry FastAPI run_app"
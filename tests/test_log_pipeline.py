@@ -0,0 +1,78 @@
+import logging
+import threading
+from typing import Optional
+
+from agenticai.core.log_pipeline import AgentSampler, ErrorAggregator, LazyJSON, LogPipeline
+
+
+class Collect(logging.Handler):
+    def __init__(self, block: Optional[threading.Event] = None):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+        self.block = block
+
+    def emit(self, record):
+        if self.block is not None:
+            self.block.wait()
+        self.threads.add(threading.get_ident())
+        self.messages.append(record.getMessage())
+
+
+def test_pipeline_writes_off_thread_samples_agents_and_counts_drops():
+    log = logging.getLogger("test.log_pipeline.writer")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    gate = threading.Event()
+    collect = Collect(gate)
+    log.addHandler(collect)
+
+    pipeline = LogPipeline(queue_size=5, sample_rates={"Chatty": 0.0}, error_window=0)
+    pipeline.install(log)
+    try:
+        payload = {"trip": "T1"}
+        log.info("saved %s", LazyJSON(payload))
+        payload["trip"] = "T2"  # arguments are rendered when enqueued, not when written
+        for i in range(3):
+            log.info("chatty %d", i, extra={"agent": "Chatty"})
+        log.warning("chatty warning", extra={"agent": "Chatty"})
+        for i in range(10):
+            log.info("burst %d", i)
+    finally:
+        gate.set()
+        pipeline.uninstall()
+
+    assert log.handlers == [collect]
+    log.removeHandler(collect)
+    assert collect.messages[:2] == ['saved {"trip": "T1"}', "chatty warning"]
+    assert threading.get_ident() not in collect.threads
+    stats = pipeline.stats()
+    assert stats["sampled_out"] == 3
+    assert stats["enqueued"] == len(collect.messages) and stats["dropped"] == 12 - stats["enqueued"]
+    assert stats["dropped"] > 0
+
+
+def test_error_aggregator_suppresses_repeats_per_agent_and_error_type():
+    now = [0.0]
+    aggregator = ErrorAggregator(window=10, burst=2, clock=lambda: now[0])
+    sampler = AgentSampler({"Weather": 1.0}, default=0.0)
+
+    def passes(agent, error_type):
+        rec = logging.LogRecord("agenticai", logging.ERROR, __file__, 1, "boom", None, None)
+        rec.agent, rec.error_type = agent, error_type
+        return aggregator.filter(rec), rec
+
+    assert [passes("Weather", "Timeout")[0] for _ in range(5)] == [True, True, False, False, False]
+    assert passes("Weather", "KeyError")[0] and passes("Flights", "Timeout")[0]
+    assert aggregator.suppressed == 3 and aggregator.pending() == 3
+
+    now[0] = 11
+    passed, rec = passes("Weather", "Timeout")
+    assert passed and rec.getMessage() == "boom (+3 similar suppressed in the last 10s)"
+    assert aggregator.pending() == 0
+
+    info = logging.LogRecord("agenticai", logging.INFO, __file__, 1, "ok", None, None)
+    info.agent = "Flights"
+    assert not sampler.filter(info) and sampler.sampled_out == 1
+    info.agent = "Weather"
+    assert sampler.filter(info)
@@ -0,0 +1,69 @@
+import asyncio
+
+from agenticai.agents.base import AgentConfig, BaseAgent
+from agenticai.core.memo import DiskCache, cache_policy, memoize
+
+
+class CountingAgent(BaseAgent):
+    def __init__(self):
+        super().__init__(AgentConfig(name="Counting", role="test", goal="test"))
+        self.calls = 0
+
+    @memoize(key={"flight_number": str.upper, "date": None}, ttl=60, maxsize=2, disk=True)
+    async def lookup(self, flight_number: str, date: str, verbose: bool = False) -> dict:
+        self.calls += 1
+        return {"flight_number": flight_number.upper(), "date": date, "call": self.calls}
+
+
+def test_memoized_method_keys_on_declared_fields():
+    async def run():
+        agent = CountingAgent()
+        first = await agent.lookup("aa100", "2024-03-24")
+        assert await agent.lookup("AA100", "2024-03-24", verbose=True) == first  # verbose is not a key field
+        assert (await agent.lookup("AA100", "2024-03-25"))["call"] == 2
+
+        await agent.invalidate_cache("lookup", "AA100", "2024-03-24")
+        assert (await agent.lookup("AA100", "2024-03-24"))["call"] == 3
+        return agent
+
+    agent = asyncio.run(run())
+    stats = agent.cache_stats()
+    assert stats["methods"]["lookup"]["hits"] == 1
+    assert stats["methods"]["lookup"]["misses"] == 3
+    assert stats["hit_rate"] == 0.25
+
+
+def test_cache_policy_refreshes_or_bypasses_per_request():
+    async def run():
+        agent = CountingAgent()
+        await agent.lookup("AA100", "2024-03-24")
+        with cache_policy("bypass"):
+            assert (await agent.lookup("AA100", "2024-03-24"))["call"] == 2
+        assert (await agent.lookup("AA100", "2024-03-24"))["call"] == 1
+        with cache_policy("refresh"):
+            assert (await agent.lookup("AA100", "2024-03-24"))["call"] == 3
+        assert (await agent.lookup("AA100", "2024-03-24"))["call"] == 3
+        return agent
+
+    agent = asyncio.run(run())
+    assert (agent.memo.bypassed, agent.memo.refreshed) == (1, 1)
+
+
+def test_disk_tier_is_shared_between_agents(tmp_path):
+    store = DiskCache(str(tmp_path / "memo.db"))
+
+    async def run():
+        first, second = CountingAgent(), CountingAgent()
+        first.memo.store = second.memo.store = store
+        result = await first.lookup("AA100", "2024-03-24")
+        assert await second.lookup("AA100", "2024-03-24") == result
+        assert (second.calls, second.memo.disk_hits) == (0, 1)
+
+        await first.clear_cache()
+        assert (await second.lookup("AA100", "2024-03-25"))["call"] == 1
+        third = CountingAgent()
+        third.memo.store = store
+        assert (await third.lookup("AA100", "2024-03-24"))["call"] == 1  # cleared from disk too
+
+    asyncio.run(run())
+    store.close()
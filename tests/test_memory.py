@@ -0,0 +1,82 @@
+import time
+
+from agenticai.resources.memory import Memory
+
+
+def make_memory():
+    memory = Memory()
+    memory.store("WeatherChecker", "check_weather", {"summary": "storm at JFK"}, {"memory_key": "AA123_20240324"})
+    memory.store("ChatSystem", "process_query", {"query": "is AA123 delayed"}, {"memory_key": "AA123_20240324"})
+    memory.store("ChatSystem", "process_query", {"query": "hotel for DL45"}, {"memory_key": "DL45_20240324"})
+    memory.store("ChatSystem", "process_query", {"query": "AA123 delayed again, delayed badly"})
+    return memory
+
+
+def test_retrieve_ranks_keyword_matches():
+    memory = make_memory()
+
+    results = memory.retrieve("delayed aa123")
+    assert [r["query"] for r in results] == ["AA123 delayed again, delayed badly", "is AA123 delayed"]
+    assert memory.retrieve("storm")[0]["summary"] == "storm at JFK"
+
+
+def test_retrieve_without_matches_returns_most_recent():
+    memory = make_memory()
+
+    results = memory.retrieve("nothing matches this", n_results=2)
+    assert [r["query"] for r in results] == ["AA123 delayed again, delayed badly", "hotel for DL45"]
+
+
+def test_metadata_lookups_are_newest_first():
+    memory = make_memory()
+
+    assert [r["query"] for r in memory.retrieve_by_agent("ChatSystem", n_results=2)] == [
+        "AA123 delayed again, delayed badly",
+        "hotel for DL45",
+    ]
+    assert memory.retrieve_by_agent("Unknown") == []
+
+    results = memory._get_documents_by_metadata({"agent": "ChatSystem", "memory_key": "AA123_20240324"})
+    assert [r["query"] for r in results] == ["is AA123 delayed"]
+    assert results[0]["metadata"]["task"] == "process_query"
+
+
+def test_capacity_evicts_least_recently_used():
+    memory = Memory(max_entries=3, ttl=0)
+    first = memory.store("A", "t", {"text": "first"})
+    memory.store("A", "t", {"text": "second"})
+    memory.store("A", "t", {"text": "third"})
+
+    memory.retrieve("first")  # touch the oldest entry
+    memory.store("A", "t", {"text": "fourth"})
+
+    assert first in memory.documents
+    assert [r["text"] for r in memory.retrieve_by_agent("A")] == ["fourth", "third", "first"]
+    assert memory.stats()["evictions"] == 1
+
+
+def test_byte_budget_and_ttl():
+    memory = Memory(max_bytes=2000, ttl=0)
+    for i in range(50):
+        memory.store("A", "t", {"text": f"entry {i}"})
+    assert memory.resident_bytes <= 2000
+    assert memory.stats()["entries"] < 50
+
+    expiring = Memory(ttl=0)
+    expiring.store("A", "t", {"text": "short lived"}, ttl=0.001)
+    expiring.store("A", "t", {"text": "kept"})
+    time.sleep(0.01)
+    assert [r["text"] for r in expiring.retrieve_by_agent("A")] == ["kept"]
+    assert expiring.expirations == 1
+
+
+def test_compaction_preserves_results():
+    memory = Memory(max_entries=10, ttl=0, eviction_policy="age")
+    for i in range(40):
+        memory.store("A" if i % 2 else "B", "t", {"text": f"flight AA{i}"})
+    assert memory.maybe_compact()
+
+    assert memory.stats()["tombstones"] == 0
+    assert len(memory._doc_ids) == 10
+    assert memory.retrieve("aa39")[0]["text"] == "flight AA39"
+    assert [r["text"] for r in memory.retrieve_by_agent("B", n_results=2)] == ["flight AA38", "flight AA36"]
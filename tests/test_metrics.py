@@ -0,0 +1,32 @@
+import pytest
+
+from agenticai.core.metrics import MetricsRegistry
+
+
+def test_histogram_buckets_and_prometheus_text():
+    metrics = MetricsRegistry(namespace="test")
+    latency = metrics.histogram("latency_seconds", "Latency.", ("agent",), buckets=(0.1, 0.5, 1.0))
+    child = latency.labels('Weather "A"')
+    for value in (0.05, 0.1, 0.3, 2.0):
+        child.observe(value)
+    metrics.counter("calls_total", "Calls.").inc(3)
+    metrics.register_stats("bus", lambda: {"published": 7, "topics": 2, "name": "bus"}, counters=("published",))
+
+    assert child.count == 4 and child.quantile(0.5) == 0.1 and child.quantile(0.99) == float("inf")
+    lines = metrics.render().splitlines()
+    assert "# TYPE test_latency_seconds histogram" in lines
+    assert 'test_latency_seconds_bucket{agent="Weather \\"A\\"",le="0.1"} 2' in lines
+    assert 'test_latency_seconds_bucket{agent="Weather \\"A\\"",le="+Inf"} 4' in lines
+    assert 'test_latency_seconds_count{agent="Weather \\"A\\""} 4' in lines
+    assert "test_calls_total 3" in lines
+    assert "test_bus_published_total 7" in lines and "test_bus_topics 2" in lines
+    assert not any(line.startswith("test_bus_name") for line in lines)
+
+
+def test_metric_registration_is_idempotent_and_checked():
+    metrics = MetricsRegistry()
+    assert metrics.counter("x_total", "X.", ("a",)) is metrics.counter("x_total", "X.", ("a",))
+    with pytest.raises(ValueError):
+        metrics.gauge("x_total", "X.", ("a",))
+    with pytest.raises(ValueError):
+        metrics.counter("x_total", "X.")
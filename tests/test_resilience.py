@@ -0,0 +1,88 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from aiohttp import web
+
+from agenticai.core.resilience import CircuitBreaker, CircuitOpenError, Upstream, UpstreamError
+from agenticai.resources.apis import FlightAPI
+from agenticai.resources.http import HTTPClientPool
+
+
+@asynccontextmanager
+async def stub_flight_api(script):
+    """Serve /flights/{flight}, answering each request with the next scripted fault ("ok" once it runs out)."""
+    hits = []
+
+    async def flight(request):
+        hits.append(request.match_info["flight"])
+        action = script.pop(0) if script else "ok"
+        if action == "slow":
+            await asyncio.sleep(1)
+        elif isinstance(action, int):
+            return web.Response(status=action, text="injected fault")
+        return web.json_response({"ident": request.match_info["flight"], "attempt": len(hits)})
+
+    app = web.Application()
+    app.router.add_get("/flights/{flight}", flight)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    pool = HTTPClientPool()
+    try:
+        yield lambda upstream: FlightAPI("key", pool=pool, base_url=f"http://127.0.0.1:{port}", upstream=upstream), hits
+    finally:
+        await pool.close()
+        await runner.cleanup()
+
+
+def test_retries_failures_and_timeouts_with_backoff():
+    async def run():
+        async with stub_flight_api([503, "slow", "ok"]) as (make_api, hits):
+            api = make_api(Upstream("flights", timeout=0.2, retries=2, backoff_base=0.01))
+            info = await api.get_flight_info("AA123")
+            return info, hits, api.upstream.stats()
+
+    info, hits, stats = asyncio.run(run())
+    assert info["attempt"] == 3 and len(hits) == 3
+    assert stats["retried"] == 2 and stats["timeouts"] == 1
+    assert stats["breaker"]["state"] == "closed"
+
+
+def test_open_circuit_fails_fast_and_serves_stale_data():
+    async def run():
+        async with stub_flight_api(["ok"] + [503] * 10) as (make_api, hits):
+            breaker = CircuitBreaker("flights", failure_threshold=2, reset_timeout=60)
+            api = make_api(Upstream("flights", retries=0, breaker=breaker))
+            fresh = await api.get_flight_info("AA123")
+            served = [await api.get_flight_info("AA123") for _ in range(3)]
+            assert len(hits) == 3  # the third call never reached the upstream
+            with pytest.raises(CircuitOpenError):
+                await api.get_flight_info("UA9")  # nothing stale to fall back on
+            return fresh, served, api.upstream.stats()
+
+    fresh, served, stats = asyncio.run(run())
+    assert all(s == fresh for s in served)
+    assert stats["stale_served"] == 3
+    assert stats["breaker"]["state"] == "open" and stats["breaker"]["rejected"] == 2
+
+
+def test_client_errors_are_not_retried_and_hedge_trims_slow_attempts():
+    async def run():
+        async with stub_flight_api([404, "slow", "ok"]) as (make_api, hits):
+            api = make_api(Upstream("flights", timeout=2, retries=2, hedge_after=0.05))
+            with pytest.raises(UpstreamError) as error:
+                await api.get_flight_info("XX1")
+            assert error.value.status == 404 and len(hits) == 1
+
+            start = time.perf_counter()
+            info = await api.get_flight_info("AA123")
+            return info, time.perf_counter() - start, api.upstream.stats()
+
+    info, elapsed, stats = asyncio.run(run())
+    assert info["attempt"] == 3
+    assert elapsed < 0.5
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
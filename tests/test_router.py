@@ -0,0 +1,66 @@
+from agenticai.core.router import IntentRouter, TfidfClassifier
+
+
+def make_router(classifier=None):
+    router = IntentRouter(default="travel_organizer", classifier=classifier)
+    router.register("weather_checker", ["weather", "storm"])
+    router.register("flight_delay_scanner", ["delay", "status"])
+    router.register("alternative_route_suggester", ["alternative", "other flight"])
+    return router
+
+
+def test_keywords_score_every_intent_in_one_pass():
+    router = make_router()
+
+    assert router.route("Is my flight delayed?").intent == "flight_delay_scanner"
+    assert router.route("Any other flights tonight?").intent == "alternative_route_suggester"
+    # Two delay matches beat one weather match; equal scores go to the first registered intent
+    assert router.route("storm delay, what's the status").intent == "flight_delay_scanner"
+    assert router.route("weather delay?").intent == "weather_checker"
+    assert router.keyword_scores("storm delay, what's the status") == {
+        "weather_checker": 1.0,
+        "flight_delay_scanner": 2.0,
+    }
+    # Keywords match at word starts only
+    assert router.route("undelayable").method == "default"
+
+
+def test_keywords_match_inflections_but_not_longer_words():
+    router = IntentRouter(default="travel_organizer")
+    router.register("weather_checker", ["wind", "storm"])
+    router.register("flight_delay_scanner", ["cancel", "eta"])
+
+    assert router.route("Is it windy?").intent == "weather_checker"
+    assert router.route("storms tonight").intent == "weather_checker"
+    assert router.route("my flight was canceled").intent == "flight_delay_scanner"
+    assert router.route("What's the ETA?").intent == "flight_delay_scanner"
+    assert router.route("Can I get a window seat?").method == "default"
+    assert router.route("Is the fare cancellable?").method == "default"
+    assert router.route("Stormtrooper costume in my bag, is that OK?").method == "default"
+
+
+def test_unmatched_messages_use_the_classifier_then_the_default():
+    classifier = TfidfClassifier().fit(
+        ["will it be freezing in denver", "freezing temperatures tomorrow", "is the plane late", "plane running late"],
+        ["weather_checker", "weather_checker", "flight_delay_scanner", "flight_delay_scanner"],
+    )
+    router = make_router(classifier)
+
+    decision = router.route("how freezing is it")
+    assert (decision.intent, decision.method) == ("weather_checker", "classifier")
+    assert router.route("is my plane late").intent == "flight_delay_scanner"
+    assert router.route("book me a hotel").intent == "travel_organizer"
+    assert router.route("book me a hotel").method == "default"
+
+
+def test_classifier_labels_without_a_registered_intent_are_ignored():
+    classifier = TfidfClassifier().fit(
+        ["where is my suitcase", "lost luggage claim", "is the plane late"],
+        ["baggage", "baggage", "flight_delay_scanner"],
+    )
+    router = make_router(classifier)
+
+    assert router.unknown_labels() == ["baggage"]
+    decision = router.route("where is my suitcase")
+    assert (decision.intent, decision.method) == ("travel_organizer", "default")
+    assert router.route("is my plane late").intent == "flight_delay_scanner"
@@ -0,0 +1,66 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get_root(port: int) -> dict:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=5) as response:
+        return json.loads(response.read())
+
+
+def wait_for(condition, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            result = condition()
+            if result:
+                return result
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise AssertionError("timed out")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="the supervisor forks its workers")
+def test_supervisor_serves_restarts_workers_without_downtime_and_stops(tmp_path):
+    port = free_port()
+    log_path = tmp_path / "server.log"
+    env = {**os.environ, "ENVIRONMENT": "production", "STORAGE_PATH": str(tmp_path / "storage")}
+    with open(log_path, "w") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "agenticai.run_api", "--host", "127.0.0.1", "--port", str(port), "--workers", "2"],
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    try:
+        assert wait_for(lambda: get_root(port))["status"] == "online"
+
+        process.send_signal(signal.SIGHUP)
+        served = 0
+        while "Rolling restart complete" not in log_path.read_text():
+            assert get_root(port)["status"] == "online"  # old or new workers answer throughout
+            served += 1
+            assert process.poll() is None and served < 2000
+        assert log_path.read_text().count("Application startup complete") >= 4
+
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=30) == 0
+        assert log_path.read_text().count("Application shutdown complete") >= 4
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from agenticai.core.scheduler import MonitorScheduler
+
+FUTURE = (datetime.now(timezone.utc) + timedelta(hours=3)).isoformat()
+PAST = "2024-03-24T10:00:00Z"
+
+
+def flight(number, departure=FUTURE):
+    return {"flight_number": number, "origin": "JFK", "destination": "LAX", "scheduled_departure": departure}
+
+
+def make_scheduler(updates, check=None, **kwargs):
+    async def default_check(flights):
+        return [{"flight": f["flight_number"]} for f in flights]
+
+    async def on_update(monitor, status):
+        updates.append((monitor.trip_id, status["status"]))
+
+    kwargs.setdefault("interval_function", lambda monitor, now: 0.01)
+    return MonitorScheduler(check=check or default_check, on_update=on_update, tick=0.01, **kwargs)
+
+
+def test_monitors_on_one_flight_share_a_lookup_and_repeat():
+    updates = []
+
+    async def run():
+        scheduler = make_scheduler(updates)
+        scheduler.add("trip1", flight("AA123"))
+        scheduler.add("trip2", flight("aa123"))
+        scheduler.add("trip3", flight("DL45"))
+        scheduler.start()
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+        return scheduler.stats()
+
+    stats = asyncio.run(run())
+    assert stats["checks"] >= 6
+    assert stats["lookups"] < stats["checks"]
+    assert {trip for trip, _ in updates} == {"trip1", "trip2", "trip3"}
+
+
+def test_departed_flight_completes_after_one_check():
+    updates = []
+
+    async def run():
+        scheduler = make_scheduler(updates)
+        scheduler.add("trip1", flight("AA123", PAST))
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert updates == [("trip1", "MONITORING"), ("trip1", "COMPLETED")]
+    assert scheduler.get("trip1") is None
+
+
+def test_pause_resume_and_cancel():
+    updates = []
+
+    async def run():
+        scheduler = make_scheduler(updates)
+        scheduler.add("trip1", flight("AA123"))
+        scheduler.pause("trip1")
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        assert updates == []
+
+        scheduler.resume("trip1")
+        await asyncio.sleep(0.05)
+        assert updates
+
+        assert scheduler.cancel("trip1").state == "cancelled"
+        count = len(updates)
+        await asyncio.sleep(0.05)
+        assert len(updates) == count
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+
+def test_worker_pool_bounds_in_flight_lookups():
+    updates = []
+    peak = 0
+
+    async def slow_check(flights):
+        nonlocal peak
+        peak = max(peak, scheduler.in_flight)
+        await asyncio.sleep(0.01)
+        return [{} for _ in flights]
+
+    async def run():
+        for i in range(500):
+            scheduler.add(f"trip{i}", flight(f"AA{i}"))
+        scheduler.start()
+        start = time.monotonic()
+        while scheduler.checks < 500 and time.monotonic() - start < 5:
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+    scheduler = make_scheduler(updates, check=slow_check, workers=2, queue_size=1, batch_size=10)
+    asyncio.run(run())
+    assert scheduler.checks >= 500
+    assert peak <= 2 * 10
@@ -0,0 +1,73 @@
+import asyncio
+
+from agenticai.agents.base import BaseAgent
+from agenticai.core.memo import cache_policy
+from agenticai.resources.semantic_cache import SemanticCache, normalize_prompt
+
+PROMPT = """Adjust travel reservations based on flight delay information:
+
+        Flight details:
+        - Flight: AA123
+        - Traveler: Jane Doe
+        - New arrival: 2024-03-24T14:30:00Z
+
+        Tasks:
+        1. Identify reservations affected by the delay
+        2. Propose new times for each reservation"""
+
+
+def test_normalize_prompt_separates_template_from_slots():
+    template, slots = normalize_prompt(PROMPT)
+    reordered = PROMPT.replace(
+        "- Flight: AA123\n        - Traveler: Jane Doe", "- Traveler: Jane Doe\n - Flight: AA123"
+    )
+
+    assert "aa123" not in template and "jane" not in template
+    assert ("traveler", "jane doe") in slots
+    assert normalize_prompt(reordered) == (normalize_prompt(reordered)[0], slots)
+    assert normalize_prompt(PROMPT.replace("Jane Doe", "John Roe"))[1] != slots
+
+
+def test_near_duplicates_hit_but_other_slot_values_do_not():
+    now = [0.0]
+    cache = SemanticCache(threshold=0.8, maxsize=2, ttl=60, dim=256, clock=lambda: now[0])
+    cache.store(PROMPT, "plan A")
+
+    paraphrase = PROMPT.replace("Propose new times for each reservation", "Propose new times for every reservation")
+    hit = cache.lookup(paraphrase)
+    assert hit.completion == "plan A" and not hit.exact and 0.8 <= hit.similarity < 1.0
+    assert cache.lookup(PROMPT.replace("AA123", "UA9")) is None
+
+    cache.store(PROMPT.replace("AA123", "UA9"), "plan B")
+    assert cache.lookup(PROMPT).completion == "plan A"
+    cache.store(PROMPT.replace("AA123", "DL5"), "plan C")  # evicts the least recently used entry
+    assert cache.lookup(PROMPT.replace("AA123", "UA9")) is None
+
+    now[0] = 61
+    assert cache.lookup(PROMPT) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_execute_sends_near_duplicate_prompts_to_the_llm_once():
+    calls = []
+
+    async def llm(prompt):
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return f"completion {len(calls)}"
+
+    async def run():
+        agent = BaseAgent()
+        agent.llm = llm
+        agent.prompt_cache = SemanticCache(threshold=0.9, dim=256)
+        results = await asyncio.gather(*(agent.complete(PROMPT) for _ in range(5)))
+        reformatted = await agent.execute("\n".join(line.strip() for line in PROMPT.splitlines()), {"trip": 1})
+        with cache_policy("bypass"):
+            bypassed = await agent.complete(PROMPT)
+        return results, reformatted, bypassed
+
+    results, reformatted, bypassed = asyncio.run(run())
+    assert results == ["completion 1"] * 5
+    assert reformatted["result"] == "completion 1"
+    assert bypassed == "completion 2"
+    assert len(calls) == 2
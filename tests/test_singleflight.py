@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from agenticai.agents import FlightDelayScannerAgent
+from agenticai.core.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    agent = FlightDelayScannerAgent()
+
+    async def run():
+        return await asyncio.gather(*(agent.analyze_delay("AA123", "JFK to LAX", "2024-03-24") for _ in range(50)))
+
+    results = asyncio.run(run())
+    assert all(r is results[0] for r in results)
+    assert agent.singleflight.stats()["executions"] == 1
+    assert agent.singleflight.stats()["deduplicated"] == 49
+
+
+def test_exception_is_shared_and_key_is_released():
+    group = SingleFlight()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        results = await asyncio.gather(*(group.do("k", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        with pytest.raises(RuntimeError):
+            await group.do("k", failing)
+
+    asyncio.run(run())
+    assert calls == 2
+
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    group = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(group.do("k", slow))
+        second = asyncio.ensure_future(group.do("k", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "done"
@@ -0,0 +1,78 @@
+import asyncio
+import multiprocessing
+
+import pytest
+
+from agenticai.resources.sqlite_memory import SQLiteMemory
+
+
+def _write_many(path, worker, count):
+    memory = SQLiteMemory(path=path)
+    for i in range(count):
+        memory.store(f"Worker{worker}", "process_query", {"query": f"message {i}"})
+    memory.close()
+
+
+def test_store_and_retrieve_persist_across_instances(tmp_path):
+    path = str(tmp_path / "memory.db")
+    memory = SQLiteMemory(path=path)
+    memory.store("WeatherChecker", "check_weather", {"summary": "storm at JFK"}, {"memory_key": "AA123_20240324"})
+    memory.store("ChatSystem", "process_query", {"query": "is AA123 delayed"}, {"memory_key": "AA123_20240324"})
+    memory.store("ChatSystem", "process_query", {"query": "AA123 delayed again, delayed badly"}, {"seat": "12A"})
+
+    assert [r["query"] for r in memory.retrieve("delayed aa123")] == [
+        "AA123 delayed again, delayed badly",
+        "is AA123 delayed",
+    ]
+    memory.close()
+
+    reopened = SQLiteMemory(path=path)
+    assert [r["query"] for r in reopened.retrieve_by_agent("ChatSystem")] == [
+        "AA123 delayed again, delayed badly",
+        "is AA123 delayed",
+    ]
+    assert reopened._get_documents_by_metadata({"seat": "12A"})[0]["metadata"]["agent"] == "ChatSystem"
+    assert reopened.retrieve("nothing matches")[0]["query"] == "AA123 delayed again, delayed badly"
+    reopened.close()
+
+
+def test_concurrent_worker_processes_share_database(tmp_path):
+    path = str(tmp_path / "memory.db")
+    SQLiteMemory(path=path).close()
+
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_write_many, args=(path, n, 200)) for n in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    memory = SQLiteMemory(path=path)
+    for n in range(3):
+        assert len(memory.retrieve_by_agent(f"Worker{n}", n_results=1000)) == 200
+    memory.close()
+
+
+def test_store_after_close_raises_and_flush_returns(tmp_path):
+    memory = SQLiteMemory(path=str(tmp_path / "memory.db"))
+    memory.store("ChatSystem", "process_query", {"query": "is AA123 delayed"})
+    memory.close()
+
+    with pytest.raises(RuntimeError):
+        memory.store("ChatSystem", "process_query", {"query": "lost"})
+    memory.flush()  # must not wait on a writer that has stopped
+
+
+def test_async_reads_see_queued_writes(tmp_path):
+    async def scenario():
+        memory = SQLiteMemory(path=str(tmp_path / "memory.db"))
+        memory.store("ChatSystem", "process_query", {"query": "is AA123 delayed"}, {"seat": "12A"})
+        by_query = await memory.aretrieve("aa123")
+        by_agent = await memory.aretrieve_by_agent("ChatSystem")
+        by_metadata = await memory._aget_documents_by_metadata({"seat": "12A"})
+        await memory.aclose()
+        return by_query, by_agent, by_metadata
+
+    by_query, by_agent, by_metadata = asyncio.run(scenario())
+    assert by_query[0]["query"] == by_agent[0]["query"] == by_metadata[0]["query"] == "is AA123 delayed"
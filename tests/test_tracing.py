@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+from agenticai.core.tracing import FileSpanExporter, Tracer, current_span
+
+
+def test_spans_nest_across_tasks_and_threads():
+    tracer = Tracer(capacity=16, enabled=True)
+
+    def blocking_work() -> str:
+        with tracer.span("in_thread"):
+            return current_span().parent_id
+
+    async def child(name: str) -> None:
+        with tracer.span(name):
+            await asyncio.sleep(0)
+
+    async def run():
+        with tracer.span("request") as root:
+            await asyncio.gather(child("a"), child("b"))
+            parent_in_thread = await asyncio.to_thread(blocking_work)
+        assert current_span() is None
+        return root, parent_in_thread
+
+    root, parent_in_thread = asyncio.run(run())
+    spans = {span.name: span for span in tracer.spans}
+    assert {spans["a"].parent_id, spans["b"].parent_id, spans["in_thread"].parent_id} == {root.span_id}
+    assert parent_in_thread == root.span_id
+    assert len({span.trace_id for span in tracer.spans}) == 1
+    assert tracer.slowest(1)[0][0] is root
+
+
+def test_ring_buffer_export_and_traceparent(tmp_path):
+    tracer = Tracer(capacity=3, enabled=True)
+    path = tmp_path / "traces" / "spans.jsonl"
+    caller = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+    async def run():
+        tracer.start_export(FileSpanExporter(str(path)), interval=60)
+        with tracer.span("GET /x", traceparent=caller):
+            for i in range(4):
+                with tracer.span(f"step{i}", attributes={"i": i, "ok": True}):
+                    pass
+        try:
+            with tracer.span("failing"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        await tracer.stop_export()
+
+    asyncio.run(run())
+    assert [span.name for span in tracer.spans] == ["step3", "GET /x", "failing"]
+    assert tracer.stats()["exported"] == 3 and tracer.stats()["dropped"] == 3  # the export queue is bounded too
+
+    request = json.loads(path.read_text().splitlines()[0])
+    spans = {s["name"]: s for s in request["resourceSpans"][0]["scopeSpans"][0]["spans"]}
+    assert spans["GET /x"]["traceId"] == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert spans["GET /x"]["parentSpanId"] == "00f067aa0ba902b7"
+    assert spans["step3"]["parentSpanId"] == spans["GET /x"]["spanId"]
+    assert {"key": "i", "value": {"intValue": "3"}} in spans["step3"]["attributes"]
+    assert spans["failing"]["status"] == {"code": 2, "message": "ValueError: boom"}
@@ -0,0 +1,42 @@
+import numpy as np
+
+from agenticai.resources.memory import Memory
+from agenticai.resources.vector_index import HashingEmbedder, VectorIndex
+
+
+def test_hashing_embedder_is_deterministic_and_normalised():
+    embedder = HashingEmbedder(dim=64)
+    vectors = embedder(["storm delays at JFK", "storm delays at JFK", ""])
+    assert vectors.dtype == np.float32
+    assert np.allclose(vectors[0], vectors[1])
+    assert np.isclose(np.linalg.norm(vectors[0]), 1.0)
+    assert not vectors[2].any()
+
+
+def test_exact_and_ivf_search_find_nearest_documents():
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(20, 32)).astype(np.float32)
+    data = centers.repeat(100, axis=0) + 0.05 * rng.normal(size=(2000, 32)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+
+    index = VectorIndex(dim=32, ivf_threshold=1000, n_probe=4)
+    index.add_vectors([f"doc{i}" for i in range(len(data))], data)
+
+    exact = index.search_vectors(data[:5], k=3, exact=True)
+    approximate = index.search_vectors(data[:5], k=3)
+    assert [hits[0][0] for hits in exact] == [f"doc{i}" for i in range(5)]
+    assert [hits[0][0] for hits in approximate] == [f"doc{i}" for i in range(5)]
+
+    index.remove("doc0")
+    assert index.search_vectors(data[:1], k=1)[0][0][0] != "doc0"
+
+
+def test_memory_retrieve_similar():
+    memory = Memory(ttl=0, vector_index=VectorIndex(dim=128))
+    memory.store("WeatherChecker", "check_weather", {"summary": "thunderstorms expected at DFW tonight"})
+    memory.store("ChatSystem", "process_query", {"query": "book a hotel near LAX"})
+
+    assert memory.retrieve_similar("thunderstorms DFW", n_results=1)[0]["summary"].startswith("thunderstorms")
+
+    memory.delete(next(iter(memory.documents)))
+    assert len(memory.vector_index) == 1